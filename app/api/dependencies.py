@@ -1,8 +1,10 @@
-from fastapi import Depends
+from typing import Optional
+from fastapi import Depends, Header, HTTPException
 
 # from app.db import ResourceRepository
-from app.db import EReserveRepository
+from app.db import EReserveRepository, load_repository
 from app.core import get_current_user
+from app.core.security import is_admin_token
 
 
 # def get_resource_repository() -> ResourceRepository:
@@ -14,10 +16,15 @@ from app.core import get_current_user
 #     """
 #     return ResourceRepository()
 
-def get_ereserve_repository() -> EReserveRepository:
-    """Dependency for getting the eReserve repository"""
-    return EReserveRepository()
+async def get_ereserve_repository() -> EReserveRepository:
+    """Dependency for getting the eReserve repository, loading the dataset off the event loop on first use"""
+    return await load_repository()
 
-def get_authenticated_user() -> dict:
+async def get_authenticated_user(user: dict = Depends(get_current_user)) -> dict:
     """Dependency for getting the current authenticated user"""
-    return Depends(get_current_user)
\ No newline at end of file
+    return user
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency for admin-only endpoints, checking the X-Admin-Token header against ADMIN_TOKEN"""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
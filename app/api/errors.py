@@ -1,9 +1,15 @@
-from fastapi import Request, status
+import json
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional
+
+from fastapi import HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from app.core import logger
 
+JSON_API_CONTENT_TYPE = "application/vnd.api+json"
+
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """
@@ -32,4 +38,76 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "detail": error_details,
             "message": "Validation error"
         },
-    )
\ No newline at end of file
+    )
+
+
+@lru_cache(maxsize=64)
+def _json_api_error_prefix(status_code: int, title: str) -> bytes:
+    """Start of a JSON API error body up to its detail, cached per status and title since only a few pairs are used"""
+    return f'{{"errors": [{{"status": {json.dumps(str(status_code))}, "title": {json.dumps(title)}, "detail": '.encode("utf-8")
+
+
+def _render_json_api_error(status_code: int, title: str, detail: str) -> bytes:
+    """Render the body of a JSON API error, splicing the detail, which often names a requested ID, into the cached prefix"""
+    return _json_api_error_prefix(status_code, title) + json.dumps(detail).encode("utf-8") + b"}]}"
+
+
+def json_api_error_response(
+    status_code: int,
+    detail: str,
+    title: str = "Error",
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Build a JSON API error response from a prebuilt body
+    
+    Args:
+        status_code: HTTP status code
+        detail: Human readable explanation of the error
+        title: Short summary of the error
+        headers: Optional extra response headers
+        
+    Returns:
+        Response with an application/vnd.api+json errors document
+    """
+    return Response(
+        content=_render_json_api_error(status_code, title, detail),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_API_CONTENT_TYPE
+    )
+
+
+def is_json_api_request(request: Request) -> bool:
+    """Check whether a request was routed to a JSON API endpoint or asked for JSON API content"""
+    return (
+        getattr(request.scope.get("route"), "json_api", False) or
+        request.headers.get("accept") == JSON_API_CONTENT_TYPE or
+        request.headers.get("content-type") == JSON_API_CONTENT_TYPE
+    )
+
+
+async def json_api_exception_handler(request: Request, exc: HTTPException):
+    """
+    Exception handler formatting HTTP errors as JSON API errors for JSON API requests
+    
+    Args:
+        request: Request that caused the exception
+        exc: Exception that was raised
+        
+    Returns:
+        JSON API error response, or the default JSON error response for other endpoints
+    """
+    if not is_json_api_request(request):
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail},
+            headers=exc.headers
+        )
+    
+    if isinstance(exc.detail, dict) and "errors" in exc.detail:
+        # Already in JSON API format
+        headers: Dict[str, Any] = {**(exc.headers or {}), "Content-Type": JSON_API_CONTENT_TYPE}
+        return JSONResponse(status_code=exc.status_code, content=exc.detail, headers=headers)
+    
+    return json_api_error_response(exc.status_code, str(exc.detail), headers=exc.headers)
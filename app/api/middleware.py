@@ -0,0 +1,289 @@
+import asyncio
+import cProfile
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import unquote
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import settings
+from app.core import logger
+from app.core.metrics import http_request_duration, http_requests_in_flight, http_response_size
+from app.core.security import is_admin_token
+from app.core.capture import identity_hash, record_request
+from app.db import dataset_path, reset_dataset, use_dataset
+from app.api.errors import json_api_error_response
+
+
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware for request logging
+    
+    Adds the X-Process-Time header and passes response messages straight
+    through, so responses are never buffered or wrapped in extra tasks.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        
+        # Messages use loguru's deferred formatting, so nothing is formatted unless DEBUG is enabled
+        log_request = random.random() < settings.LOG_REQUEST_SAMPLE_RATE
+        if log_request:
+            logger.debug("➡️ {} {}", method, path)
+        
+        status_code = 500
+        server_timing = None
+        
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal status_code, server_timing
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start_time:.4f}")
+                server_timing = headers.get("server-timing")
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_process_time)
+        finally:
+            if log_request:
+                # Server-Timing phases are in the message and in record["extra"] for structured sinks
+                logger.debug("⬅️ {} {} completed in {:.4f}s with status {} {server_timing}", method, path, time.perf_counter() - start_time, status_code, server_timing=server_timing or "")
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request metrics
+    
+    Requests are labelled with the matched route's path template rather than
+    the raw path, so the number of series stays bounded. Latency is measured
+    to the response start, and the size counts every body chunk sent.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        status_code = 500
+        duration = None
+        response_size = 0
+        
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, duration, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration = time.perf_counter() - start_time
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+        
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_label = getattr(route, "path_format", None) or "unmatched"
+            method = scope["method"]
+            if duration is None:
+                duration = time.perf_counter() - start_time
+            http_request_duration.observe(duration, method, route_label, str(status_code))
+            http_response_size.observe(response_size, method, route_label)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware running selected requests under cProfile
+    
+    A request is profiled when it sends "X-Profile: 1" with a valid
+    "X-Admin-Token", and the response names the saved file in X-Profile-File.
+    With SLOW_REQUEST_PROFILE_SECONDS set, a sampled share of requests is also
+    profiled and kept only if it took longer than the threshold.
+    
+    Profiles are written as pstats files to PROFILE_DIR. cProfile traces the
+    whole thread, so other requests interleaved on the event loop show up in
+    the profile too; only one request is profiled at a time.
+    """
+    
+    _active = False
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or ProfilingMiddleware._active:
+            await self.app(scope, receive, send)
+            return
+        
+        requested = self._profile_requested(scope)
+        sampled = (
+            not requested and
+            settings.SLOW_REQUEST_PROFILE_SECONDS > 0 and
+            random.random() < settings.SLOW_REQUEST_PROFILE_SAMPLE_RATE
+        )
+        if not (requested or sampled):
+            await self.app(scope, receive, send)
+            return
+        
+        file_name = self._file_name(scope)
+        
+        async def send_with_profile_file(message: Message) -> None:
+            if requested and message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-File", file_name)
+            await send(message)
+        
+        ProfilingMiddleware._active = True
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_file if requested else send)
+        finally:
+            profiler.disable()
+            ProfilingMiddleware._active = False
+            duration = time.perf_counter() - start_time
+        
+        if requested or duration > settings.SLOW_REQUEST_PROFILE_SECONDS:
+            path = os.path.join(settings.PROFILE_DIR_FULL_PATH, file_name)
+            await asyncio.to_thread(self._save, profiler, path)
+            logger.info("Saved profile of {} {} ({:.4f}s) to {}", scope["method"], scope["path"], duration, path)
+    
+    @staticmethod
+    def _profile_requested(scope: Scope) -> bool:
+        profile: Optional[bytes] = None
+        token: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                profile = value
+            elif name == b"x-admin-token":
+                token = value
+        return profile == b"1" and token is not None and is_admin_token(token.decode("latin-1"))
+    
+    @staticmethod
+    def _file_name(scope: Scope) -> str:
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        return f"{timestamp}-{scope['method']}-{slug[:80]}.pstats"
+    
+    @staticmethod
+    def _save(profiler: cProfile.Profile, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+
+
+class TrafficCaptureMiddleware:
+    """
+    Pure ASGI middleware recording request metadata for offline replay
+    
+    Records method, path, query string, the dataset named by the
+    DATASET_HEADER header, a hash of the Authorization header, status,
+    duration and response size through app.core.capture. Datasets picked by
+    a /datasets/{name} prefix are already in the path. Request bodies are not
+    captured, and neither are the app's own warm-up requests.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.dataset_header = settings.DATASET_HEADER.lower().encode("latin-1")
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "warmup" in scope.get("extensions", {}):
+            await self.app(scope, receive, send)
+            return
+        
+        timestamp = time.time()
+        start_time = time.perf_counter()
+        status_code = 500
+        response_size = 0
+        
+        async def send_with_capture(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_capture)
+        finally:
+            authorization = next((value for name, value in scope["headers"] if name == b"authorization"), None)
+            dataset = next((value for name, value in scope["headers"] if name == self.dataset_header), None)
+            record_request(
+                ts=round(timestamp, 6),
+                method=scope["method"],
+                path=scope["path"],
+                query=scope["query_string"].decode("latin-1"),
+                dataset=dataset.decode("latin-1") if dataset else None,
+                identity=identity_hash(authorization),
+                status=status_code,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 3),
+                bytes=response_size,
+            )
+
+
+class DatasetMiddleware:
+    """
+    Pure ASGI middleware choosing the dataset a request is served from
+    
+    The dataset is named by a /datasets/{name} prefix in front of the API
+    path, or else by the DATASET_HEADER header. The prefix is moved into
+    root_path, so routes match as usual and pagination links keep it.
+    Requests naming no dataset use the default one, and unknown names get a
+    JSON API 404.
+    """
+    
+    PATH_PREFIX = re.compile(r"/datasets/([^/]+)(?=/|$)")
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.header = settings.DATASET_HEADER.lower().encode("latin-1")
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        root_path = scope.get("root_path", "")
+        route_path = scope["path"][len(root_path):] if scope["path"].startswith(root_path) else scope["path"]
+        match = self.PATH_PREFIX.match(route_path)
+        if match:
+            name = unquote(match.group(1))
+            # Updated in place, like Starlette's Mount, so outer middleware sees the matched route
+            scope["root_path"] = root_path + match.group(0)
+        else:
+            header = next((value for key, value in scope["headers"] if key == self.header), None)
+            name = header.decode("latin-1") if header else None
+        
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        if dataset_path(name) is None:
+            response = json_api_error_response(404, f"Dataset {name} not found", title="Not Found")
+            await response(scope, receive, send)
+            return
+        
+        token = use_dataset(name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_dataset(token)
@@ -0,0 +1,55 @@
+import asyncio
+import os
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.dependencies import require_admin
+from app.core.memory import allocation_window, cache_memory, gc_stats, process_memory, snapshot_memory
+from app.core.metrics import registered_caches
+from app.db import EReserveRepository
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)],
+    include_in_schema=False
+)
+
+def _memory_report() -> Dict[str, Any]:
+    """Build the memory report. Walks every loaded dataset, so it runs off the event loop"""
+    return {
+        "process": process_memory(),
+        "gc": gc_stats(),
+        "datasets": {
+            os.path.basename(path): snapshot_memory(snapshot)
+            for path, snapshot in EReserveRepository.loaded_snapshots().items()
+        },
+        "caches": {name: cache_memory(cache) for name, cache in registered_caches().items()},
+        "tracemalloc": {"tracing": allocation_window.active},
+    }
+
+@router.get("/memory")
+async def memory_report():
+    '''Memory used by each dataset's collections and indexes, the caches and the process'''
+    return await asyncio.to_thread(_memory_report)
+
+@router.post("/memory/tracemalloc")
+async def start_allocation_tracing(frames: int = Query(1, ge=1, le=50, description="Stack frames kept per allocation")):
+    '''Start a tracemalloc window. Tracing slows every allocation down, so stop it when done'''
+    allocation_window.start(frames)
+    return {"tracing": True, "frames": frames}
+
+@router.get("/memory/tracemalloc")
+async def allocation_report(
+    limit: int = Query(20, ge=1, le=500, description="Number of allocation sites to report"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$", description="How to group allocation sites")
+):
+    '''Top allocation sites by growth since the tracemalloc window started'''
+    return await asyncio.to_thread(allocation_window.top, limit, group_by)
+
+@router.delete("/memory/tracemalloc")
+async def stop_allocation_tracing():
+    '''Stop the tracemalloc window'''
+    allocation_window.stop()
+    return {"tracing": False}
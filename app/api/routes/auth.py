@@ -4,10 +4,11 @@ from pydantic import BaseModel, EmailStr
 from datetime import timedelta
 
 from app.core import settings
-from app.core.auth import create_access_token
-from app.db import EReserveRepository
+from app.core.auth import create_access_token, verify_password_async, PasswordVerifierBusy
+from app.api.routing import JsonApiRoute
+from app.db import current_dataset, load_repository
 
-router = APIRouter()
+router = APIRouter(route_class=JsonApiRoute)
 
 class UserCredentials(BaseModel):
     email: EmailStr
@@ -77,43 +78,56 @@ async def create_authenticated_session(login_data: LoginRequest, response: Respo
     This method creates a new session for access to the API\n\n
     After calling this method a bearer will be generated in the header of the response which is then used when calling methods that require authentication. This bearer is time limited and will expire in 1:00 hour.
     """
-    repo = EReserveRepository()
+    repo = await load_repository()
     try:
         # Extract user credentials from the nested structure
         user_credentials = login_data.public_v1_user
         # Check if user exists in mock data
-        users = repo.get_all("users")["items"]
-        integration_users = repo.get_all("integrationUsers")["items"]
-        all_users = users + integration_users
+        user = repo.find_user_by_email(user_credentials.email)
         
-        user = next((u for u in all_users if u.get("email") == user_credentials.email), None)
+        authentication_error = HTTPException(
+            status_code=400, 
+            detail={
+                "errors": [{
+                    "status": "400",
+                    "title": "Authentication Error",
+                    "detail": "Incorrect email or password"
+                }]
+            }
+        )
         
         if not user:
-            raise HTTPException(
-                status_code=400, 
-                detail={
-                    "errors": [{
-                        "status": "400",
-                        "title": "Authentication Error",
-                        "detail": "Incorrect email or password"
-                    }]
-                }
-            )
+            raise authentication_error
+        
+        # Passwords are only checked when enabled, against the user's bcrypt password_hash
+        if settings.VERIFY_PASSWORDS:
+            try:
+                password_valid = await verify_password_async(user_credentials.password, user.get("password_hash", ""))
+            except PasswordVerifierBusy:
+                raise HTTPException(
+                    status_code=503,
+                    detail={
+                        "errors": [{
+                            "status": "503",
+                            "title": "Service Unavailable",
+                            "detail": "Too many logins in progress, please retry"
+                        }]
+                    },
+                    headers={"Retry-After": "1"}
+                )
+            if not password_valid:
+                raise authentication_error
         
-        # Password must be verified here.
         # Generating a token since this is a mock API
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user_credentials.email}, 
+            data={"sub": user_credentials.email, "dataset": current_dataset()}, 
             expires_delta=access_token_expires
         )
         
         # Set the token in the header
         response.headers["Authorization"] = f"Bearer {access_token}"
         
-        # Set content type for JSON API
-        response.headers["Content-Type"] = "application/vnd.api+json"    
-        
         user_attributes = {
             "first_name": user.get("first_name", ""), 
             "last_name": user.get("last_name", ""), 
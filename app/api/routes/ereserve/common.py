@@ -1,6 +1,15 @@
-from fastapi import Request
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+from fastapi import HTTPException, Request
+
+from app.core import settings
+from app.core.timing import timed_phase
+from app.db import EReserveRepository
+from app.api.routing import JsonApiResponse
 from app.schemas.ereserve import JsonApiLinks
 
+PAGE_PARAMS = ("page[number]", "page[size]")
+
 # Helper function for JSON API pagination
 def build_pagination_links(
     request: Request, 
@@ -8,23 +17,114 @@ def build_pagination_links(
     page_size: int, 
     total_pages: int
 ) -> JsonApiLinks:
-    """Build pagination links for JSON API format"""
+    """Build pagination links for JSON API format, keeping any filter parameters"""
     base_url = str(request.url).split('?')[0]
     
+    # Carry filters such as filter[id] over to every link
+    extra_params = [(key, value) for key, value in request.query_params.multi_items() if key not in PAGE_PARAMS]
+    if extra_params:
+        base_url = f"{base_url}?{urlencode(extra_params)}&"
+    else:
+        base_url = f"{base_url}?"
+    
     links = JsonApiLinks()
     
     # First page link
-    links.first = f"{base_url}?page%5Bnumber%5D=1&page%5Bsize%5D={page_size}"
+    links.first = f"{base_url}page%5Bnumber%5D=1&page%5Bsize%5D={page_size}"
     
-    # Last page link
-    links.last = f"{base_url}?page%5Bnumber%5D={total_pages}&page%5Bsize%5D={page_size}"
+    # Last page link, page 1 when nothing matched since page numbers start at 1
+    links.last = f"{base_url}page%5Bnumber%5D={max(total_pages, 1)}&page%5Bsize%5D={page_size}"
     
     # Next page link
     if current_page < total_pages:
-        links.next = f"{base_url}?page%5Bnumber%5D={current_page + 1}&page%5Bsize%5D={page_size}"
+        links.next = f"{base_url}page%5Bnumber%5D={current_page + 1}&page%5Bsize%5D={page_size}"
     
     # Previous page link
     if current_page > 1:
-        links.prev = f"{base_url}?page%5Bnumber%5D={current_page - 1}&page%5Bsize%5D={page_size}"
+        links.prev = f"{base_url}page%5Bnumber%5D={current_page - 1}&page%5Bsize%5D={page_size}"
+    
+    return links
+
+def parse_id_filter(filter_id: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated filter[id] value into a list of unique IDs
+    
+    Args:
+        filter_id: Raw filter[id] query parameter, e.g. "1,2,3"
+        
+    Returns:
+        List of IDs in the order given, or None when no filter was requested
+        
+    Raises:
+        HTTPException: If more than MAX_FILTER_IDS IDs are requested
+    """
+    if filter_id is None:
+        return None
+    
+    ids = list(dict.fromkeys(item.strip() for item in filter_id.split(",") if item.strip()))
+    if len(ids) > settings.MAX_FILTER_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "errors": [{
+                    "status": "400",
+                    "title": "Invalid Filter",
+                    "detail": f"filter[id] accepts at most {settings.MAX_FILTER_IDS} IDs"
+                }]
+            }
+        )
+    return ids
+
+def resolve_key_filters(
+    repo: EReserveRepository,
+    collection: str,
+    ids: Optional[List[str]],
+    **filters: Optional[str]
+) -> Optional[List[str]]:
+    """
+    Narrow an ID filter with lookup-key filters resolved through the repository key indexes
+    
+    Args:
+        repo: Repository to resolve the keys with
+        collection: Name of the collection to query
+        ids: IDs from filter[id], or None when not filtering by ID
+        filters: Key filter values by index name. None values are ignored
+        
+    Returns:
+        IDs of the items matching every filter, or None when no filter was requested
+    """
+    for index_name, value in filters.items():
+        if value is None:
+            continue
+        with timed_phase("repo"):
+            matched = [str(item["id"]) for item in repo.find_by_key(collection, index_name, value)]
+        if ids is None:
+            ids = matched
+        else:
+            matched_ids = set(matched)
+            ids = [item_id for item_id in ids if item_id in matched_ids]
+    return ids
+
+def build_pagination_meta(total_count: int, total_pages: int) -> Dict[str, int]:
+    """Build the JSON API meta object with collection totals"""
+    return {"total": total_count, "total-pages": total_pages}
+
+def build_count_response(total_count: int, page_size: int) -> JsonApiResponse:
+    """
+    Build a count-only response for HEAD and page[size]=0 requests
     
-    return links
\ No newline at end of file
+    Args:
+        total_count: Number of items matching the request filters
+        page_size: Requested page size, used to compute the number of pages
+        
+    Returns:
+        JsonApiResponse with an empty data array, the totals in meta and in X-Total-* headers
+    """
+    total_pages = (total_count + page_size - 1) // page_size if page_size > 0 else 0
+    return JsonApiResponse(
+        content={"data": [], "meta": build_pagination_meta(total_count, total_pages)},
+        headers={
+            "X-Total-Count": str(total_count),
+            "X-Total-Pages": str(total_pages)
+        }
+    )
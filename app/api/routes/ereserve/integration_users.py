@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     IntegrationUserData, IntegrationUserAttributes,
     IntegrationUserListJsonApiResponse, IntegrationUserJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter, resolve_key_filters
 
 integration_user_router = APIRouter(
     tags=["IntegrationUser"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @integration_user_router.get(
@@ -53,39 +57,66 @@ integration_user_router = APIRouter(
 )
 async def list_integration_users(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
+    filter_email: Optional[str] = Query(None, alias="filter[email]", description="Email address (case-insensitive)"),
+    filter_identifier: Optional[str] = Query(None, alias="filter[identifier]", description="Integration user identifier (case-insensitive)"),
+    filter_lti_consumer_user_id: Optional[str] = Query(None, alias="filter[lti-consumer-user-id]", description="LTI consumer user ID"),
+    filter_lti_lis_person_sourcedid: Optional[str] = Query(None, alias="filter[lti-lis-person-sourcedid]", description="LTI LIS person sourcedid"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all integration users in JSON API format with page-based pagination'''
     
+    ids = resolve_key_filters(
+        repo,
+        "integrationUsers",
+        parse_id_filter(filter_id),
+        email=filter_email,
+        identifier=filter_identifier,
+        lti_consumer_user_id=filter_lti_consumer_user_id,
+        lti_lis_person_sourcedid=filter_lti_lis_person_sourcedid
+    )
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("integrationUsers", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("integrationUsers", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("integrationUsers", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    integration_user_data = []
-    for integration_user in result["items"]:
-        integration_user_attributes = IntegrationUserAttributes(
-            identifier=integration_user["identifier"],
-            roles=integration_user["roles"],
-            first_name=integration_user["first_name"],
-            last_name=integration_user["last_name"],
-            email=integration_user["email"],
-            lti_consumer_user_id=integration_user["lti_consumer_user_id"],
-            lti_lis_person_sourcedid=integration_user["lti_lis_person_sourcedid"],
-            created_at=integration_user.get("created_at", ""),
-            updated_at=integration_user.get("updated_at", "")
-        )
-        integration_user_item = IntegrationUserData(
-            id=str(integration_user["id"]),
-            attributes=integration_user_attributes
-        )
-        integration_user_data.append(integration_user_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        integration_user_data = []
+        for integration_user in result["items"]:
+            integration_user_attributes = IntegrationUserAttributes(
+                identifier=integration_user["identifier"],
+                roles=integration_user["roles"],
+                first_name=integration_user["first_name"],
+                last_name=integration_user["last_name"],
+                email=integration_user["email"],
+                lti_consumer_user_id=integration_user["lti_consumer_user_id"],
+                lti_lis_person_sourcedid=integration_user["lti_lis_person_sourcedid"],
+                created_at=integration_user.get("created_at", ""),
+                updated_at=integration_user.get("updated_at", "")
+            )
+            integration_user_item = IntegrationUserData(
+                id=str(integration_user["id"]),
+                attributes=integration_user_attributes
+            )
+            integration_user_data.append(integration_user_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return IntegrationUserListJsonApiResponse(data=integration_user_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return IntegrationUserListJsonApiResponse(data=integration_user_data, links=links.dict(exclude_none=True), meta=meta)
+
+integration_user_router.add_api_route("/integration-users", list_integration_users, methods=["HEAD"], include_in_schema=False)
 
 @integration_user_router.get(
     "/integration-users/{id}", 
@@ -137,24 +168,26 @@ async def get_integration_user(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific integration user by ID in JSON API format'''
-    integration_user = repo.get_by_id("integrationUsers", id)
+    with timed_phase("repo"):
+        integration_user = repo.get_by_id("integrationUsers", id)
     
-    # Convert to JSON API format
-    integration_user_attributes = IntegrationUserAttributes(
-        identifier=integration_user["identifier"],
-        roles=integration_user["roles"],
-        first_name=integration_user["first_name"],
-        last_name=integration_user["last_name"],
-        email=integration_user["email"],
-        lti_consumer_user_id=integration_user["lti_consumer_user_id"],
-        lti_lis_person_sourcedid=integration_user["lti_lis_person_sourcedid"],
-        created_at=integration_user.get("created_at", ""),
-        updated_at=integration_user.get("updated_at", "")
-    )
-    integration_user_data = IntegrationUserData(
-        id=str(integration_user["id"]),
-        attributes=integration_user_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        integration_user_attributes = IntegrationUserAttributes(
+            identifier=integration_user["identifier"],
+            roles=integration_user["roles"],
+            first_name=integration_user["first_name"],
+            last_name=integration_user["last_name"],
+            email=integration_user["email"],
+            lti_consumer_user_id=integration_user["lti_consumer_user_id"],
+            lti_lis_person_sourcedid=integration_user["lti_lis_person_sourcedid"],
+            created_at=integration_user.get("created_at", ""),
+            updated_at=integration_user.get("updated_at", "")
+        )
+        integration_user_data = IntegrationUserData(
+            id=str(integration_user["id"]),
+            attributes=integration_user_attributes
+        )
     
     return IntegrationUserJsonApiResponse(data=integration_user_data)
 
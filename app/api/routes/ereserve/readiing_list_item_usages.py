@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     ReadingListItemUsageData, ReadingListItemUsageAttributes,
     ReadingListItemUsageListJsonApiResponse, ReadingListItemUsageJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter
 
 reading_list_item_usage_router = APIRouter(
     tags=["ReadingListItemUsage"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @reading_list_item_usage_router.get(
@@ -50,36 +54,51 @@ reading_list_item_usage_router = APIRouter(
 )
 async def list_reading_list_item_usages(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all reading list item usages in JSON API format with page-based pagination'''
     
+    ids = parse_id_filter(filter_id)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("readingListItemUsages", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("readingListItemUsages", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("readingListItemUsages", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    reading_list_item_usage_data = []
-    for reading_list_item_usage in result["items"]:
-        reading_list_item_usage_attributes = ReadingListItemUsageAttributes(
-            item_id=reading_list_item_usage["item_id"],
-            list_usage_id=reading_list_item_usage["list_usage_id"],
-            integration_user_id=reading_list_item_usage["integration_user_id"],
-            utilisation_count=reading_list_item_usage["utilisation_count"],
-            created_at=reading_list_item_usage.get("created_at", ""),
-            updated_at=reading_list_item_usage.get("updated_at", "")
-        )
-        reading_list_item_usage_item = ReadingListItemUsageData(
-            id=str(reading_list_item_usage["id"]),
-            attributes=reading_list_item_usage_attributes
-        )
-        reading_list_item_usage_data.append(reading_list_item_usage_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_list_item_usage_data = []
+        for reading_list_item_usage in result["items"]:
+            reading_list_item_usage_attributes = ReadingListItemUsageAttributes(
+                item_id=reading_list_item_usage["item_id"],
+                list_usage_id=reading_list_item_usage["list_usage_id"],
+                integration_user_id=reading_list_item_usage["integration_user_id"],
+                utilisation_count=reading_list_item_usage["utilisation_count"],
+                created_at=reading_list_item_usage.get("created_at", ""),
+                updated_at=reading_list_item_usage.get("updated_at", "")
+            )
+            reading_list_item_usage_item = ReadingListItemUsageData(
+                id=str(reading_list_item_usage["id"]),
+                attributes=reading_list_item_usage_attributes
+            )
+            reading_list_item_usage_data.append(reading_list_item_usage_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return ReadingListItemUsageListJsonApiResponse(data=reading_list_item_usage_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return ReadingListItemUsageListJsonApiResponse(data=reading_list_item_usage_data, links=links.dict(exclude_none=True), meta=meta)
+
+reading_list_item_usage_router.add_api_route("/reading-list-item-usages", list_reading_list_item_usages, methods=["HEAD"], include_in_schema=False)
 
 @reading_list_item_usage_router.get(
     "/reading-list-item-usages/{id}", 
@@ -128,21 +147,23 @@ async def get_reading_list_item_usage(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific reading list item usage by ID in JSON API format'''
-    reading_list_item_usage = repo.get_by_id("readingListItemUsages", id)
+    with timed_phase("repo"):
+        reading_list_item_usage = repo.get_by_id("readingListItemUsages", id)
     
-    # Convert to JSON API format
-    reading_list_item_usage_attributes = ReadingListItemUsageAttributes(
-        item_id=reading_list_item_usage["item_id"],
-        list_usage_id=reading_list_item_usage["list_usage_id"],
-        integration_user_id=reading_list_item_usage["integration_user_id"],
-        utilisation_count=reading_list_item_usage["utilisation_count"],
-        created_at=reading_list_item_usage.get("created_at", ""),
-        updated_at=reading_list_item_usage.get("updated_at", "")
-    )
-    reading_list_item_usage_data = ReadingListItemUsageData(
-        id=str(reading_list_item_usage["id"]),
-        attributes=reading_list_item_usage_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_list_item_usage_attributes = ReadingListItemUsageAttributes(
+            item_id=reading_list_item_usage["item_id"],
+            list_usage_id=reading_list_item_usage["list_usage_id"],
+            integration_user_id=reading_list_item_usage["integration_user_id"],
+            utilisation_count=reading_list_item_usage["utilisation_count"],
+            created_at=reading_list_item_usage.get("created_at", ""),
+            updated_at=reading_list_item_usage.get("updated_at", "")
+        )
+        reading_list_item_usage_data = ReadingListItemUsageData(
+            id=str(reading_list_item_usage["id"]),
+            attributes=reading_list_item_usage_attributes
+        )
     
     return ReadingListItemUsageJsonApiResponse(data=reading_list_item_usage_data)
 
@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     ReadingListItemData, ReadingListItemAttributes,
     ReadingListItemListJsonApiResponse, ReadingListItemJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter
 
 reading_list_item_router = APIRouter(
     tags=["ReadingListItem"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @reading_list_item_router.get(
@@ -53,39 +57,54 @@ reading_list_item_router = APIRouter(
 )
 async def list_reading_list_items(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all reading list items in JSON API format with page-based pagination'''
     
+    ids = parse_id_filter(filter_id)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("readingListItems", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("readingListItems", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("readingListItems", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    reading_list_item_data = []
-    for reading_list_item in result["items"]:
-        reading_list_item_attributes = ReadingListItemAttributes(
-            list_id=reading_list_item["list_id"],
-            reading_id=reading_list_item["reading_id"],
-            status=reading_list_item["status"],
-            hidden=reading_list_item["hidden"],
-            reading_utilisations_count=reading_list_item["reading_utilisations_count"],
-            reading_importance=reading_list_item["reading_importance"],
-            usage_count=reading_list_item["usage_count"],
-            created_at=reading_list_item.get("created_at", ""),
-            updated_at=reading_list_item.get("updated_at", "")
-        )
-        reading_list_item_item = ReadingListItemData(
-            id=str(reading_list_item["id"]),
-            attributes=reading_list_item_attributes
-        )
-        reading_list_item_data.append(reading_list_item_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_list_item_data = []
+        for reading_list_item in result["items"]:
+            reading_list_item_attributes = ReadingListItemAttributes(
+                list_id=reading_list_item["list_id"],
+                reading_id=reading_list_item["reading_id"],
+                status=reading_list_item["status"],
+                hidden=reading_list_item["hidden"],
+                reading_utilisations_count=reading_list_item["reading_utilisations_count"],
+                reading_importance=reading_list_item["reading_importance"],
+                usage_count=reading_list_item["usage_count"],
+                created_at=reading_list_item.get("created_at", ""),
+                updated_at=reading_list_item.get("updated_at", "")
+            )
+            reading_list_item_item = ReadingListItemData(
+                id=str(reading_list_item["id"]),
+                attributes=reading_list_item_attributes
+            )
+            reading_list_item_data.append(reading_list_item_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return ReadingListItemListJsonApiResponse(data=reading_list_item_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return ReadingListItemListJsonApiResponse(data=reading_list_item_data, links=links.dict(exclude_none=True), meta=meta)
+
+reading_list_item_router.add_api_route("/reading-list-items", list_reading_list_items, methods=["HEAD"], include_in_schema=False)
 
 @reading_list_item_router.get(
     "/reading-list-items/{id}", 
@@ -137,24 +156,26 @@ async def get_reading_list_item(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific reading list item by ID in JSON API format'''
-    reading_list_item = repo.get_by_id("readingListItems", id)
+    with timed_phase("repo"):
+        reading_list_item = repo.get_by_id("readingListItems", id)
     
-    # Convert to JSON API format
-    reading_list_item_attributes = ReadingListItemAttributes(
-        list_id=reading_list_item["list_id"],
-        reading_id=reading_list_item["reading_id"],
-        status=reading_list_item["status"],
-        hidden=reading_list_item["hidden"],
-        reading_utilisations_count=reading_list_item["reading_utilisations_count"],
-        reading_importance=reading_list_item["reading_importance"],
-        usage_count=reading_list_item["usage_count"],
-        created_at=reading_list_item.get("created_at", ""),
-        updated_at=reading_list_item.get("updated_at", "")
-    )
-    reading_list_item_data = ReadingListItemData(
-        id=str(reading_list_item["id"]),
-        attributes=reading_list_item_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_list_item_attributes = ReadingListItemAttributes(
+            list_id=reading_list_item["list_id"],
+            reading_id=reading_list_item["reading_id"],
+            status=reading_list_item["status"],
+            hidden=reading_list_item["hidden"],
+            reading_utilisations_count=reading_list_item["reading_utilisations_count"],
+            reading_importance=reading_list_item["reading_importance"],
+            usage_count=reading_list_item["usage_count"],
+            created_at=reading_list_item.get("created_at", ""),
+            updated_at=reading_list_item.get("updated_at", "")
+        )
+        reading_list_item_data = ReadingListItemData(
+            id=str(reading_list_item["id"]),
+            attributes=reading_list_item_attributes
+        )
     
     return ReadingListItemJsonApiResponse(data=reading_list_item_data)
 
@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     ReadingListData, ReadingListAttributes,
     ReadingListListJsonApiResponse, ReadingListJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter
 
 reading_list_router = APIRouter(
     tags=["ReadingList"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @reading_list_router.get(
@@ -57,43 +61,58 @@ reading_list_router = APIRouter(
 )
 async def list_reading_lists(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all reading lists in JSON API format with page-based pagination'''
     
+    ids = parse_id_filter(filter_id)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("readingLists", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("readingLists", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("readingLists", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    reading_list_data = []
-    for reading_list in result["items"]:
-        reading_list_attributes = ReadingListAttributes(
-            unit_id=reading_list["unit_id"],
-            teaching_session_id=reading_list.get("teaching_session_id"),
-            name=reading_list["name"],
-            duration=reading_list["duration"],
-            start_date=reading_list["start_date"],
-            end_date=reading_list["end_date"],
-            hidden=reading_list["hidden"],
-            item_count=reading_list["item_count"],
-            approved_item_count=reading_list["approved_item_count"],
-            usage_count=reading_list["usage_count"],
-            deleted=reading_list["deleted"],
-            created_at=reading_list.get("created_at", ""),
-            updated_at=reading_list.get("updated_at", "")
-        )
-        reading_list_item = ReadingListData(
-            id=str(reading_list["id"]),
-            attributes=reading_list_attributes
-        )
-        reading_list_data.append(reading_list_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_list_data = []
+        for reading_list in result["items"]:
+            reading_list_attributes = ReadingListAttributes(
+                unit_id=reading_list["unit_id"],
+                teaching_session_id=reading_list.get("teaching_session_id"),
+                name=reading_list["name"],
+                duration=reading_list["duration"],
+                start_date=reading_list["start_date"],
+                end_date=reading_list["end_date"],
+                hidden=reading_list["hidden"],
+                item_count=reading_list["item_count"],
+                approved_item_count=reading_list["approved_item_count"],
+                usage_count=reading_list["usage_count"],
+                deleted=reading_list["deleted"],
+                created_at=reading_list.get("created_at", ""),
+                updated_at=reading_list.get("updated_at", "")
+            )
+            reading_list_item = ReadingListData(
+                id=str(reading_list["id"]),
+                attributes=reading_list_attributes
+            )
+            reading_list_data.append(reading_list_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return ReadingListListJsonApiResponse(data=reading_list_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return ReadingListListJsonApiResponse(data=reading_list_data, links=links.dict(exclude_none=True), meta=meta)
+
+reading_list_router.add_api_route("/reading-lists", list_reading_lists, methods=["HEAD"], include_in_schema=False)
 
 @reading_list_router.get(
     "/reading-lists/{id}", 
@@ -149,28 +168,30 @@ async def get_reading_list(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific reading list by ID in JSON API format'''
-    reading_list = repo.get_by_id("readingLists", id)
+    with timed_phase("repo"):
+        reading_list = repo.get_by_id("readingLists", id)
     
-    # Convert to JSON API format
-    reading_list_attributes = ReadingListAttributes(
-        unit_id=reading_list["unit_id"],
-        teaching_session_id=reading_list.get("teaching_session_id"),
-        name=reading_list["name"],
-        duration=reading_list["duration"],
-        start_date=reading_list["start_date"],
-        end_date=reading_list["end_date"],
-        hidden=reading_list["hidden"],
-        item_count=reading_list["item_count"],
-        approved_item_count=reading_list["approved_item_count"],
-        usage_count=reading_list["usage_count"],
-        deleted=reading_list["deleted"],
-        created_at=reading_list.get("created_at", ""),
-        updated_at=reading_list.get("updated_at", "")
-    )
-    reading_list_data = ReadingListData(
-        id=str(reading_list["id"]),
-        attributes=reading_list_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_list_attributes = ReadingListAttributes(
+            unit_id=reading_list["unit_id"],
+            teaching_session_id=reading_list.get("teaching_session_id"),
+            name=reading_list["name"],
+            duration=reading_list["duration"],
+            start_date=reading_list["start_date"],
+            end_date=reading_list["end_date"],
+            hidden=reading_list["hidden"],
+            item_count=reading_list["item_count"],
+            approved_item_count=reading_list["approved_item_count"],
+            usage_count=reading_list["usage_count"],
+            deleted=reading_list["deleted"],
+            created_at=reading_list.get("created_at", ""),
+            updated_at=reading_list.get("updated_at", "")
+        )
+        reading_list_data = ReadingListData(
+            id=str(reading_list["id"]),
+            attributes=reading_list_attributes
+        )
     
     return ReadingListJsonApiResponse(data=reading_list_data)
 
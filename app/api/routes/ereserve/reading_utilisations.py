@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     ReadingUtilisationData, ReadingUtilisationAttributes,
     ReadingUtilisationListJsonApiResponse, ReadingUtilisationJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter
 
 reading_utilisation_router = APIRouter(
     tags=["ReadingUtilisation"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @reading_utilisation_router.get(
@@ -49,35 +53,50 @@ reading_utilisation_router = APIRouter(
 )
 async def list_reading_utilisations(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all reading utilisations in JSON API format with page-based pagination'''
     
+    ids = parse_id_filter(filter_id)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("readingUtilisations", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("readingUtilisations", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("readingUtilisations", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    reading_utilisation_data = []
-    for reading_utilisation in result["items"]:
-        reading_utilisation_attributes = ReadingUtilisationAttributes(
-            item_id=reading_utilisation["item_id"],
-            item_usage_id=reading_utilisation["item_usage_id"],
-            integration_user_id=reading_utilisation["integration_user_id"],
-            created_at=reading_utilisation.get("created_at", ""),
-            updated_at=reading_utilisation.get("updated_at", "")
-        )
-        reading_utilisation_item = ReadingUtilisationData(
-            id=str(reading_utilisation["id"]),
-            attributes=reading_utilisation_attributes
-        )
-        reading_utilisation_data.append(reading_utilisation_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_utilisation_data = []
+        for reading_utilisation in result["items"]:
+            reading_utilisation_attributes = ReadingUtilisationAttributes(
+                item_id=reading_utilisation["item_id"],
+                item_usage_id=reading_utilisation["item_usage_id"],
+                integration_user_id=reading_utilisation["integration_user_id"],
+                created_at=reading_utilisation.get("created_at", ""),
+                updated_at=reading_utilisation.get("updated_at", "")
+            )
+            reading_utilisation_item = ReadingUtilisationData(
+                id=str(reading_utilisation["id"]),
+                attributes=reading_utilisation_attributes
+            )
+            reading_utilisation_data.append(reading_utilisation_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return ReadingUtilisationListJsonApiResponse(data=reading_utilisation_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return ReadingUtilisationListJsonApiResponse(data=reading_utilisation_data, links=links.dict(exclude_none=True), meta=meta)
+
+reading_utilisation_router.add_api_route("/reading-utilisations", list_reading_utilisations, methods=["HEAD"], include_in_schema=False)
 
 @reading_utilisation_router.get(
     "/reading-utilisations/{id}", 
@@ -125,20 +144,22 @@ async def get_reading_utilisation(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific reading utilisation by ID in JSON API format'''
-    reading_utilisation = repo.get_by_id("readingUtilisations", id)
+    with timed_phase("repo"):
+        reading_utilisation = repo.get_by_id("readingUtilisations", id)
     
-    # Convert to JSON API format
-    reading_utilisation_attributes = ReadingUtilisationAttributes(
-        item_id=reading_utilisation["item_id"],
-        item_usage_id=reading_utilisation["item_usage_id"],
-        integration_user_id=reading_utilisation["integration_user_id"],
-        created_at=reading_utilisation.get("created_at", ""),
-        updated_at=reading_utilisation.get("updated_at", "")
-    )
-    reading_utilisation_data = ReadingUtilisationData(
-        id=str(reading_utilisation["id"]),
-        attributes=reading_utilisation_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_utilisation_attributes = ReadingUtilisationAttributes(
+            item_id=reading_utilisation["item_id"],
+            item_usage_id=reading_utilisation["item_usage_id"],
+            integration_user_id=reading_utilisation["integration_user_id"],
+            created_at=reading_utilisation.get("created_at", ""),
+            updated_at=reading_utilisation.get("updated_at", "")
+        )
+        reading_utilisation_data = ReadingUtilisationData(
+            id=str(reading_utilisation["id"]),
+            attributes=reading_utilisation_attributes
+        )
     
     return ReadingUtilisationJsonApiResponse(data=reading_utilisation_data)
 
@@ -1,21 +1,25 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     ReadingData, ReadingAttributes,
-    ReadingListJsonApiResponse, ReadingJsonApiResponse
+    ReadingCollectionJsonApiResponse, ReadingJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter, resolve_key_filters
 
 reading_router = APIRouter(
     tags=["Reading"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @reading_router.get(
     "/readings", 
-    response_model=ReadingListJsonApiResponse,
+    response_model=ReadingCollectionJsonApiResponse,
     summary="All Readings",
     responses={
         200: {
@@ -75,61 +79,78 @@ reading_router = APIRouter(
 )
 async def list_readings(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
+    filter_isbn: Optional[str] = Query(None, alias="filter[isbn]", description="ISBN or eISBN of the source document"),
+    filter_issn: Optional[str] = Query(None, alias="filter[issn]", description="ISSN or eISSN of the source document"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all readings in JSON API format with page-based pagination'''
     
+    ids = resolve_key_filters(repo, "readings", parse_id_filter(filter_id), isbn=filter_isbn, issn=filter_issn)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("readings", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("readings", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("readings", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    reading_data = []
-    for reading in result["items"]:
-        reading_attributes = ReadingAttributes(
-            reading_title=reading["reading_title"],
-            source_document_title=reading["source_document_title"],
-            source_document_genre=reading["source_document_genre"],
-            source_document_genre_code=reading["source_document_genre_code"],
-            source_document_kind=reading["source_document_kind"],
-            source_document_authors=reading.get("source_document_authors"),
-            source_document_publisher=reading.get("source_document_publisher"),
-            source_document_publication_year=reading.get("source_document_publication_year"),
-            source_document_edition=reading.get("source_document_edition"),
-            source_document_volume=reading.get("source_document_volume"),
-            source_document_isbn=reading.get("source_document_isbn"),
-            source_document_eisbn=reading.get("source_document_eisbn"),
-            source_document_issn=reading.get("source_document_issn"),
-            source_document_eissn=reading.get("source_document_eissn"),
-            source_document_created_at=reading.get("source_document_created_at", ""),
-            source_document_updated_at=reading.get("source_document_updated_at", ""),
-            publication_year=reading.get("source_document_publication_year"),  # Assuming this maps to source_document_publication_year
-            volume=reading.get("source_document_volume"),  # Assuming this maps to source_document_volume
-            genre=reading["genre"],
-            genre_code=reading["genre_code"],
-            kind=reading["kind"],
-            article_number=reading.get("article_number", ""),
-            date=reading.get("date"),
-            date_accessed=reading.get("date_accessed"),
-            date_issued=reading.get("date_issued"),
-            authors=reading["authors"],
-            pages=reading.get("pages"),
-            reading_url=reading.get("reading_url", ""),
-            count_kind=reading.get("count_kind"),
-            created_at=reading.get("created_at", ""),
-            updated_at=reading.get("updated_at", "")
-        )
-        reading_item = ReadingData(
-            id=str(reading["id"]),
-            attributes=reading_attributes
-        )
-        reading_data.append(reading_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_data = []
+        for reading in result["items"]:
+            reading_attributes = ReadingAttributes(
+                reading_title=reading["reading_title"],
+                source_document_title=reading["source_document_title"],
+                source_document_genre=reading["source_document_genre"],
+                source_document_genre_code=reading["source_document_genre_code"],
+                source_document_kind=reading["source_document_kind"],
+                source_document_authors=reading.get("source_document_authors"),
+                source_document_publisher=reading.get("source_document_publisher"),
+                source_document_publication_year=reading.get("source_document_publication_year"),
+                source_document_edition=reading.get("source_document_edition"),
+                source_document_volume=reading.get("source_document_volume"),
+                source_document_isbn=reading.get("source_document_isbn"),
+                source_document_eisbn=reading.get("source_document_eisbn"),
+                source_document_issn=reading.get("source_document_issn"),
+                source_document_eissn=reading.get("source_document_eissn"),
+                source_document_created_at=reading.get("source_document_created_at", ""),
+                source_document_updated_at=reading.get("source_document_updated_at", ""),
+                publication_year=reading.get("source_document_publication_year"),  # Assuming this maps to source_document_publication_year
+                volume=reading.get("source_document_volume"),  # Assuming this maps to source_document_volume
+                genre=reading["genre"],
+                genre_code=reading["genre_code"],
+                kind=reading["kind"],
+                article_number=reading.get("article_number", ""),
+                date=reading.get("date"),
+                date_accessed=reading.get("date_accessed"),
+                date_issued=reading.get("date_issued"),
+                authors=reading["authors"],
+                pages=reading.get("pages"),
+                reading_url=reading.get("reading_url", ""),
+                count_kind=reading.get("count_kind"),
+                created_at=reading.get("created_at", ""),
+                updated_at=reading.get("updated_at", "")
+            )
+            reading_item = ReadingData(
+                id=str(reading["id"]),
+                attributes=reading_attributes
+            )
+            reading_data.append(reading_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return ReadingListJsonApiResponse(data=reading_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return ReadingCollectionJsonApiResponse(data=reading_data, links=links.dict(exclude_none=True), meta=meta)
+
+reading_router.add_api_route("/readings", list_readings, methods=["HEAD"], include_in_schema=False)
 
 @reading_router.get(
     "/readings/{id}", 
@@ -203,46 +224,48 @@ async def get_reading(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific reading by ID in JSON API format'''
-    reading = repo.get_by_id("readings", id)
+    with timed_phase("repo"):
+        reading = repo.get_by_id("readings", id)
     
-    # Convert to JSON API format
-    reading_attributes = ReadingAttributes(
-        reading_title=reading["reading_title"],
-        source_document_title=reading["source_document_title"],
-        source_document_genre=reading["source_document_genre"],
-        source_document_genre_code=reading["source_document_genre_code"],
-        source_document_kind=reading["source_document_kind"],
-        source_document_authors=reading.get("source_document_authors"),
-        source_document_publisher=reading.get("source_document_publisher"),
-        source_document_publication_year=reading.get("source_document_publication_year"),
-        source_document_edition=reading.get("source_document_edition"),
-        source_document_volume=reading.get("source_document_volume"),
-        source_document_isbn=reading.get("source_document_isbn"),
-        source_document_eisbn=reading.get("source_document_eisbn"),
-        source_document_issn=reading.get("source_document_issn"),
-        source_document_eissn=reading.get("source_document_eissn"),
-        source_document_created_at=reading.get("source_document_created_at", ""),
-        source_document_updated_at=reading.get("source_document_updated_at", ""),
-        publication_year=reading.get("source_document_publication_year"),  # Assuming this maps to source_document_publication_year
-        volume=reading.get("source_document_volume"),  # Assuming this maps to source_document_volume
-        genre=reading["genre"],
-        genre_code=reading["genre_code"],
-        kind=reading["kind"],
-        article_number=reading.get("article_number", ""),
-        date=reading.get("date"),
-        date_accessed=reading.get("date_accessed"),
-        date_issued=reading.get("date_issued"),
-        authors=reading["authors"],
-        pages=reading.get("pages"),
-        reading_url=reading.get("reading_url", ""),
-        count_kind=reading.get("count_kind"),
-        created_at=reading.get("created_at", ""),
-        updated_at=reading.get("updated_at", "")
-    )
-    reading_data = ReadingData(
-        id=str(reading["id"]),
-        attributes=reading_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        reading_attributes = ReadingAttributes(
+            reading_title=reading["reading_title"],
+            source_document_title=reading["source_document_title"],
+            source_document_genre=reading["source_document_genre"],
+            source_document_genre_code=reading["source_document_genre_code"],
+            source_document_kind=reading["source_document_kind"],
+            source_document_authors=reading.get("source_document_authors"),
+            source_document_publisher=reading.get("source_document_publisher"),
+            source_document_publication_year=reading.get("source_document_publication_year"),
+            source_document_edition=reading.get("source_document_edition"),
+            source_document_volume=reading.get("source_document_volume"),
+            source_document_isbn=reading.get("source_document_isbn"),
+            source_document_eisbn=reading.get("source_document_eisbn"),
+            source_document_issn=reading.get("source_document_issn"),
+            source_document_eissn=reading.get("source_document_eissn"),
+            source_document_created_at=reading.get("source_document_created_at", ""),
+            source_document_updated_at=reading.get("source_document_updated_at", ""),
+            publication_year=reading.get("source_document_publication_year"),  # Assuming this maps to source_document_publication_year
+            volume=reading.get("source_document_volume"),  # Assuming this maps to source_document_volume
+            genre=reading["genre"],
+            genre_code=reading["genre_code"],
+            kind=reading["kind"],
+            article_number=reading.get("article_number", ""),
+            date=reading.get("date"),
+            date_accessed=reading.get("date_accessed"),
+            date_issued=reading.get("date_issued"),
+            authors=reading["authors"],
+            pages=reading.get("pages"),
+            reading_url=reading.get("reading_url", ""),
+            count_kind=reading.get("count_kind"),
+            created_at=reading.get("created_at", ""),
+            updated_at=reading.get("updated_at", "")
+        )
+        reading_data = ReadingData(
+            id=str(reading["id"]),
+            attributes=reading_attributes
+        )
     
     return ReadingJsonApiResponse(data=reading_data)
 
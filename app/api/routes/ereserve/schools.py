@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     SchoolData, SchoolAttributes,
     SchoolListJsonApiResponse, SchoolJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter
 
 school_router = APIRouter(
     tags=["School"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @school_router.get(
@@ -46,29 +50,44 @@ school_router = APIRouter(
 
 async def all_schools(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all schools in JSON API format with page-based pagination'''
     
+    ids = parse_id_filter(filter_id)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("schools", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("schools", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("schools", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    school_data = []
-    for school in result["items"]:
-        school_attributes = SchoolAttributes(name=school["name"])
-        school_item = SchoolData(
-            id=str(school["id"]),
-            attributes=school_attributes
-        )
-        school_data.append(school_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        school_data = []
+        for school in result["items"]:
+            school_attributes = SchoolAttributes(name=school["name"])
+            school_item = SchoolData(
+                id=str(school["id"]),
+                attributes=school_attributes
+            )
+            school_data.append(school_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return SchoolListJsonApiResponse(data=school_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return SchoolListJsonApiResponse(data=school_data, links=links.dict(exclude_none=True), meta=meta)
+
+school_router.add_api_route("/schools", all_schools, methods=["HEAD"], include_in_schema=False)
 
 @school_router.get(
     "/schools/{id}", 
@@ -113,14 +132,16 @@ async def get_school(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific school by ID in JSON API format'''
-    school = repo.get_by_id("schools", id)
+    with timed_phase("repo"):
+        school = repo.get_by_id("schools", id)
     
-    # Convert to JSON API format
-    school_attributes = SchoolAttributes(name=school["name"])
-    school_data = SchoolData(
-        id=str(school["id"]),
-        attributes=school_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        school_attributes = SchoolAttributes(name=school["name"])
+        school_data = SchoolData(
+            id=str(school["id"]),
+            attributes=school_attributes
+        )
     
     return SchoolJsonApiResponse(data=school_data)
 
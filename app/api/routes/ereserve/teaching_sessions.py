@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     TeachingSessionData, TeachingSessionAttributes,
     TeachingSessionListJsonApiResponse, TeachingSessionJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter
 
 teaching_session_router = APIRouter(
     tags=["TeachingSession"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @teaching_session_router.get(
@@ -50,36 +54,51 @@ teaching_session_router = APIRouter(
 )
 async def list_teaching_sessions(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all teaching sessions in JSON API format with page-based pagination'''
     
+    ids = parse_id_filter(filter_id)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("teachingSessions", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("teachingSessions", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("teachingSessions", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    teaching_session_data = []
-    for teaching_session in result["items"]:
-        teaching_session_attributes = TeachingSessionAttributes(
-            name=teaching_session["name"],
-            start_date=teaching_session["start_date"],
-            end_date=teaching_session["end_date"],
-            archived=teaching_session["archived"],
-            created_at=teaching_session.get("created_at", ""),
-            updated_at=teaching_session.get("updated_at", "")
-        )
-        teaching_session_item = TeachingSessionData(
-            id=str(teaching_session["id"]),
-            attributes=teaching_session_attributes
-        )
-        teaching_session_data.append(teaching_session_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        teaching_session_data = []
+        for teaching_session in result["items"]:
+            teaching_session_attributes = TeachingSessionAttributes(
+                name=teaching_session["name"],
+                start_date=teaching_session["start_date"],
+                end_date=teaching_session["end_date"],
+                archived=teaching_session["archived"],
+                created_at=teaching_session.get("created_at", ""),
+                updated_at=teaching_session.get("updated_at", "")
+            )
+            teaching_session_item = TeachingSessionData(
+                id=str(teaching_session["id"]),
+                attributes=teaching_session_attributes
+            )
+            teaching_session_data.append(teaching_session_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return TeachingSessionListJsonApiResponse(data=teaching_session_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return TeachingSessionListJsonApiResponse(data=teaching_session_data, links=links.dict(exclude_none=True), meta=meta)
+
+teaching_session_router.add_api_route("/teaching-sessions", list_teaching_sessions, methods=["HEAD"], include_in_schema=False)
 
 @teaching_session_router.get(
     "/teaching-sessions/{id}", 
@@ -128,21 +147,23 @@ async def get_teaching_session(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific teaching session by ID in JSON API format'''
-    teaching_session = repo.get_by_id("teachingSessions", id)
+    with timed_phase("repo"):
+        teaching_session = repo.get_by_id("teachingSessions", id)
     
-    # Convert to JSON API format
-    teaching_session_attributes = TeachingSessionAttributes(
-        name=teaching_session["name"],
-        start_date=teaching_session["start_date"],
-        end_date=teaching_session["end_date"],
-        archived=teaching_session["archived"],
-        created_at=teaching_session.get("created_at", ""),
-        updated_at=teaching_session.get("updated_at", "")
-    )
-    teaching_session_data = TeachingSessionData(
-        id=str(teaching_session["id"]),
-        attributes=teaching_session_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        teaching_session_attributes = TeachingSessionAttributes(
+            name=teaching_session["name"],
+            start_date=teaching_session["start_date"],
+            end_date=teaching_session["end_date"],
+            archived=teaching_session["archived"],
+            created_at=teaching_session.get("created_at", ""),
+            updated_at=teaching_session.get("updated_at", "")
+        )
+        teaching_session_data = TeachingSessionData(
+            id=str(teaching_session["id"]),
+            attributes=teaching_session_attributes
+        )
     
     return TeachingSessionJsonApiResponse(data=teaching_session_data)
 
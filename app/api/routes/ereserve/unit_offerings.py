@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     UnitOfferingData, UnitOfferingAttributes,
     UnitOfferingListJsonApiResponse, UnitOfferingJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter
 
 unit_offering_router = APIRouter(
     tags=["UnitOffering"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @unit_offering_router.get(
@@ -53,39 +57,54 @@ unit_offering_router = APIRouter(
 )
 async def list_unit_offerings(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all unit offerings in JSON API format with page-based pagination'''
     
+    ids = parse_id_filter(filter_id)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("unitOfferings", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("unitOfferings", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("unitOfferings", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    unit_offering_data = []
-    for unit_offering in result["items"]:
-        unit_offering_attributes = UnitOfferingAttributes(
-            unit_id=unit_offering["unit_id"],
-            reading_list_id=unit_offering.get("reading_list_id"),
-            source_unit_code=unit_offering["source_unit_code"],
-            source_unit_name=unit_offering.get("source_unit_name"),
-            source_unit_offering=unit_offering.get("source_unit_offering"),
-            result=unit_offering["result"],
-            list_publication_method=unit_offering["list_publication_method"],
-            created_at=unit_offering.get("created_at", ""),
-            updated_at=unit_offering.get("updated_at", "")
-        )
-        unit_offering_item = UnitOfferingData(
-            id=str(unit_offering["id"]),
-            attributes=unit_offering_attributes
-        )
-        unit_offering_data.append(unit_offering_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        unit_offering_data = []
+        for unit_offering in result["items"]:
+            unit_offering_attributes = UnitOfferingAttributes(
+                unit_id=unit_offering["unit_id"],
+                reading_list_id=unit_offering.get("reading_list_id"),
+                source_unit_code=unit_offering["source_unit_code"],
+                source_unit_name=unit_offering.get("source_unit_name"),
+                source_unit_offering=unit_offering.get("source_unit_offering"),
+                result=unit_offering["result"],
+                list_publication_method=unit_offering["list_publication_method"],
+                created_at=unit_offering.get("created_at", ""),
+                updated_at=unit_offering.get("updated_at", "")
+            )
+            unit_offering_item = UnitOfferingData(
+                id=str(unit_offering["id"]),
+                attributes=unit_offering_attributes
+            )
+            unit_offering_data.append(unit_offering_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return UnitOfferingListJsonApiResponse(data=unit_offering_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return UnitOfferingListJsonApiResponse(data=unit_offering_data, links=links.dict(exclude_none=True), meta=meta)
+
+unit_offering_router.add_api_route("/unit-offerings", list_unit_offerings, methods=["HEAD"], include_in_schema=False)
 
 @unit_offering_router.get(
     "/unit-offerings/{id}", 
@@ -137,24 +156,26 @@ async def get_unit_offering(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific unit offering by ID in JSON API format'''
-    unit_offering = repo.get_by_id("unitOfferings", id)
+    with timed_phase("repo"):
+        unit_offering = repo.get_by_id("unitOfferings", id)
     
-    # Convert to JSON API format
-    unit_offering_attributes = UnitOfferingAttributes(
-        unit_id=unit_offering["unit_id"],
-        reading_list_id=unit_offering.get("reading_list_id"),
-        source_unit_code=unit_offering["source_unit_code"],
-        source_unit_name=unit_offering.get("source_unit_name"),
-        source_unit_offering=unit_offering.get("source_unit_offering"),
-        result=unit_offering["result"],
-        list_publication_method=unit_offering["list_publication_method"],
-        created_at=unit_offering.get("created_at", ""),
-        updated_at=unit_offering.get("updated_at", "")
-    )
-    unit_offering_data = UnitOfferingData(
-        id=str(unit_offering["id"]),
-        attributes=unit_offering_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        unit_offering_attributes = UnitOfferingAttributes(
+            unit_id=unit_offering["unit_id"],
+            reading_list_id=unit_offering.get("reading_list_id"),
+            source_unit_code=unit_offering["source_unit_code"],
+            source_unit_name=unit_offering.get("source_unit_name"),
+            source_unit_offering=unit_offering.get("source_unit_offering"),
+            result=unit_offering["result"],
+            list_publication_method=unit_offering["list_publication_method"],
+            created_at=unit_offering.get("created_at", ""),
+            updated_at=unit_offering.get("updated_at", "")
+        )
+        unit_offering_data = UnitOfferingData(
+            id=str(unit_offering["id"]),
+            attributes=unit_offering_attributes
+        )
     
     return UnitOfferingJsonApiResponse(data=unit_offering_data)
 
@@ -1,16 +1,20 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, Path, Request
 
 from app.db import EReserveRepository
 from app.api.dependencies import get_ereserve_repository, get_authenticated_user
+from app.api.routing import JsonApiRoute
+from app.core.timing import timed_phase
 from app.schemas.ereserve import (
     UnitData, UnitAttributes,
     UnitListJsonApiResponse, UnitJsonApiResponse
 )
-from .common import build_pagination_links
+from .common import build_pagination_links, build_pagination_meta, build_count_response, parse_id_filter, resolve_key_filters
 
 unit_router = APIRouter(
     tags=["Unit"],
-    dependencies=[Depends(get_authenticated_user)]
+    dependencies=[Depends(get_authenticated_user)],
+    route_class=JsonApiRoute
 )
 
 @unit_router.get(
@@ -48,34 +52,50 @@ unit_router = APIRouter(
 )
 async def list_units(
     request: Request,
-    page_size: int = Query(100, alias="page[size]", ge=1, le=1000, description="Number of items per page"),
+    page_size: int = Query(100, alias="page[size]", ge=0, le=1000, description="Number of items per page (0 returns totals only)"),
     page_number: int = Query(1, alias="page[number]", ge=1, description="Page number (1-based)"),
+    filter_id: Optional[str] = Query(None, alias="filter[id]", description="Comma-separated list of IDs to fetch"),
+    filter_code: Optional[str] = Query(None, alias="filter[code]", description="Unit code (case-insensitive)"),
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Returns all units in JSON API format with page-based pagination'''
     
+    ids = resolve_key_filters(repo, "units", parse_id_filter(filter_id), code=filter_code)
+    
+    # HEAD and page[size]=0 only need the totals
+    if request.method == "HEAD" or page_size == 0:
+        with timed_phase("repo"):
+            total_count = repo.count("units", ids=ids)
+        return build_count_response(total_count, page_size)
+    
     # Get paginated data
-    result = repo.get_all_paginated("units", page_number=page_number, page_size=page_size)
+    with timed_phase("repo"):
+        result = repo.get_all_paginated("units", page_number=page_number, page_size=page_size, ids=ids)
     
-    # Convert to JSON API format
-    unit_data = []
-    for unit in result["items"]:
-        unit_attributes = UnitAttributes(
-            code=unit["code"],
-            name=unit["name"],
-            created_at=unit.get("created_at", ""),
-            updated_at=unit.get("updated_at", "")
-        )
-        unit_item = UnitData(
-            id=str(unit["id"]),
-            attributes=unit_attributes
-        )
-        unit_data.append(unit_item)
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        unit_data = []
+        for unit in result["items"]:
+            unit_attributes = UnitAttributes(
+                code=unit["code"],
+                name=unit["name"],
+                created_at=unit.get("created_at", ""),
+                updated_at=unit.get("updated_at", "")
+            )
+            unit_item = UnitData(
+                id=str(unit["id"]),
+                attributes=unit_attributes
+            )
+            unit_data.append(unit_item)
     
     # Build pagination links
     links = build_pagination_links(request, result["page_number"], result["page_size"], result["total_pages"])
     
-    return UnitListJsonApiResponse(data=unit_data, links=links.dict(exclude_none=True))
+    meta = build_pagination_meta(result["total_count"], result["total_pages"])
+    
+    return UnitListJsonApiResponse(data=unit_data, links=links.dict(exclude_none=True), meta=meta)
+
+unit_router.add_api_route("/units", list_units, methods=["HEAD"], include_in_schema=False)
 
 @unit_router.get(
     "/units/{id}", 
@@ -123,19 +143,21 @@ async def get_unit(
     repo: EReserveRepository = Depends(get_ereserve_repository)
 ):
     '''Get a specific unit by ID in JSON API format'''
-    unit = repo.get_by_id("units", id)
+    with timed_phase("repo"):
+        unit = repo.get_by_id("units", id)
     
-    # Convert to JSON API format
-    unit_attributes = UnitAttributes(
-        code=unit["code"],
-        name=unit["name"],
-        created_at=unit.get("created_at", ""),
-        updated_at=unit.get("updated_at", "")
-    )
-    unit_data = UnitData(
-        id=str(unit["id"]),
-        attributes=unit_attributes
-    )
+    with timed_phase("serialise"):
+        # Convert to JSON API format
+        unit_attributes = UnitAttributes(
+            code=unit["code"],
+            name=unit["name"],
+            created_at=unit.get("created_at", ""),
+            updated_at=unit.get("updated_at", "")
+        )
+        unit_data = UnitData(
+            id=str(unit["id"]),
+            attributes=unit_attributes
+        )
     
     return UnitJsonApiResponse(data=unit_data)
 
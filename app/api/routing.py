@@ -0,0 +1,230 @@
+import asyncio
+import functools
+import json
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from app.core import settings
+from app.core.metrics import http_requests_coalesced
+from app.core.singleflight import SingleFlight
+from app.core.timing import current_phases, format_server_timing, start_timing
+from app.db import current_dataset
+from app.api.errors import JSON_API_CONTENT_TYPE, json_api_error_response
+
+# Key under which the current request's endpoint call may be shared with identical concurrent requests
+_coalesce_key: ContextVar[Optional[Tuple[str, str, str]]] = ContextVar("coalesce_key", default=None)
+
+
+class BoundedBodyRequest(Request):
+    """
+    Request whose body is read at most once and never beyond MAX_REQUEST_BODY_BYTES
+    
+    Starlette caches both the body and the parsed JSON on the request, so the
+    JSON API checks and FastAPI's body validation share a single read and a
+    single json.loads.
+    """
+    
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            max_bytes = settings.MAX_REQUEST_BODY_BYTES
+            content_length = self.headers.get("content-length")
+            if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+                raise self._too_large(max_bytes)
+            
+            chunks = []
+            size = 0
+            async for chunk in self.stream():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise self._too_large(max_bytes)
+                chunks.append(chunk)
+            self._body = b"".join(chunks)
+        return self._body
+    
+    @staticmethod
+    def _too_large(max_bytes: int) -> HTTPException:
+        return HTTPException(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+
+
+class JsonApiResponse(JSONResponse):
+    """
+    JSON response with the JSON API media type
+    
+    Content that is already encoded as bytes is sent as is, anything else is
+    rendered like JSONResponse.
+    """
+    
+    media_type = JSON_API_CONTENT_TYPE
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+
+class JsonApiRoute(APIRoute):
+    """
+    Route class for JSON API endpoints
+    
+    Routes created with this class are tagged as JSON API at registration, so
+    the exception handler and the OpenAPI schema can tell them apart from the
+    matched route instead of matching the request path. Request bodies are
+    read through BoundedBodyRequest, and write requests sent as
+    application/vnd.api+json are checked for valid JSON and for the required
+    top-level members of the body model before the endpoint runs.
+    
+    Responses default to JsonApiResponse. An endpoint returning an instance
+    of its response model is encoded straight to bytes with pydantic's JSON
+    serialiser, honouring the route's response_model_* options, instead of
+    FastAPI dumping the model, validating the dump against the same model
+    and rendering it with json.dumps. Status code and headers set on a
+    Response parameter of the endpoint are kept. Other return values go
+    through FastAPI's usual response model handling.
+    
+    With COALESCE_REQUESTS enabled, concurrent GET and HEAD requests for the
+    same URL and dataset share one endpoint call and its encoded response. Dependencies,
+    authentication included, still run for every request; only the endpoint
+    and the encoding are shared, and nothing is kept once the call finishes.
+    
+    With SERVER_TIMING enabled, responses carry a Server-Timing header with
+    the phases recorded during the request, plus "encode" (rendering the
+    response after the endpoint returns) and "total". HTTP errors raised by
+    the endpoint or its dependencies carry the phases timed until then.
+    """
+    
+    json_api = True
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        if isinstance(kwargs.get("response_class", Default(JSONResponse)), DefaultPlaceholder):
+            kwargs["response_class"] = Default(JsonApiResponse)
+        super().__init__(*args, **kwargs)
+        self.required_members = self._required_body_members()
+        self.single_flight = SingleFlight()
+        if asyncio.iscoroutinefunction(self.dependant.call):
+            self.dependant.call = self._encode_endpoint_result(self.dependant.call)
+    
+    def _encode_endpoint_result(self, endpoint: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Coroutine[Any, Any, Any]]:
+        """Wrap an endpoint to note when it returns, which is where response encoding starts, and encode its response model"""
+        response_model = self.response_model if isinstance(self.response_model, type) and issubclass(self.response_model, BaseModel) else None
+        dump_options = {
+            "include": self.response_model_include,
+            "exclude": self.response_model_exclude,
+            "by_alias": self.response_model_by_alias,
+            "exclude_unset": self.response_model_exclude_unset,
+            "exclude_defaults": self.response_model_exclude_defaults,
+            "exclude_none": self.response_model_exclude_none,
+        }
+        response_param_name = self.dependant.response_param_name
+        status_code = self.status_code or 200
+        
+        async def encoded(*args: Any, **kwargs: Any) -> Any:
+            result = await endpoint(*args, **kwargs)
+            phases = current_phases()
+            if phases is not None:
+                phases["_endpoint_end"] = time.perf_counter()
+            if response_model is None or not isinstance(result, response_model):
+                return result
+            
+            response = JsonApiResponse(result.model_dump_json(**dump_options).encode(), status_code=status_code)
+            sub_response = kwargs.get(response_param_name) if response_param_name else None
+            if sub_response is not None:
+                if sub_response.status_code:
+                    response.status_code = sub_response.status_code
+                response.headers.raw.extend(sub_response.headers.raw)
+            return response
+        
+        @functools.wraps(endpoint)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            key = _coalesce_key.get()
+            if key is None:
+                return await encoded(*args, **kwargs)
+            
+            result, shared = await self.single_flight.run(key, lambda: encoded(*args, **kwargs))
+            if shared:
+                http_requests_coalesced.inc(self.path_format)
+            # Every caller gets its own response, since headers are added to it later on
+            return self._copy_response(result) if isinstance(result, Response) else result
+        
+        return call
+    
+    @staticmethod
+    def _copy_response(response: Response) -> Response:
+        """Copy of a response with a rendered body, sharing the body bytes"""
+        copy = Response(response.body, status_code=response.status_code)
+        copy.raw_headers = list(response.raw_headers)
+        return copy
+    
+    def _required_body_members(self) -> List[str]:
+        """Names of the required top-level members of the request body model"""
+        body_type = getattr(self.body_field, "type_", None)
+        if not (isinstance(body_type, type) and issubclass(body_type, BaseModel)):
+            return []
+        return [field.alias or name for name, field in body_type.model_fields.items() if field.is_required()]
+    
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+        
+        async def json_api_route_handler(request: Request) -> Response:
+            request = BoundedBodyRequest(request.scope, request.receive)
+            if (request.method in ("POST", "PUT", "PATCH") and
+                request.headers.get("content-type") == JSON_API_CONTENT_TYPE):
+                error_response = await self._check_body(request)
+                if error_response is not None:
+                    return error_response
+            
+            if settings.COALESCE_REQUESTS and request.method in ("GET", "HEAD"):
+                token = _coalesce_key.set((request.method, current_dataset(), str(request.url)))
+                try:
+                    return await handle(request)
+                finally:
+                    _coalesce_key.reset(token)
+            return await handle(request)
+        
+        async def handle(request: Request) -> Response:
+            if not settings.SERVER_TIMING:
+                return await original_route_handler(request)
+            
+            start_time = time.perf_counter()
+            phases = start_timing()
+            try:
+                response = await original_route_handler(request)
+            except HTTPException as exc:
+                # Errors keep the phases timed before they were raised; the exception handlers copy exc.headers
+                exc.headers = {**(exc.headers or {}), "Server-Timing": server_timing(phases, start_time)}
+                raise
+            response.headers["Server-Timing"] = server_timing(phases, start_time)
+            return response
+        
+        def server_timing(phases: Dict[str, float], start_time: float) -> str:
+            end_time = time.perf_counter()
+            endpoint_end = phases.pop("_endpoint_end", None)
+            if endpoint_end is not None:
+                phases["encode"] = end_time - endpoint_end
+            phases["total"] = end_time - start_time
+            return format_server_timing(phases)
+        
+        return json_api_route_handler
+    
+    async def _check_body(self, request: Request):
+        """Validate the structure of a JSON API request body, returning an error response if invalid"""
+        if not await request.body():
+            return None
+        
+        try:
+            # Parsed once here; FastAPI reuses the cached result for validation
+            data = await request.json()
+        except json.JSONDecodeError:
+            return json_api_error_response(400, "Request body must be valid JSON", title="Invalid JSON")
+        
+        for member in self.required_members:
+            if not isinstance(data, dict) or member not in data:
+                return json_api_error_response(400, f"Request must contain '{member}' object", title="Invalid Request Format")
+        
+        return None
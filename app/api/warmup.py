@@ -0,0 +1,126 @@
+"""
+Startup warmup and readiness
+
+After startup, the warmup loads the dataset and builds its indexes, then
+sends one single-row request to each JSON API list route through the whole
+middleware stack. That exercises token decoding, every serialiser and the
+response models once, so the first real requests do not pay for it. The
+OpenAPI document is then built, encoded and compressed. The
+/readyz endpoint reports ready only once this has finished.
+"""
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from app.core import logger
+from app.core.auth import create_access_token
+from app.core.metrics import Gauge
+from app.core.openapi import get_openapi_document
+from app.db import load_repository
+
+startup_phase_duration = Gauge(
+    "startup_phase_seconds",
+    "Time spent in each startup phase",
+    ("phase",)
+)
+
+
+class Readiness:
+    """Whether the warmup has finished, and how long each startup phase took"""
+    
+    def __init__(self):
+        self.ready = False
+        self.phases: Dict[str, float] = {}
+    
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the duration of a startup phase"""
+        self.phases[phase] = round(seconds, 4)
+        startup_phase_duration.set(seconds, phase)
+        logger.info("Startup phase {} took {:.3f}s", phase, seconds)
+
+
+readiness = Readiness()
+
+
+def warmup_paths(app: FastAPI) -> List[str]:
+    """Paths of the JSON API list routes, which have no path parameters"""
+    return [
+        route.path for route in app.routes
+        if isinstance(route, APIRoute) and getattr(route, "json_api", False)
+        and "GET" in route.methods and "{" not in route.path
+    ]
+
+
+async def _get(app: FastAPI, path: str, token: str) -> int:
+    """Send a single-row GET straight through the ASGI interface, returning the status code"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"page%5Bsize%5D=1",
+        "headers": [(b"host", b"warmup"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 0), "server": ("warmup", 80),
+        "extensions": {"warmup": {}},
+    }
+    status_code = 500
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+    
+    await app(scope, receive, send)
+    return status_code
+
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    Warm up the data store and the JSON API routes, then mark the app ready
+    
+    The app stays unready if the dataset cannot be loaded.
+    
+    Args:
+        app: FastAPI app whose JSON API list routes are exercised
+    """
+    readiness.ready = False
+    start_time = time.perf_counter()
+    try:
+        # Parse the dataset and build its indexes on the repository I/O pool so the loop keeps serving /readyz
+        phase_start = time.perf_counter()
+        repo = await load_repository()
+        readiness.record("repository", time.perf_counter() - phase_start)
+        
+        phase_start = time.perf_counter()
+        email = next(
+            (
+                user["email"]
+                for collection in repo.USER_COLLECTIONS if repo.has_collection(collection)
+                for user in repo.get_all(collection, limit=1)["items"] if user.get("email")
+            ),
+            None
+        )
+        if email is None:
+            logger.warning("No users in the dataset, skipping route warmup")
+        else:
+            token = create_access_token(data={"sub": email}, expires_delta=timedelta(minutes=1))
+            for path in warmup_paths(app):
+                status_code = await _get(app, path, token)
+                if status_code != 200:
+                    logger.warning("Warmup request to {} returned {}", path, status_code)
+            readiness.record("routes", time.perf_counter() - phase_start)
+        
+        # Build and compress the OpenAPI document so the first docs visit on a new instance is cheap
+        phase_start = time.perf_counter()
+        get_openapi_document(app)
+        readiness.record("openapi", time.perf_counter() - phase_start)
+    except Exception:
+        logger.exception("Warmup failed, the app will not report ready")
+        return
+    
+    readiness.record("warmup", time.perf_counter() - start_time)
+    readiness.ready = True
@@ -1,15 +1,21 @@
+import asyncio
+import weakref
+from functools import lru_cache
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel
 
 from app.core import settings
 from app.core import logger
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def get_password_context():
+    """Password hashing context, created on first use since importing passlib and bcrypt is slow"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class Token(BaseModel):
     access_token: str
@@ -19,10 +25,72 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
+
+class PasswordVerifierBusy(Exception):
+    """Raised when PASSWORD_VERIFY_MAX_PENDING verifications are already in progress"""
+
+# bcrypt is CPU-bound, so verification runs on a bounded pool instead of the event loop
+_password_executor: Optional[Executor] = None
+_password_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _get_password_executor() -> Executor:
+    """Create the password verification pool on first use"""
+    global _password_executor
+    if _password_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _password_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-verify"
+            )
+        logger.info(f"Started {settings.PASSWORD_HASH_EXECUTOR} pool with {settings.PASSWORD_HASH_WORKERS} workers for password verification")
+    return _password_executor
+
+def shutdown_password_executor() -> None:
+    """Stop the password verification pool if it was started"""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password without blocking the event loop
+    
+    At most PASSWORD_VERIFY_MAX_PENDING verifications run or wait per worker.
+    Beyond that, callers either wait for a slot or, with
+    PASSWORD_VERIFY_REJECT_WHEN_SATURATED, are rejected straight away.
+    
+    Args:
+        plain_password: Password supplied by the user
+        hashed_password: Stored bcrypt hash
+        
+    Returns:
+        True if the password matches, False otherwise (including unknown hash formats)
+        
+    Raises:
+        PasswordVerifierBusy: If the verifier is saturated and rejection is enabled
+    """
+    loop = asyncio.get_running_loop()
+    slots = _password_slots.get(loop)
+    if slots is None:
+        slots = _password_slots[loop] = asyncio.Semaphore(settings.PASSWORD_VERIFY_MAX_PENDING)
+    
+    if slots.locked() and settings.PASSWORD_VERIFY_REJECT_WHEN_SATURATED:
+        raise PasswordVerifierBusy()
+    
+    async with slots:
+        try:
+            if settings.PASSWORD_HASH_EXECUTOR == "inline":
+                return verify_password(plain_password, hashed_password)
+            return await loop.run_in_executor(_get_password_executor(), verify_password, plain_password, hashed_password)
+        except ValueError:
+            return False
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
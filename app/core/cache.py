@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Bounded least-recently-used map whose entries expire after a time-to-live"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache
+        
+        Args:
+            maxsize: Maximum number of entries kept. 0 disables the cache
+            ttl: Maximum lifetime of an entry in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, marking it as recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Store an entry, evicting the least recently used ones beyond maxsize
+        
+        Args:
+            key: Key of the entry
+            value: Value to store
+            expires_at: Optional time.monotonic() deadline, used when earlier than the TTL
+        """
+        if self.maxsize <= 0:
+            return
+        
+        deadline = time.monotonic() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def copy_entries(self) -> "OrderedDict[Hashable, Tuple[float, Any]]":
+        """Copy of the entries as (deadline, value) pairs by key, expired ones included"""
+        return OrderedDict(self._entries)
+    
+    def clear(self) -> None:
+        """Remove every entry"""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
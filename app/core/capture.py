@@ -0,0 +1,59 @@
+"""
+Traffic capture for offline replay
+
+Each captured request is one NDJSON line:
+
+    {"ts": 1718000000.123, "method": "GET", "path": "/api/v1/readings/5",
+     "query": "page%5Bsize%5D=10", "dataset": null, "identity": "3f2a9c1d0e4b5a6c",
+     "status": 200, "duration_ms": 2.31, "bytes": 812}
+
+dataset is the value of the DATASET_HEADER header, when the request had one.
+
+identity is a truncated SHA-256 of the Authorization header, so requests
+from the same client can be grouped without storing credentials. Lines are
+written by a loguru sink with size-based rotation, and from a background
+thread when LOG_ENQUEUE is on.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from app.core import settings
+from app.core import logger
+from app.core.logging import CAPTURE_KEY
+
+_capture_logger = logger.bind(**{CAPTURE_KEY: True})
+
+
+def start_capture(path: str, max_bytes: int, backups: int) -> int:
+    """
+    Start writing captured requests to a rotating NDJSON file
+    
+    Args:
+        path: Capture file path
+        max_bytes: Size at which the file is rotated
+        backups: Number of rotated files kept
+        
+    Returns:
+        Loguru sink ID, for logger.remove()
+    """
+    return logger.add(
+        path,
+        format="{message}",
+        filter=lambda record: CAPTURE_KEY in record["extra"],
+        rotation=max_bytes,
+        retention=backups,
+        enqueue=settings.LOG_ENQUEUE,
+    )
+
+
+def identity_hash(authorization: Optional[bytes]) -> Optional[str]:
+    """Truncated SHA-256 of an Authorization header value, or None without one"""
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization).hexdigest()[:16]
+
+
+def record_request(**fields: Any) -> None:
+    """Write one captured request"""
+    _capture_logger.info(json.dumps(fields, separators=(",", ":")))
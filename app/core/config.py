@@ -1,7 +1,7 @@
 import os
 from pathlib import Path
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List
 from dotenv import load_dotenv
 
 # Load environment variables from .env
@@ -21,38 +21,67 @@ class Settings(BaseModel):
     # Data settings
     CSV_FILE_PATH: str = os.getenv("CSV_FILE_PATH", "data/resources.csv")
     JSON_FILE_PATH: str = os.getenv("JSON_FILE_PATH", "data/sample-ereserve-data.json")
+    DATASETS: Dict[str, str] = {   # name=path pairs, comma-separated, served next to the default dataset
+        name.strip(): path.strip()
+        for name, path in (entry.split("=", 1) for entry in os.getenv("DATASETS", "").split(",") if "=" in entry)
+    }
+    DATASET_HEADER: str = os.getenv("DATASET_HEADER", "X-Dataset")
+    DATASET_MEMORY_BUDGET_BYTES: int = int(os.getenv("DATASET_MEMORY_BUDGET_BYTES", "0"))   # 0 keeps every loaded dataset
+    REPOSITORY_IO_WORKERS: int = int(os.getenv("REPOSITORY_IO_WORKERS", "2"))   # threads loading and reloading dataset files
+    MAX_FILTER_IDS: int = int(os.getenv("MAX_FILTER_IDS", "200"))
+    MAX_REQUEST_BODY_BYTES: int = int(os.getenv("MAX_REQUEST_BODY_BYTES", "1048576"))
     
     # Server settings
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))   # worker processes for app.server, 0 sizes to the available CPUs
+    BACKLOG: int = int(os.getenv("BACKLOG", "2048"))
+    KEEP_ALIVE_SECONDS: int = int(os.getenv("KEEP_ALIVE_SECONDS", "5"))
+    GRACEFUL_SHUTDOWN_SECONDS: int = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "10"))
+    WORKER_MIN_UPTIME_SECONDS: float = float(os.getenv("WORKER_MIN_UPTIME_SECONDS", "5"))   # workers exiting sooner crashed on start
+    WORKER_MAX_START_FAILURES: int = int(os.getenv("WORKER_MAX_START_FAILURES", "5"))   # crashes on start in a row before the server gives up
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_ENQUEUE: bool = os.getenv("LOG_ENQUEUE", "true").lower() == "true"
+    LOG_REQUEST_SAMPLE_RATE: float = float(os.getenv("LOG_REQUEST_SAMPLE_RATE", "1.0"))   # share of requests with debug lines
+    WARMUP: bool = os.getenv("WARMUP", "true").lower() == "true"   # /readyz waits for the startup warmup when on
+    COALESCE_REQUESTS: bool = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"   # share endpoint calls between identical concurrent GETs
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "false").lower() == "true"   # per-phase Server-Timing headers on JSON API routes
+    
+    # Event loop monitor settings
+    LOOP_MONITOR: bool = os.getenv("LOOP_MONITOR", "true").lower() == "true"
+    LOOP_MONITOR_INTERVAL_SECONDS: float = float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", "0.1"))
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_SECONDS", "0.25"))   # stall reported with the blocking stack
+    
+    # Traffic capture settings
+    TRAFFIC_CAPTURE_PATH: str = os.getenv("TRAFFIC_CAPTURE_PATH", "")   # empty disables capture
+    TRAFFIC_CAPTURE_MAX_BYTES: int = int(os.getenv("TRAFFIC_CAPTURE_MAX_BYTES", str(50 * 1024 * 1024)))
+    TRAFFIC_CAPTURE_BACKUPS: int = int(os.getenv("TRAFFIC_CAPTURE_BACKUPS", "5"))
+    
+    # Profiling settings
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    SLOW_REQUEST_PROFILE_SECONDS: float = float(os.getenv("SLOW_REQUEST_PROFILE_SECONDS", "0"))   # 0 disables the slow-request trigger
+    SLOW_REQUEST_PROFILE_SAMPLE_RATE: float = float(os.getenv("SLOW_REQUEST_PROFILE_SAMPLE_RATE", "0.01"))   # share of requests profiled for the trigger
     
     # Computed settings
     CSV_FILE_FULL_PATH: str = str(BASE_DIR / CSV_FILE_PATH)
     JSON_FILE_FULL_PATH: str = str(BASE_DIR / JSON_FILE_PATH)
+    DATASET_FULL_PATHS: Dict[str, str] = {name: str(BASE_DIR / path) for name, path in DATASETS.items()}
+    PROFILE_DIR_FULL_PATH: str = str(BASE_DIR / PROFILE_DIR)
     
     # Authentication settings
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     ALGORITHM: str = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+    VERIFY_PASSWORDS: bool = os.getenv("VERIFY_PASSWORDS", "false").lower() == "true"
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")   # thread, process or inline
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_VERIFY_MAX_PENDING: int = int(os.getenv("PASSWORD_VERIFY_MAX_PENDING", "32"))
+    PASSWORD_VERIFY_REJECT_WHEN_SATURATED: bool = os.getenv("PASSWORD_VERIFY_REJECT_WHEN_SATURATED", "true").lower() == "true"
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")   # empty disables admin-only features
     API_KEYS: List[str] = [key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip()]
     
-    # Misc settings
-    JSON_API_ENDPOINTS: List[str] = [
-        "/users/login",
-        "/schools",
-        "/units",
-        "/unit-offerings",
-        "/readings",
-        "/reading-lists",
-        "/reading-list-usages",
-        "/reading-list-items",
-        "/reading-list-item-usages",
-        "/reading-utilisations",
-        "/integration-users",
-        "/teaching-sessions",
-    ]
-    
     class Config:
         case_sensitive = True
     
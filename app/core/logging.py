@@ -2,12 +2,21 @@ import sys
 from loguru import logger
 from .config import settings
 
-# Configure logger
+# Records bound with this key are captured traffic (app.core.capture) and only go to the capture sink
+CAPTURE_KEY = "traffic_capture"
+
+def _not_captured(record) -> bool:
+    return CAPTURE_KEY not in record["extra"]
+
+# Sinks are written from a background thread when LOG_ENQUEUE is on, so file
+# writes, rotation and compression never run on the event loop
 logger.remove()     # remove default handlers
 logger.add(
     sys.stderr,
     level=settings.LOG_LEVEL,
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+    enqueue=settings.LOG_ENQUEUE,
+    filter=_not_captured,
 )
 
 # Add file logging
@@ -17,4 +26,6 @@ logger.add(
     retention="7 days",
     level=settings.LOG_LEVEL,
     compression="zip",
+    enqueue=settings.LOG_ENQUEUE,
+    filter=_not_captured,
 )
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Event-loop lag and blocking-call detection
+
+A task on the event loop sleeps for a fixed interval and records how late it
+wakes up as the loop lag. A watchdog thread checks the task's heartbeat, and
+when the loop has not run it for longer than the block threshold, it captures
+the loop thread's current stack, which is the code blocking the loop.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core import settings
+from app.core import logger
+from app.core.metrics import Counter, Histogram
+
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the lag probe was due to wake up and when it did",
+    buckets=LAG_BUCKETS
+)
+event_loop_blocked = Counter(
+    "event_loop_blocked_total",
+    "Times the event loop was blocked for longer than the block threshold"
+)
+
+
+class LoopMonitor:
+    """Measures the lag of the running event loop and reports calls that block it"""
+    
+    def __init__(self, interval: float, block_threshold: float):
+        """
+        Initialize the monitor
+        
+        Args:
+            interval: Seconds between lag probes
+            block_threshold: Seconds without a probe after which the loop counts as blocked
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.last_blocked_stack: Optional[str] = None
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+    
+    def start(self) -> None:
+        """Start the probe task on the running loop and the watchdog thread"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+    
+    async def stop(self) -> None:
+        """Stop the probe task and the watchdog thread"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+    
+    async def _probe(self) -> None:
+        while True:
+            due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            event_loop_lag.observe(max(now - due, 0.0))
+            self._heartbeat = now
+    
+    def _watch(self) -> None:
+        reported = False
+        while not self._stopped.wait(self.block_threshold / 2):
+            stalled_for = time.monotonic() - self._heartbeat - self.interval
+            if stalled_for <= self.block_threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            
+            # Report each stall once, with the stack of whatever is running on the loop thread
+            reported = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self.last_blocked_stack = "".join(traceback.format_stack(frame))
+            event_loop_blocked.inc()
+            logger.warning("Event loop blocked for over {:.3f}s, currently in:\n{}", stalled_for, self.last_blocked_stack)
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS
+)
@@ -0,0 +1,221 @@
+"""
+Memory introspection helpers for the admin endpoints
+
+Sizes are deep sizes from sys.getsizeof. Objects already counted are not
+counted again, so an index only reports its own overhead and not the rows
+it points to.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    import resource
+except ImportError:     # not available on Windows
+    resource = None
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Approximate size in bytes of an object and everything it contains
+    
+    Args:
+        obj: Object made of dicts, lists, tuples, sets and scalars
+        seen: IDs of objects already counted, shared between calls to avoid double counting
+        
+    Returns:
+        Size in bytes of the objects not already in seen
+    """
+    if seen is None:
+        seen = set()
+    
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+def snapshot_memory(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sizes of the collections and indexes of a repository snapshot
+    
+    Args:
+        snapshot: Snapshot as built by EReserveRepository
+        
+    Returns:
+        Rows and bytes per collection, and bytes per index
+    """
+    seen: Set[int] = set()
+    collections = {
+        name: {"rows": len(items), "bytes": deep_sizeof(items, seen)}
+        for name, items in snapshot["data"].items()
+        if isinstance(items, list)
+    }
+    id_indexes = {name: deep_sizeof(index, seen) for name, index in snapshot["id_index"].items()}
+    key_indexes = {
+        f"{collection}.{name}": deep_sizeof(index, seen)
+        for collection, indexes in snapshot["key_index"].items()
+        for name, index in indexes.items()
+    }
+    return {"collections": collections, "id_indexes": id_indexes, "key_indexes": key_indexes}
+
+
+def cache_memory(cache: Any) -> Dict[str, Any]:
+    """
+    Entries, approximate size and hit counts of an in-process cache
+    
+    Args:
+        cache: Cache with hits and misses attributes, such as TTLCache
+        
+    Returns:
+        Entries, bytes, hits and misses. Bytes is None for caches that cannot copy their entries
+    """
+    copy_entries = getattr(cache, "copy_entries", None)
+    return {
+        "entries": len(cache),
+        "bytes": deep_sizeof(copy_entries()) if copy_entries else None,
+        "hits": cache.hits,
+        "misses": cache.misses,
+    }
+
+
+def _sample(values: List[Any], sample_size: int) -> List[Any]:
+    """Up to sample_size evenly spaced values"""
+    return values[::max(1, len(values) // sample_size)][:sample_size]
+
+
+def estimate_snapshot_bytes(snapshot: Dict[str, Any], sample_size: int = 200) -> int:
+    """
+    Estimated total size of a repository snapshot
+    
+    snapshot_memory sizes every object and takes longer than loading the
+    snapshot, so this sizes an evenly spaced sample of the rows of each
+    collection and of the entries of each index, and scales it up. Index
+    entries count their keys and match lists but not the rows they point to.
+    
+    Args:
+        snapshot: Snapshot as built by EReserveRepository
+        sample_size: Rows or entries sized per collection or index
+        
+    Returns:
+        Estimated size in bytes
+    """
+    seen: Set[int] = set()
+    total = 0
+    for items in snapshot["data"].values():
+        if not isinstance(items, list) or not items:
+            total += deep_sizeof(items, seen)
+            continue
+        sample = _sample(items, sample_size)
+        total += sys.getsizeof(items) + sum(deep_sizeof(item, seen) for item in sample) * len(items) // len(sample)
+    
+    indexes = list(snapshot["id_index"].values())
+    indexes.extend(index for collection in snapshot["key_index"].values() for index in collection.values())
+    for index in indexes:
+        total += sys.getsizeof(index)
+        if index:
+            sample = _sample(list(index), sample_size)
+            entry_bytes = sum(sys.getsizeof(key) + (sys.getsizeof(index[key]) if isinstance(index[key], list) else 0) for key in sample)
+            total += entry_bytes * len(index) // len(sample)
+    return total
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of this process in bytes, where the platform reports them"""
+    rss = peak_rss = None
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    peak_rss = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    
+    if peak_rss is None and resource is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            peak_rss *= 1024
+    return {"rss_bytes": rss, "peak_rss_bytes": peak_rss, "pid": os.getpid()}
+
+
+def gc_stats() -> Dict[str, Any]:
+    """Garbage collector thresholds, pending counts and per-generation statistics"""
+    return {
+        "enabled": gc.isenabled(),
+        "thresholds": gc.get_threshold(),
+        "counts": gc.get_count(),
+        "generations": gc.get_stats(),
+        "frozen": gc.get_freeze_count(),
+    }
+
+
+class AllocationWindow:
+    """Window of tracemalloc tracing, reporting allocations made since it started"""
+    
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+    
+    @property
+    def active(self) -> bool:
+        return self._baseline is not None and tracemalloc.is_tracing()
+    
+    def start(self, frames: int = 1) -> None:
+        """Start tracing allocations, replacing any window already open"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        tracemalloc.start(frames)
+        self._baseline = tracemalloc.take_snapshot()
+    
+    def stop(self) -> None:
+        """Stop tracing and discard the window"""
+        self._baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    
+    def top(self, limit: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+        """
+        Top allocation sites by growth since the window started
+        
+        Args:
+            limit: Number of sites to report
+            group_by: "lineno", "filename" or "traceback"
+            
+        Returns:
+            Traced memory totals and the top sites
+        """
+        if not self.active:
+            return {"tracing": False}
+        
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        sites: List[Dict[str, Any]] = [
+            {
+                "site": str(stat.traceback) if group_by != "traceback" else stat.traceback.format(),
+                "size_diff_bytes": stat.size_diff,
+                "size_bytes": stat.size,
+                "count_diff": stat.count_diff,
+            }
+            for stat in snapshot.compare_to(self._baseline, group_by)[:limit]
+        ]
+        return {"tracing": True, "traced_bytes": current, "traced_peak_bytes": peak, "top": sites}
+
+
+allocation_window = AllocationWindow()
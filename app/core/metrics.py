@@ -0,0 +1,241 @@
+"""
+In-process metrics rendered in the Prometheus text format
+
+Each worker process keeps its own plain counters. Updates are simple
+dictionary and integer operations with no locking or I/O, and values are
+only formatted when /metrics is scraped.
+"""
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for a metric family with optional labels"""
+    
+    type = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return lines
+    
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class _Value(Metric):
+    """
+    Metric holding a single value per label set
+    
+    A callback returning (labels, value) pairs can be given instead of
+    updating values, for metrics that are cheapest to read at scrape time.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Iterable[Tuple[LabelValues, float]]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+    
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+    
+    def remove(self, *labels: str) -> None:
+        self._values.pop(labels, None)
+    
+    def _samples(self) -> Iterable[str]:
+        values = self._callback() if self._callback else list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Counter(_Value):
+    """Monotonically increasing value per label set"""
+    
+    type = "counter"
+
+
+class Gauge(_Value):
+    """Value that can go up and down per label set"""
+    
+    type = "gauge"
+    
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+    
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets per label set"""
+    
+    type = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: non-cumulative bucket counts (last one is +Inf), then the sum of observations
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+    
+    def observe(self, value: float, *labels: str) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+    
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+    
+    def _samples(self) -> Iterable[str]:
+        names = self.labelnames + ("le",)
+        for labels, (counts, total) in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total[0])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+REGISTRY: List[Metric] = []
+_caches: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """
+    Expose the hit and miss counters of a cache
+    
+    Args:
+        name: Value of the cache label
+        cache: Object with hits and misses attributes, such as TTLCache
+    """
+    _caches[name] = cache
+
+
+def registered_caches() -> Dict[str, Any]:
+    """Caches registered with register_cache, by name"""
+    return dict(_caches)
+
+
+def _cache_ratios() -> Iterable[Tuple[LabelValues, float]]:
+    for name, cache in list(_caches.items()):
+        lookups = cache.hits + cache.misses
+        yield (name,), cache.hits / lookups if lookups else 0
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# HTTP metrics, recorded by MetricsMiddleware
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the response headers",
+    ("method", "route", "status")
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled"
+)
+http_response_size = Histogram(
+    "http_response_size_bytes",
+    "Size of response bodies",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS
+)
+
+# Recorded by JsonApiRoute
+http_requests_coalesced = Counter(
+    "http_requests_coalesced_total",
+    "Requests answered by an identical request's endpoint call already in flight",
+    ("route",)
+)
+
+# Repository metrics
+repository_load_duration = Histogram(
+    "ereserve_repository_load_duration_seconds",
+    "Time to load a dataset file and build its indexes",
+    ("kind",)
+)
+snapshot_bytes = Gauge(
+    "ereserve_snapshot_bytes",
+    "Estimated memory held by each loaded dataset snapshot",
+    ("dataset",)
+)
+snapshot_evictions = Counter(
+    "ereserve_snapshot_evictions_total",
+    "Dataset snapshots dropped to stay within DATASET_MEMORY_BUDGET_BYTES",
+    ("dataset",)
+)
+collection_rows = Gauge(
+    "ereserve_collection_rows",
+    "Number of rows in each loaded collection",
+    ("dataset", "collection")
+)
+
+# Cache metrics, read from registered caches at scrape time
+cache_hits = Counter(
+    "cache_hits_total",
+    "Cache lookups that found a live entry",
+    ("cache",),
+    callback=lambda: [((name,), cache.hits) for name, cache in list(_caches.items())]
+)
+cache_misses = Counter(
+    "cache_misses_total",
+    "Cache lookups that found no live entry",
+    ("cache",),
+    callback=lambda: [((name,), cache.misses) for name, cache in list(_caches.items())]
+)
+cache_hit_ratio = Gauge(
+    "cache_hit_ratio",
+    "Share of cache lookups that were hits since startup",
+    ("cache",),
+    callback=_cache_ratios
+)
@@ -1,7 +1,20 @@
+import gzip
+import hashlib
+import json
+from typing import NamedTuple
+
 from fastapi.openapi.utils import get_openapi
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app.core import settings
 
+class OpenApiDocument(NamedTuple):
+    """OpenAPI schema encoded once, ready to be served as is"""
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
 def custom_openapi(app):
     """
     Customize the OpenAPI schema for the application with security requirements.
@@ -15,6 +28,19 @@ def custom_openapi(app):
     if app.openapi_schema:
         return app.openapi_schema
     
+    app.openapi_schema = generate_openapi(app)
+    return app.openapi_schema
+
+def generate_openapi(app):
+    """
+    Build the customized OpenAPI schema from the app's routes, without caching
+    
+    Args:
+        app: The FastAPI application instance
+        
+    Returns:
+        Dict[str, Any]: The customized OpenAPI schema
+    """
     openapi_schema = get_openapi(
         title="Mock API - Team B",
         version=settings.APP_VERSION,
@@ -60,12 +86,14 @@ def custom_openapi(app):
     openapi_schema["security"] = [{"HTTPBearer": []}]
     
     # Convert all endpoints to use JSON API content types
-    json_api_endpoints = settings.JSON_API_ENDPOINTS
+    json_api_paths = {
+        route.path_format for route in app.routes if getattr(route, "json_api", False)
+    }
     
     if "paths" in openapi_schema:
         for path, path_data in openapi_schema["paths"].items():
             # Check if this endpoint should use JSON API format
-            should_use_json_api = any(path.endswith(endpoint) for endpoint in json_api_endpoints)
+            should_use_json_api = path in json_api_paths
             
             if should_use_json_api:
                 for method, method_data in path_data.items():
@@ -86,5 +114,79 @@ def custom_openapi(app):
                                 json_api_content = response_data["content"].pop("application/json")
                                 response_data["content"]["application/vnd.api+json"] = json_api_content
     
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
+    return openapi_schema
+
+def get_openapi_document(app) -> OpenApiDocument:
+    """
+    Get the app's OpenAPI document, encoding and compressing it on first use
+    
+    Args:
+        app: The FastAPI application instance
+        
+    Returns:
+        The encoded document, its gzip compression and its ETag
+    """
+    document = getattr(app.state, "openapi_document", None)
+    if document is None:
+        # Same encoding as FastAPI's JSONResponse, so the bytes match what the default route served
+        body = json.dumps(app.openapi(), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+        document = OpenApiDocument(
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        )
+        app.state.openapi_document = document
+    return document
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a gzip response
+    
+    Codings are matched by name, so x-gzip does not count, and gzip;q=0
+    refuses gzip. An explicit gzip entry takes precedence over "*".
+    
+    Args:
+        accept_encoding: Value of the Accept-Encoding header
+        
+    Returns:
+        True if gzip, or "*" without a gzip entry, has a q-value above 0
+    """
+    qvalues = {}
+    for entry in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in entry.split(";")]
+        qvalue = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[coding.lower()] = qvalue
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+def install_openapi_route(app) -> None:
+    """
+    Serve the OpenAPI document at app.openapi_url from precomputed bytes
+    
+    Replaces FastAPI's default route, which serializes the schema again on
+    every request. Clients sending If-None-Match get a 304, and clients
+    accepting gzip get the precompressed body.
+    
+    Args:
+        app: The FastAPI application instance
+    """
+    app.router.routes = [route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url]
+    
+    async def openapi(request: Request) -> Response:
+        document = get_openapi_document(app)
+        headers = {"ETag": document.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        
+        if document.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        if accepts_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(document.gzip_body, media_type="application/json", headers=headers)
+        return Response(document.body, media_type="application/json", headers=headers)
+    
+    app.add_route(app.openapi_url, openapi, include_in_schema=False)
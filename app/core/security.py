@@ -1,14 +1,41 @@
+import hmac
+import time
+from typing import Optional
+
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
 
 from app.core.auth import decode_token
-from app.db import EReserveRepository
+from app.core.cache import TTLCache
+from app.core.metrics import register_cache
+from app.core.timing import timed_phase
+from app.core import settings
+from app.db import DEFAULT_DATASET, EReserveRepository, current_dataset, load_repository
 
 bearer_scheme = HTTPBearer(auto_error=False, scheme_name="HTTPBearer")
 
+# Verified tokens and the users they resolved to, by dataset, so a repeated bearer skips decoding and the user lookup
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+EReserveRepository.add_reload_callback(token_cache.clear)
+register_cache("token", token_cache)
+
+def _token_deadline(exp: Optional[float]) -> Optional[float]:
+    """Convert a token's exp claim (epoch seconds) to a time.monotonic() deadline"""
+    if exp is None:
+        return None
+    return time.monotonic() + (float(exp) - time.time())
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
     """Validate the bearer token"""
+    with timed_phase("auth"):
+        # Load the dataset off the event loop before the user lookup needs it
+        if not EReserveRepository.is_loaded():
+            await load_repository()
+        return _resolve_user(credentials)
+
+def _resolve_user(credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
+    """Resolve the user for a bearer token, from the token cache when possible"""
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -17,6 +44,11 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(b
         )
     
     token = credentials.credentials
+    cache_key = (current_dataset(), token)
+    user = token_cache.get(cache_key)
+    if user is not None:
+        return user
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -31,11 +63,20 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(b
     except JWTError:
         raise credentials_exception
     
+    # Tokens are issued for one dataset; those without the claim predate datasets and belong to the default one
+    if payload.get("dataset", DEFAULT_DATASET) != current_dataset():
+        raise credentials_exception
+    
     # Verify user exists
-    repo = EReserveRepository()
-    users = repo.get_all("users")["items"]
-    integration_users = repo.get_all("integrationUsers")["items"]
-    if not any(u.get("email") == username for u in users + integration_users):
+    if EReserveRepository().find_user_by_email(username) is None:
         raise credentials_exception
     
-    return {"username": username}
\ No newline at end of file
+    user = {"username": username}
+    token_cache.set(cache_key, user, expires_at=_token_deadline(payload.get("exp")))
+    return user
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Check a token against ADMIN_TOKEN in constant time. Always False when no admin token is configured"""
+    if not settings.ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode())
@@ -0,0 +1,50 @@
+"""
+Single-flight deduplication of concurrent identical work
+
+The first caller for a key starts the work as its own task, and callers
+arriving while it runs await the same task instead of repeating it. The key
+is forgotten as soon as the work finishes, so nothing is cached: a call
+made after completion starts fresh work.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Runs at most one coroutine per key at a time, sharing its outcome with concurrent callers"""
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+    
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await func(), or the call already running for key
+        
+        The work runs in a separate task that is shielded from callers being
+        cancelled, so a disconnecting client does not fail the others.
+        Exceptions raised by the work are raised to every caller.
+        
+        Args:
+            key: Identity of the work
+            func: Coroutine function doing the work, only called by the first caller
+        
+        Returns:
+            The result, and whether it was shared from another caller's call
+        """
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), shared
+    
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    def in_flight(self) -> int:
+        """Number of keys with work running"""
+        return len(self._in_flight)
@@ -0,0 +1,65 @@
+"""
+Per-request phase timings for the Server-Timing header
+
+A request handler starts a timing context, and code running inside it
+records named phases with timed_phase(). Outside a timing context (or
+with SERVER_TIMING disabled) timed_phase() only does one ContextVar lookup.
+"""
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar("server_timing_phases", default=None)
+
+
+class _PhaseTimer:
+    """Context manager adding the time spent in its block to a named phase"""
+    
+    __slots__ = ("name", "phases", "start")
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __enter__(self) -> None:
+        self.phases = _phases.get()
+        if self.phases is not None:
+            self.start = time.perf_counter()
+    
+    def __exit__(self, *exc_info) -> None:
+        if self.phases is not None:
+            self.phases[self.name] = self.phases.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+def timed_phase(name: str) -> _PhaseTimer:
+    """
+    Time a block as a named phase of the current request
+    
+    Args:
+        name: Phase name. Repeated phases are summed
+    """
+    return _PhaseTimer(name)
+
+
+def start_timing() -> Dict[str, float]:
+    """Start collecting phases for the current request and return the phase durations in seconds"""
+    phases: Dict[str, float] = {}
+    _phases.set(phases)
+    return phases
+
+
+def current_phases() -> Optional[Dict[str, float]]:
+    """Phase durations of the current request, or None outside a timing context"""
+    return _phases.get()
+
+
+def format_server_timing(phases: Dict[str, float]) -> str:
+    """
+    Format phase durations as a Server-Timing header value
+    
+    Args:
+        phases: Phase durations in seconds
+        
+    Returns:
+        Header value such as "auth;dur=0.12, repo;dur=1.30" (milliseconds)
+    """
+    return ", ".join(f"{name};dur={duration * 1000:.2f}" for name, duration in phases.items())
@@ -1 +1,3 @@
-from .ereserve_repository import EReserveRepository
\ No newline at end of file
+from .datasets import DEFAULT_DATASET, current_dataset, current_dataset_path, dataset_path, reset_dataset, use_dataset
+from .ereserve_repository import EReserveRepository
+from .async_repository import load_repository, reload_repository, shutdown_repository_executor
\ No newline at end of file
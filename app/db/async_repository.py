@@ -0,0 +1,90 @@
+"""
+Async access to EReserveRepository without blocking the event loop
+
+Opening and parsing a dataset file and building its indexes run on a
+bounded pool of REPOSITORY_IO_WORKERS threads. Concurrent loads or reloads
+of the same file share a single run. Once a dataset is loaded, getting a
+repository does no I/O, and its lookups read in-memory indexes, so they
+stay on the event loop.
+"""
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core import settings
+from app.core import logger
+from app.core.singleflight import SingleFlight
+from .datasets import current_dataset_path
+from .ereserve_repository import EReserveRepository
+
+_repository_executor: Optional[Executor] = None
+_file_operations = SingleFlight()
+
+
+def _get_repository_executor() -> Executor:
+    """Create the repository I/O pool on first use"""
+    global _repository_executor
+    if _repository_executor is None:
+        _repository_executor = ThreadPoolExecutor(
+            max_workers=settings.REPOSITORY_IO_WORKERS,
+            thread_name_prefix="repository-io"
+        )
+        logger.info(f"Started thread pool with {settings.REPOSITORY_IO_WORKERS} workers for repository I/O")
+    return _repository_executor
+
+
+def shutdown_repository_executor() -> None:
+    """Stop the repository I/O pool if it was started"""
+    global _repository_executor
+    if _repository_executor is not None:
+        _repository_executor.shutdown(wait=False, cancel_futures=True)
+        _repository_executor = None
+
+
+async def run_repository_io(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking repository call on the repository I/O pool"""
+    return await asyncio.get_running_loop().run_in_executor(_get_repository_executor(), func, *args)
+
+
+async def load_repository(file_path: Optional[str] = None) -> EReserveRepository:
+    """
+    Get a repository for a dataset, loading the file off the event loop if needed
+    
+    Args:
+        file_path: Optional path to the JSON file. The current request's dataset will be used if not provided
+    
+    Returns:
+        Repository on the loaded dataset
+    """
+    file_path = file_path or current_dataset_path()
+    if EReserveRepository.is_loaded(file_path):
+        return EReserveRepository(file_path)
+    
+    repo, _ = await _file_operations.run(("load", file_path), lambda: run_repository_io(EReserveRepository, file_path))
+    return repo
+
+
+async def reload_repository(file_path: Optional[str] = None) -> EReserveRepository:
+    """
+    Reload a dataset file off the event loop and switch every new repository to it
+    
+    The file is parsed and its snapshot stored on the repository I/O pool,
+    then the reload callbacks run on the event loop. Requests in progress
+    keep the snapshot they started with.
+    
+    Args:
+        file_path: Optional path to the JSON file. The current request's dataset will be used if not provided
+    
+    Returns:
+        Repository on the reloaded dataset
+    """
+    repo = await load_repository(file_path)
+    
+    async def reload() -> EReserveRepository:
+        snapshot = await run_repository_io(repo._load_snapshot, "reload")
+        repo._use_snapshot(snapshot)
+        repo._reloaded()
+        return repo
+    
+    reloaded, _ = await _file_operations.run(("reload", repo.file_path), reload)
+    return reloaded
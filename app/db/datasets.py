@@ -0,0 +1,44 @@
+"""
+Dataset selection for serving several institutions from one instance
+
+Datasets are the default JSON_FILE_PATH plus the named files in DATASETS.
+The dataset of the current request is kept in a ContextVar, set by
+DatasetMiddleware, and repositories created without a file path use it.
+Outside a request the default dataset is used.
+"""
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from app.core import settings
+
+DEFAULT_DATASET = "default"
+
+_current_dataset: ContextVar[str] = ContextVar("dataset", default=DEFAULT_DATASET)
+
+
+def dataset_path(name: str) -> Optional[str]:
+    """Full path of a named dataset's file, or None if no such dataset is configured"""
+    path = settings.DATASET_FULL_PATHS.get(name)
+    if path is None and name == DEFAULT_DATASET:
+        return settings.JSON_FILE_FULL_PATH
+    return path
+
+
+def current_dataset() -> str:
+    """Name of the dataset the current request is served from"""
+    return _current_dataset.get()
+
+
+def current_dataset_path() -> str:
+    """Full path of the file of the dataset the current request is served from"""
+    return dataset_path(_current_dataset.get()) or settings.JSON_FILE_FULL_PATH
+
+
+def use_dataset(name: str) -> Token:
+    """Serve the current context from a dataset, returning the token to pass to reset_dataset()"""
+    return _current_dataset.set(name)
+
+
+def reset_dataset(token: Token) -> None:
+    """Go back to the dataset used before use_dataset()"""
+    _current_dataset.reset(token)
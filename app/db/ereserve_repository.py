@@ -1,23 +1,237 @@
 import json
-from typing import Optional, Dict, Any
+import os
+import re
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Optional, Dict, Any, List, Callable, NamedTuple, Tuple
 from fastapi import HTTPException
 
 from app.core import settings
 from app.core import logger
+from app.core.memory import estimate_snapshot_bytes
+from app.core.metrics import collection_rows, repository_load_duration, snapshot_bytes, snapshot_evictions
+from .datasets import current_dataset_path
+
+def normalize_text(value: Any) -> str:
+    """Normalize a text key such as an email or code for case-insensitive lookups"""
+    return str(value).strip().casefold()
+
+def normalize_standard_number(value: Any) -> str:
+    """Normalize an ISBN/ISSN by dropping hyphens and spaces"""
+    return re.sub(r"[\s-]", "", str(value)).upper()
+
+class KeyIndex(NamedTuple):
+    """Declaration of a lookup index over one or more fields of a collection"""
+    fields: Tuple[str, ...]
+    normalize: Callable[[Any], str] = normalize_text
+    unique: bool = True
 
 class EReserveRepository:
     """Repository for CRUD operations on sample data in JSON file"""
     
+    # Loaded data and indexes shared by every repository instance, keyed by file path,
+    # from least to most recently used
+    _snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    
+    # Called after every reload so caches built on top of the data can be invalidated
+    _reload_callbacks: List[Callable[[], None]] = []
+    
+    # Lookup indexes built at load, by collection and index name
+    KEY_INDEXES: Dict[str, Dict[str, KeyIndex]] = {
+        "users": {
+            "email": KeyIndex(("email",)),
+        },
+        "integrationUsers": {
+            "email": KeyIndex(("email",)),
+            "identifier": KeyIndex(("identifier",)),
+            "lti_consumer_user_id": KeyIndex(("lti_consumer_user_id",)),
+            "lti_lis_person_sourcedid": KeyIndex(("lti_lis_person_sourcedid",)),
+        },
+        "units": {
+            "code": KeyIndex(("code",)),
+        },
+        # Chapters and articles share the ISBN/ISSN of their source document
+        "readings": {
+            "isbn": KeyIndex(("source_document_isbn", "source_document_eisbn"), normalize_standard_number, unique=False),
+            "issn": KeyIndex(("source_document_issn", "source_document_eissn"), normalize_standard_number, unique=False),
+        },
+    }
+    
+    # Collections searched, in order, when authenticating a user by email
+    USER_COLLECTIONS = ("users", "integrationUsers")
+    
     def __init__(self, file_path: Optional[str] = None):
         """
         Initialize the repository
         
         Args:
-            file_path: Optional path to the JSON file. Path from settings will be used if not provided 
+            file_path: Optional path to the JSON file. The current request's dataset will be used if not provided 
+        """
+        self.file_path = file_path or current_dataset_path()
+        logger.debug("Initialized EReserveRepository with file path: {}", self.file_path)
+        
+        snapshot = self._snapshots.get(self.file_path)
+        if snapshot is None:
+            snapshot = self._load_snapshot("load")
+        else:
+            # The snapshot may have been evicted since the lookup, in which case this instance keeps it alive
+            with suppress(KeyError):
+                self._snapshots.move_to_end(self.file_path)
+        self._use_snapshot(snapshot)
+    
+    def _load_snapshot(self, kind: str) -> Dict[str, Any]:
+        """
+        Load the JSON file, build its snapshot and record load metrics
+        
+        Args:
+            kind: Value of the metric's kind label ("load" or "reload")
+            
+        Returns:
+            The snapshot now shared for this file path
+        """
+        start_time = time.perf_counter()
+        snapshot = self._build_snapshot(self._load_data())
+        snapshot["estimated_bytes"] = estimate_snapshot_bytes(snapshot)
+        self._snapshots[self.file_path] = snapshot
+        self._snapshots.move_to_end(self.file_path)
+        repository_load_duration.observe(time.perf_counter() - start_time, kind)
+        
+        dataset = os.path.basename(self.file_path)
+        snapshot_bytes.set(snapshot["estimated_bytes"], dataset)
+        for collection, items in snapshot["data"].items():
+            if isinstance(items, list):
+                collection_rows.set(len(items), dataset, collection)
+        
+        self._evict_over_budget(keep=self.file_path)
+        return snapshot
+    
+    @classmethod
+    def _evict_over_budget(cls, keep: str) -> None:
+        """
+        Drop least recently used snapshots until the loaded ones fit DATASET_MEMORY_BUDGET_BYTES
+        
+        Evicted datasets are loaded again on their next use. Repositories
+        already created keep their snapshot until they are released.
+        
+        Args:
+            keep: File path of the snapshot that is never evicted, the one just loaded
         """
-        self.file_path = file_path or settings.JSON_FILE_FULL_PATH
-        logger.debug(f"Initialized EReserveRepository with file path: {self.file_path}")
-        self._data = self._load_data()
+        budget = settings.DATASET_MEMORY_BUDGET_BYTES
+        if budget <= 0:
+            return
+        
+        total = sum(snapshot.get("estimated_bytes", 0) for snapshot in list(cls._snapshots.values()))
+        for file_path in list(cls._snapshots):
+            if total <= budget:
+                break
+            if file_path == keep:
+                continue
+            snapshot = cls.unload(file_path)
+            if snapshot is None:
+                continue
+            total -= snapshot.get("estimated_bytes", 0)
+            
+            dataset = os.path.basename(file_path)
+            snapshot_evictions.inc(dataset)
+            logger.info("Evicted dataset {} ({} bytes) to stay within the {} byte budget", dataset, snapshot.get("estimated_bytes", 0), budget)
+    
+    @classmethod
+    def unload(cls, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Drop a loaded snapshot and its gauges, so the file is loaded again on its next use
+        
+        Args:
+            file_path: Path of the dataset file
+            
+        Returns:
+            The dropped snapshot, or None if the file was not loaded
+        """
+        snapshot = cls._snapshots.pop(file_path, None)
+        if snapshot is not None:
+            dataset = os.path.basename(file_path)
+            snapshot_bytes.remove(dataset)
+            for collection in snapshot["data"]:
+                collection_rows.remove(dataset, collection)
+        return snapshot
+    
+    def _use_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Point this instance at a loaded snapshot"""
+        self._data = snapshot["data"]
+        self._id_index = snapshot["id_index"]
+        self._key_index = snapshot["key_index"]
+    
+    def reload(self) -> None:
+        """Reload data from the JSON file and rebuild the indexes shared by all instances"""
+        self._use_snapshot(self._load_snapshot("reload"))
+        self._reloaded()
+    
+    def _reloaded(self) -> None:
+        """Log a reload and notify the reload callbacks"""
+        logger.info(f"Reloaded eReserve data from {self.file_path}")
+        
+        for callback in self._reload_callbacks:
+            callback()
+    
+    @classmethod
+    def loaded_snapshots(cls) -> Dict[str, Dict[str, Any]]:
+        """Snapshots loaded so far, by file path"""
+        return dict(cls._snapshots)
+    
+    @classmethod
+    def is_loaded(cls, file_path: Optional[str] = None) -> bool:
+        """Whether a file, by default the current request's dataset, is loaded so creating a repository for it does no I/O"""
+        return (file_path or current_dataset_path()) in cls._snapshots
+    
+    @classmethod
+    def add_reload_callback(cls, callback: Callable[[], None]) -> None:
+        """Register a function to call whenever the data is reloaded"""
+        cls._reload_callbacks.append(callback)
+    
+    @classmethod
+    def _build_snapshot(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the id index and the declared key indexes for the loaded data"""
+        id_index = {
+            collection: {str(item.get("id")): item for item in items}
+            for collection, items in data.items()
+            if isinstance(items, list)
+        }
+        key_index = {
+            collection: {
+                name: cls._build_key_index(collection, name, spec, data[collection])
+                for name, spec in indexes.items()
+            }
+            for collection, indexes in cls.KEY_INDEXES.items()
+            if isinstance(data.get(collection), list)
+        }
+        return {"data": data, "id_index": id_index, "key_index": key_index}
+    
+    @staticmethod
+    def _build_key_index(
+        collection: str,
+        name: str,
+        spec: KeyIndex,
+        items: List[Dict[str, Any]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Map normalized key values to the items holding them
+        
+        Empty values are not indexed. Duplicate values in a unique index are
+        logged, and lookups return the first item loaded.
+        """
+        index: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            keys = {spec.normalize(item[field]) for field in spec.fields if item.get(field) not in (None, "")}
+            for key in keys:
+                index.setdefault(key, []).append(item)
+        
+        if spec.unique:
+            duplicates = [key for key, matches in index.items() if len(matches) > 1]
+            if duplicates:
+                logger.warning(f"Duplicate {name} values in {collection}: {duplicates[:10]}")
+                for key in duplicates:
+                    index[key] = index[key][:1]
+        return index
     
     def _load_data(self) -> Dict[str, Any]:
         """Load data from JSON file"""
@@ -31,6 +245,10 @@ class EReserveRepository:
             logger.error(f"Invalid JSON in file at {self.file_path}")
             raise HTTPException(status_code=500, detail="Invalid data file format")
 
+    def has_collection(self, collection: str) -> bool:
+        """Whether the dataset has a collection"""
+        return collection in self._data
+    
     def get_all(self, collection: str, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
         """
         Get all items from a collection with pagination
@@ -53,7 +271,13 @@ class EReserveRepository:
         items = items[skip:skip + limit]
         return {"items": items, "count": total_count}
     
-    def get_all_paginated(self, collection: str, page_number: int = 1, page_size: int = 100) -> Dict[str, Any]:
+    def get_all_paginated(
+        self,
+        collection: str,
+        page_number: int = 1,
+        page_size: int = 100,
+        ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Get all items from a collection with page-based pagination (for JSON API)
         
@@ -61,6 +285,7 @@ class EReserveRepository:
             collection: Name of the collection to query
             page_number: Page number (1-based)
             page_size: Number of items per page
+            ids: Optional list of IDs to restrict the results to
             
         Returns:
             Dictionary with items, total_count, page_number, page_size, total_pages
@@ -68,7 +293,7 @@ class EReserveRepository:
         if collection not in self._data:
             raise HTTPException(status_code=404, detail=f"Collection {collection} not found")
             
-        items = self._data[collection]
+        items = self._data[collection] if ids is None else self.get_by_ids(collection, ids)
         total_count = len(items)
         total_pages = (total_count + page_size - 1) // page_size  # Ceiling division
         
@@ -92,6 +317,26 @@ class EReserveRepository:
             "total_pages": total_pages
         }
 
+    def count(self, collection: str, ids: Optional[List[str]] = None) -> int:
+        """
+        Count the items in a collection without building any page of results
+        
+        Args:
+            collection: Name of the collection to query
+            ids: Optional list of IDs to restrict the count to
+            
+        Returns:
+            Number of matching items
+        """
+        if collection not in self._data:
+            raise HTTPException(status_code=404, detail=f"Collection {collection} not found")
+        
+        if ids is None:
+            return len(self._data[collection])
+        
+        index = self._id_index[collection]
+        return sum(1 for item_id in map(str, ids) if item_id in index)
+
     def get_by_id(self, collection: str, item_id: int) -> Dict[str, Any]:
         """
         Get an item by ID from a collection.
@@ -109,10 +354,67 @@ class EReserveRepository:
         if collection not in self._data:
             raise HTTPException(status_code=404, detail=f"Collection {collection} not found")
             
-        for item in self._data[collection]:
-            item_id_value = item.get("id")
-            if str(item_id_value) == str(item_id):
-                return item
+        item = self._id_index[collection].get(str(item_id))
+        if item is not None:
+            return item
+        
+        logger.warning("Item not found in {}: {}", collection, item_id)
+        raise HTTPException(status_code=404, detail=f"Item with ID {item_id} not found in {collection}")
+    
+    def get_by_ids(self, collection: str, item_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get several items by ID from a collection in a single pass over the id index.
+        
+        Args:
+            collection: Name of the collection to query
+            item_ids: IDs of the items to get
+            
+        Returns:
+            List of the items found, in the order the IDs were given. Unknown IDs are skipped.
+        """
+        if collection not in self._data:
+            raise HTTPException(status_code=404, detail=f"Collection {collection} not found")
+        
+        index = self._id_index[collection]
+        return [index[item_id] for item_id in map(str, item_ids) if item_id in index]
+    
+    def find_by_key(self, collection: str, index_name: str, value: Any) -> List[Dict[str, Any]]:
+        """
+        Find items by a declared lookup key such as an email, unit code or ISBN.
+        
+        Args:
+            collection: Name of the collection to query
+            index_name: Name of the index declared in KEY_INDEXES
+            value: Key value to look up, normalized the same way as the index
+            
+        Returns:
+            List of matching items (at most one for unique indexes)
+            
+        Raises:
+            HTTPException: If the collection or the index does not exist
+        """
+        if collection not in self._data:
+            raise HTTPException(status_code=404, detail=f"Collection {collection} not found")
         
-        logger.warning(f"Item not found in {collection}: {item_id}")
-        raise HTTPException(status_code=404, detail=f"Item with ID {item_id} not found in {collection}")
\ No newline at end of file
+        indexes = self._key_index.get(collection, {})
+        if index_name not in indexes:
+            raise HTTPException(status_code=400, detail=f"No {index_name} index on {collection}")
+        
+        return indexes[index_name].get(self.KEY_INDEXES[collection][index_name].normalize(value), [])
+    
+    def find_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a user or integration user by email address.
+        
+        Args:
+            email: Email address, matched case-insensitively
+            
+        Returns:
+            Dictionary of the user, or None if no user has this email
+        """
+        for collection in self.USER_COLLECTIONS:
+            if self.has_collection(collection):
+                matches = self.find_by_key(collection, "email", email)
+                if matches:
+                    return matches[0]
+        return None
\ No newline at end of file
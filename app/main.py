@@ -1,29 +1,55 @@
-import uvicorn
 import time
-import json
-from fastapi import FastAPI, Request, HTTPException
-from contextlib import asynccontextmanager
+_import_started = time.perf_counter()
+
+import asyncio
+from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager, suppress
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.docs import get_swagger_ui_oauth2_redirect_html
-from fastapi.responses import JSONResponse
 
 from app.core import settings
 from app.core import logger
-from app.api.routes import auth
+from app.api.routes import auth, admin
 from app.api.routes.ereserve import ereserve_router
-from app.api.errors import validation_exception_handler
-from app.core.openapi import custom_openapi
+from app.api.errors import validation_exception_handler, json_api_exception_handler
+from app.api.middleware import RequestLoggingMiddleware, MetricsMiddleware, ProfilingMiddleware, TrafficCaptureMiddleware, DatasetMiddleware
+from app.core.openapi import custom_openapi, install_openapi_route
+from app.core.auth import shutdown_password_executor
+from app.db import shutdown_repository_executor
+from app.core.metrics import render_metrics
+from app.core.capture import start_capture
+from app.core.loop_monitor import loop_monitor
+from app.api.warmup import readiness, warm_up
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
+async def lifespan(lifespan_app: FastAPI):
     # Add startup logic here
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    if settings.LOOP_MONITOR:
+        loop_monitor.start()
+    
+    # Warm up in the background so the server accepts connections (and /readyz) meanwhile.
+    # The routes warmed are those of the versioned API app, also when this runs for root_app
+    warmup_task = None
+    if settings.WARMUP:
+        warmup_task = asyncio.create_task(warm_up(app))
+    else:
+        readiness.ready = True
 
     yield
     
     # Add shutdown logic here (optional)
+    if warmup_task is not None:
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+    if settings.LOOP_MONITOR:
+        await loop_monitor.stop()
+    shutdown_password_executor()
+    shutdown_repository_executor()
     logger.info(f"{settings.APP_NAME} shutdown complete")
+    await logger.complete()
     
 
 def create_app() -> FastAPI:
@@ -42,6 +68,9 @@ def create_app() -> FastAPI:
         version=settings.APP_VERSION
     )
     
+    # Add middleware selecting the dataset, innermost so every other middleware sees the request as sent
+    app.add_middleware(DatasetMiddleware)
+    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -55,115 +84,34 @@ def create_app() -> FastAPI:
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     
     # Global exception handler for JSON API format
-    @app.exception_handler(HTTPException)
-    async def json_api_exception_handler(request: Request, exc: HTTPException):
-        # Define which endpoints should use JSON API format
-        json_api_endpoints = settings.JSON_API_ENDPOINTS
-        
-        # Check if this is a JSON API endpoint
-        is_json_api_endpoint = (
-            any(request.url.path.endswith(endpoint) for endpoint in json_api_endpoints) or
-            request.headers.get("accept") == "application/vnd.api+json" or
-            request.headers.get("content-type") == "application/vnd.api+json"
-        )
-        
-        if is_json_api_endpoint:
-            # Format error in JSON API format
-            if isinstance(exc.detail, dict) and "errors" in exc.detail:
-                # Already in JSON API format
-                return JSONResponse(
-                    status_code=exc.status_code,
-                    content=exc.detail,
-                    headers={"Content-Type": "application/vnd.api+json"}
-                )
-            else:
-                # Convert to JSON API format
-                return JSONResponse(
-                    status_code=exc.status_code,
-                    content={
-                        "errors": [{
-                            "status": str(exc.status_code),
-                            "title": "Error",
-                            "detail": str(exc.detail)
-                        }]
-                    },
-                    headers={"Content-Type": "application/vnd.api+json"}
-                )
-        
-        # Default JSON response for other endpoints
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={"detail": exc.detail}
-        )
+    app.add_exception_handler(HTTPException, json_api_exception_handler)
     
     # Register routers
     app.include_router(auth.router, tags=["User"])
     app.include_router(ereserve_router)
+    app.include_router(admin.router)
+    
+    # Add middleware for on-demand and slow-request profiling
+    app.add_middleware(ProfilingMiddleware)
+    
+    # Add middleware for traffic capture, only when a capture file is configured
+    if settings.TRAFFIC_CAPTURE_PATH:
+        start_capture(settings.TRAFFIC_CAPTURE_PATH, settings.TRAFFIC_CAPTURE_MAX_BYTES, settings.TRAFFIC_CAPTURE_BACKUPS)
+        app.add_middleware(TrafficCaptureMiddleware)
     
     # Add middleware for request logging
-    @app.middleware("http")
-    async def log_requests_and_json_api(request: Request, call_next):
-        start_time = time.perf_counter()
-        logger.debug(f"➡️ {request.method} {request.url.path}")
-        
-        # Define which endpoints should use JSON API format
-        json_api_endpoints = settings.JSON_API_ENDPOINTS
-        
-        # JSON API middleware logic for specified endpoints
-        is_json_api_endpoint = any(request.url.path.endswith(endpoint) for endpoint in json_api_endpoints)
-        
-        if (is_json_api_endpoint and 
-            request.method in ["POST", "PUT", "PATCH"] and
-            request.headers.get("content-type") == "application/vnd.api+json"):
-            
-            # Read the request body
-            body = await request.body()
-            if body:
-                try:
-                    # Parse JSON and validate structure
-                    data = json.loads(body)
-                    
-                    # Validation logic can be endpoint-specific
-                    if request.url.path.endswith("/users/login"):
-                        if "public_v1_user" not in data:
-                            return JSONResponse(
-                                status_code=400,
-                                content={
-                                    "errors": [{
-                                        "status": "400",
-                                        "title": "Invalid Request Format",
-                                        "detail": "Request must contain 'public_v1_user' object"
-                                    }]
-                                },
-                                headers={"Content-Type": "application/vnd.api+json"}
-                            )
-                    
-                except json.JSONDecodeError:
-                    return JSONResponse(
-                        status_code=400,
-                        content={
-                            "errors": [{
-                                "status": "400",
-                                "title": "Invalid JSON",
-                                "detail": "Request body must be valid JSON"
-                            }]
-                        },
-                        headers={"Content-Type": "application/vnd.api+json"}
-                    )
-        
-        response = await call_next(request)
-        process_time = time.perf_counter() - start_time
-        logger.debug(f"⬅️ {request.method} {request.url.path} completed in {process_time:.4f}s with status {response.status_code}")
-        response.headers["X-Process-Time"] = f"{process_time:.4f}"
-
-        return response
+    app.add_middleware(RequestLoggingMiddleware)
+    
+    # Add middleware for request metrics, outermost so it times the whole stack
+    app.add_middleware(MetricsMiddleware)
     
     return app
 
 app = create_app()
 
-# Apply custom OpenAPI
+# Apply custom OpenAPI, served from bytes encoded once
 app.openapi = lambda: custom_openapi(app)
+install_openapi_route(app)
 
 # Handle redirect for OAuth if needed
 @app.get(app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
@@ -172,6 +120,7 @@ async def swagger_ui_redirect():
 
 # Create a root FastAPI app to mount the app at /api/v1
 root_app = FastAPI(
+    lifespan=lifespan,  # Lifespans of mounted apps are not run
     title=settings.APP_NAME,
     docs_url=None,  # Disable docs at root level
     redoc_url=None,  # Disable redoc at root level
@@ -187,7 +136,25 @@ async def redirect_to_docs():
     from fastapi.responses import RedirectResponse
     return RedirectResponse(url="/api/v1/docs")
 
+# Readiness probe, healthy once the startup warmup has finished
+@root_app.get("/readyz", include_in_schema=False)
+async def readyz():
+    from fastapi.responses import JSONResponse
+    return JSONResponse(
+        {"status": "ready" if readiness.ready else "starting", "startup": readiness.phases},
+        status_code=200 if readiness.ready else 503
+    )
+
+# Prometheus scrape endpoint, outside the versioned API so it is not authenticated or metered
+@root_app.get("/metrics", include_in_schema=False)
+async def metrics():
+    from fastapi.responses import PlainTextResponse
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+readiness.record("import", time.perf_counter() - _import_started)
+
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(
         "app.main:root_app",
         host=settings.HOST,
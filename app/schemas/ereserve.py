@@ -27,6 +27,7 @@ class SchoolJsonApiResponse(BaseModel):
 class SchoolListJsonApiResponse(BaseModel):
     data: List[SchoolData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 
 # JSON API models for unit
@@ -51,6 +52,7 @@ class UnitJsonApiResponse(BaseModel):
 class UnitListJsonApiResponse(BaseModel):
     data: List[UnitData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for unit offering
 class UnitOfferingAttributes(BaseModel):
@@ -78,6 +80,7 @@ class UnitOfferingJsonApiResponse(BaseModel):
 class UnitOfferingListJsonApiResponse(BaseModel):
     data: List[UnitOfferingData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for reading
 class ReadingAttributes(BaseModel):
@@ -124,9 +127,10 @@ class ReadingData(BaseModel):
 class ReadingJsonApiResponse(BaseModel):
     data: ReadingData
 
-class ReadingListJsonApiResponse(BaseModel):
+class ReadingCollectionJsonApiResponse(BaseModel):
     data: List[ReadingData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for reading list
 class ReadingListAttributes(BaseModel):
@@ -158,6 +162,7 @@ class ReadingListJsonApiResponse(BaseModel):
 class ReadingListListJsonApiResponse(BaseModel):
     data: List[ReadingListData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for reading list usage
 class ReadingListUsageAttributes(BaseModel):
@@ -181,6 +186,7 @@ class ReadingListUsageJsonApiResponse(BaseModel):
 class ReadingListUsageListJsonApiResponse(BaseModel):
     data: List[ReadingListUsageData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for reading list item
 class ReadingListItemAttributes(BaseModel):
@@ -208,6 +214,7 @@ class ReadingListItemJsonApiResponse(BaseModel):
 class ReadingListItemListJsonApiResponse(BaseModel):
     data: List[ReadingListItemData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for reading list item usage
 class ReadingListItemUsageAttributes(BaseModel):
@@ -232,6 +239,7 @@ class ReadingListItemUsageJsonApiResponse(BaseModel):
 class ReadingListItemUsageListJsonApiResponse(BaseModel):
     data: List[ReadingListItemUsageData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for reading-utilisations
 class ReadingUtilisationAttributes(BaseModel):
@@ -255,6 +263,7 @@ class ReadingUtilisationJsonApiResponse(BaseModel):
 class ReadingUtilisationListJsonApiResponse(BaseModel):
     data: List[ReadingUtilisationData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
     
 # JSON API models for integration-users
 class IntegrationUserAttributes(BaseModel):
@@ -282,6 +291,7 @@ class IntegrationUserJsonApiResponse(BaseModel):
 class IntegrationUserListJsonApiResponse(BaseModel):
     data: List[IntegrationUserData]
     links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
 
 # JSON API models for teaching-sessions
 class TeachingSessionAttributes(BaseModel):
@@ -305,4 +315,5 @@ class TeachingSessionJsonApiResponse(BaseModel):
 
 class TeachingSessionListJsonApiResponse(BaseModel):
     data: List[TeachingSessionData]
-    links: Optional[Dict[str, str]] = None
\ No newline at end of file
+    links: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, int]] = None
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""
+Production server entry point
+
+Run with `python -m app.server`. The parent process binds the listening
+socket, imports the app and loads the dataset, then forks the workers, so
+they start warm and share the loaded data copy-on-write. It restarts workers
+that exit unexpectedly and passes SIGTERM/SIGINT on for a graceful shutdown.
+Workers that crash on start are restarted with an increasing delay, and the
+server exits with an error once one has failed WORKER_MAX_START_FAILURES
+times in a row.
+
+Workers default to the CPUs available to the container (cgroup quota and CPU
+affinity), and uvicorn uses uvloop and httptools when they are installed.
+"""
+import gc
+import importlib.util
+import math
+import os
+import signal
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+from app.core import settings
+from app.core import logger
+
+RESTART_BACKOFF_SECONDS = 0.5      # delay before the first restart of a worker that crashed on start, doubled each time
+RESTART_BACKOFF_MAX_SECONDS = 30.0
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPU limit from the cgroup quota (v2, then v1), or None when unlimited or unknown"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as quota_file, open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as period_file:
+            quota, period = int(quota_file.read()), int(period_file.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may use, taking CPU affinity and the cgroup quota into account"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:     # not available on macOS or Windows
+        cpus = os.cpu_count() or 1
+    
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+def worker_count() -> int:
+    """Number of worker processes, WEB_CONCURRENCY or one per available CPU"""
+    return settings.WEB_CONCURRENCY if settings.WEB_CONCURRENCY > 0 else available_cpus()
+
+
+def build_config() -> uvicorn.Config:
+    """Uvicorn configuration for the production server, with the app already imported"""
+    from app.main import root_app
+    
+    config = uvicorn.Config(
+        root_app,
+        host=settings.HOST,
+        port=settings.PORT,
+        loop="auto",    # uvloop when installed
+        http="auto",    # httptools when installed
+        backlog=settings.BACKLOG,
+        timeout_keep_alive=settings.KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+    config.load()
+    return config
+
+
+def _preload() -> None:
+    """Load the dataset and move everything loaded so far out of the garbage collector's reach"""
+    from app.db import EReserveRepository
+    
+    EReserveRepository()
+    # Objects frozen before forking are never touched by the collector, so pages stay shared
+    gc.collect()
+    gc.freeze()
+
+
+def _run_worker(config: uvicorn.Config, sock) -> None:
+    """Serve on the inherited socket until uvicorn exits, then leave without running the parent's cleanup"""
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, signal.SIG_DFL)
+    status = 0
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException:
+        logger.exception("Worker {} crashed", os.getpid())
+        status = 1
+    finally:
+        logger.complete()
+        os._exit(status)
+
+
+def restart_delay(start_failures: int) -> float:
+    """Seconds to wait before restarting a worker that crashed on start this many times in a row"""
+    if start_failures == 0:
+        return 0.0
+    return min(RESTART_BACKOFF_SECONDS * 2 ** (start_failures - 1), RESTART_BACKOFF_MAX_SECONDS)
+
+
+def supervise(config: uvicorn.Config, sock, workers: int) -> int:
+    """
+    Fork the workers and restart those that exit until the server is stopped
+    
+    A worker exiting within WORKER_MIN_UPTIME_SECONDS of being forked crashed
+    on start, typically on a bad setting, and would fail again straight away.
+    Its slot is restarted after an increasing delay, and after
+    WORKER_MAX_START_FAILURES such crashes in a row every worker is stopped.
+    
+    Args:
+        config: Uvicorn configuration of the workers
+        sock: Listening socket shared by the workers
+        workers: Number of worker processes
+    
+    Returns:
+        Exit status of the server, 1 if it gave up on a worker
+    """
+    children: Dict[int, int] = {}
+    started: Dict[int, float] = {}
+    start_failures: Dict[int, int] = {slot: 0 for slot in range(workers)}
+    restarts: Dict[int, float] = {}    # slot -> monotonic time of its delayed restart
+    stopping = False
+    status = 0
+    
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(config, sock)
+        children[pid] = slot
+        started[slot] = time.monotonic()
+    
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        restarts.clear()
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    for slot in range(workers):
+        spawn(slot)
+    
+    while children or restarts:
+        for slot, restart_at in list(restarts.items()):
+            if restart_at <= time.monotonic():
+                del restarts[slot]
+                spawn(slot)
+        
+        # Poll while restarts are pending so they are not held up by a blocking wait
+        try:
+            pid, wait_status = os.waitpid(-1, os.WNOHANG if restarts else 0)
+        except ChildProcessError:
+            if not restarts:
+                break
+            pid = 0
+        if pid == 0:
+            time.sleep(0.1)
+            continue
+        
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        exit_code = os.waitstatus_to_exitcode(wait_status)
+        if time.monotonic() - started[slot] < settings.WORKER_MIN_UPTIME_SECONDS:
+            start_failures[slot] += 1
+        else:
+            start_failures[slot] = 0
+        
+        if start_failures[slot] >= settings.WORKER_MAX_START_FAILURES:
+            logger.error(
+                "Worker {} exited with status {} on start {} times in a row, stopping the server",
+                pid, exit_code, start_failures[slot]
+            )
+            status = 1
+            stop(None, None)
+            continue
+        delay = restart_delay(start_failures[slot])
+        logger.warning("Worker {} exited with status {}, restarting in {:.1f}s", pid, exit_code, delay)
+        restarts[slot] = time.monotonic() + delay
+    
+    return status
+
+
+def main() -> int:
+    workers = worker_count()
+    config = build_config()
+    sock = config.bind_socket()
+    _preload()
+    
+    logger.info(
+        "Serving on {}:{} with {} worker(s), loop={}, http={}",
+        settings.HOST, settings.PORT, workers,
+        "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "httptools" if importlib.util.find_spec("httptools") else "h11"
+    )
+    
+    if workers == 1 or not hasattr(os, "fork"):
+        uvicorn.Server(config).run(sockets=[sock])
+        return 0
+    
+    status = supervise(config, sock, workers)
+    sock.close()
+    logger.info("All workers stopped")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
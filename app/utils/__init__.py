@@ -1 +1,8 @@
-from .csv_helpers import check_csv_file_exists, read_csv_file, write_csv_file
\ No newline at end of file
+# csv_helpers imports pandas, which is slow to import, so it is only loaded on first use
+_CSV_HELPERS = ("check_csv_file_exists", "read_csv_file", "write_csv_file")
+
+def __getattr__(name):
+    if name in _CSV_HELPERS:
+        from . import csv_helpers
+        return getattr(csv_helpers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
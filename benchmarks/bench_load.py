@@ -0,0 +1,215 @@
+"""
+Load test the eReserve routes and report latency per route
+
+Drives the app in-process through httpx's ASGI transport, or a running
+server with --url. It logs in through /users/login, samples IDs from every
+collection, then sends a weighted mix of list and detail requests across all
+JSON API collection routes. Load is either closed-loop (--concurrency
+clients sending back to back) or open-loop (--rate requests per second,
+latency measured from the scheduled send time so queueing is included).
+
+Reports requests per second and p50/p95/p99 per route template. --output
+saves them as JSON, and --compare checks them against an earlier file.
+
+Request coalescing is off in-process unless --coalesce is passed, so every
+request runs its endpoint; start a server under test with
+COALESCE_REQUESTS=false for the same effect with --url.
+
+Usage:
+    python -m benchmarks.bench_load [--url http://127.0.0.1:8000] [--duration 10]
+        [--concurrency 16 | --rate 200] [--mix list=1 detail=1] [--include readings]
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+from fastapi.routing import APIRoute
+
+from app.core import settings
+from app.main import app, root_app
+from .common import compare_results, print_comparison, summarize_latencies
+
+API_PREFIX = "/api/v1"
+LOGIN_EMAIL = "admin@example.edu"
+
+
+def collection_routes(include: str = "") -> List[Tuple[str, str]]:
+    """(list path, detail template) of every JSON API collection, optionally filtered by a regex"""
+    get_paths = {
+        route.path for route in app.routes
+        if isinstance(route, APIRoute) and getattr(route, "json_api", False) and "GET" in route.methods
+    }
+    return [
+        (path, f"{path}/{{id}}") for path in sorted(get_paths)
+        if "{" not in path and f"{path}/{{id}}" in get_paths and re.search(include, path)
+    ]
+
+
+async def prepare(client: httpx.AsyncClient, routes: List[Tuple[str, str]]) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """Log in, then collect up to 100 IDs per collection for the detail requests"""
+    response = await client.post(
+        f"{API_PREFIX}/users/login",
+        json={"public_v1_user": {"email": LOGIN_EMAIL, "password": "load-test"}}
+    )
+    response.raise_for_status()
+    headers = {"Authorization": response.headers["Authorization"], "Accept": "application/vnd.api+json"}
+    
+    ids = {}
+    for list_path, _ in routes:
+        response = await client.get(f"{API_PREFIX}{list_path}", params={"page[size]": 100}, headers=headers)
+        response.raise_for_status()
+        ids[list_path] = [item["id"] for item in response.json()["data"]]
+    return headers, ids
+
+
+def build_plan(routes: List[Tuple[str, str]], ids: Dict[str, List[str]], mix: Dict[str, float]):
+    """Return a function picking the next (route template, URL) according to the mix"""
+    choices = []
+    for list_path, detail_template in routes:
+        choices.append((mix.get("list", 0), list_path, lambda path=list_path: f"{API_PREFIX}{path}"))
+        if ids[list_path]:
+            choices.append((
+                mix.get("detail", 0), detail_template,
+                lambda path=list_path: f"{API_PREFIX}{path}/{random.choice(ids[path])}"
+            ))
+    choices = [choice for choice in choices if choice[0] > 0]
+    weights = [choice[0] for choice in choices]
+    
+    def next_request() -> Tuple[str, str]:
+        _, template, url = random.choices(choices, weights)[0]
+        return template, url()
+    
+    return next_request
+
+
+async def run_load(client, headers, next_request, duration: float, concurrency: int, rate: float):
+    """Send requests for duration seconds and return latencies and errors per route template"""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    
+    async def send(template: str, url: str, started: float) -> None:
+        try:
+            response = await client.get(url, headers=headers)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies[template].append(time.perf_counter() - started)
+        else:
+            errors[template] += 1
+    
+    start = time.perf_counter()
+    deadline = start + duration
+    
+    if rate:
+        # Open loop: requests go out on a fixed schedule however slow the responses are
+        tasks = []
+        interval = 1 / rate
+        scheduled = start
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            template, url = next_request()
+            tasks.append(asyncio.create_task(send(template, url, scheduled)))
+            scheduled += interval
+        await asyncio.gather(*tasks)
+    else:
+        async def worker():
+            while time.perf_counter() < deadline:
+                template, url = next_request()
+                await send(template, url, time.perf_counter())
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(latencies, errors, elapsed) -> Dict[str, Dict[str, float]]:
+    """Per-route and overall throughput, error counts and latency percentiles"""
+    summary = {}
+    for template in sorted(set(latencies) | set(errors)):
+        summary[template] = {
+            "requests_per_second": len(latencies[template]) / elapsed,
+            "errors": errors[template],
+            **summarize_latencies(latencies[template]),
+        }
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    summary["all"] = {
+        "requests_per_second": len(all_latencies) / elapsed,
+        "errors": sum(errors.values()),
+        **summarize_latencies(all_latencies),
+    }
+    return summary
+
+
+def parse_mix(pairs: List[str]) -> Dict[str, float]:
+    mix = {}
+    for pair in pairs:
+        kind, _, weight = pair.partition("=")
+        if kind not in ("list", "detail"):
+            raise argparse.ArgumentTypeError(f"Unknown request kind in mix: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+async def main_async(args) -> Dict[str, Dict[str, float]]:
+    routes = collection_routes(args.include)
+    limits = httpx.Limits(max_connections=max(args.concurrency, 100), max_keepalive_connections=max(args.concurrency, 100))
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30)
+    else:
+        settings.COALESCE_REQUESTS = args.coalesce
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=root_app), base_url="http://loadtest", timeout=30)
+    
+    async with client:
+        headers, ids = await prepare(client, routes)
+        next_request = build_plan(routes, ids, parse_mix(args.mix))
+        latencies, errors, elapsed = await run_load(client, headers, next_request, args.duration, args.concurrency, args.rate)
+    return summarize(latencies, errors, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server; the app runs in-process when omitted")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=16, help="clients sending back to back (closed loop)")
+    parser.add_argument("--rate", type=float, default=0, help="requests per second on a fixed schedule (open loop)")
+    parser.add_argument("--mix", nargs="+", default=["list=1", "detail=1"], help="weights of list and detail requests")
+    parser.add_argument("--include", default="", help="regex selecting the collection paths to load")
+    parser.add_argument("--coalesce", action="store_true", help="let identical concurrent requests share endpoint calls in-process")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+    
+    summary = asyncio.run(main_async(args))
+    
+    print(f"{'route':<40} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for template, values in summary.items():
+        print(
+            f"{template:<40} {values['requests_per_second']:8.1f} {values['errors']:7d} "
+            f"{values['p50_ms']:8.2f} {values['p95_ms']:8.2f} {values['p99_ms']:8.2f}"
+        )
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps({"benchmark": "load", "routes": summary}, indent=2))
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        comparison = compare_results(baseline["routes"], summary, args.threshold)
+        print_comparison(comparison)
+        if any(row["regression"] for row in comparison):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark the logging overhead per request
+
+Drives a small app wrapped in RequestLoggingMiddleware through the ASGI
+interface while logging to a file sink, for several logging setups:
+INFO level, DEBUG written synchronously, DEBUG through the enqueued sink,
+and DEBUG with only a sample of requests logged.
+
+Usage:
+    python -m benchmarks.bench_logging [--requests N]
+"""
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+
+from app.core import settings
+from app.core import logger
+from .bench_middleware import build_app, drive
+
+SCENARIOS = [
+    # name, level, enqueue, sample rate
+    ("info", "INFO", True, 1.0),
+    ("debug-sync", "DEBUG", False, 1.0),
+    ("debug-enqueued", "DEBUG", True, 1.0),
+    ("debug-sampled-10%", "DEBUG", True, 0.1),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    
+    app = build_app("asgi")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        logger.remove()
+        asyncio.run(drive(app, 500))   # warm up
+        baseline = asyncio.run(drive(app, args.requests)) / args.requests
+        
+        print(f"{'scenario':<18} {'us/request':>11} {'overhead us':>12}")
+        print(f"{'no sinks':<18} {baseline * 1e6:11.1f} {0:12.1f}")
+        for name, level, enqueue, sample_rate in SCENARIOS:
+            settings.LOG_REQUEST_SAMPLE_RATE = sample_rate
+            logger.remove()
+            logger.add(Path(directory) / f"{name}.log", level=level, enqueue=enqueue, rotation="10 MB", compression="zip")
+            per_request = asyncio.run(drive(app, args.requests)) / args.requests
+            logger.remove()   # waits for enqueued messages to be written
+            print(f"{name:<18} {per_request * 1e6:11.1f} {(per_request - baseline) * 1e6:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark login throughput and the latency of unrelated requests during a login storm
+
+Runs the app in-process with password verification enabled on a copy of the
+dataset where every user has a bcrypt password hash. For each verification
+mode, a number of clients log in repeatedly while one client issues
+GET /schools/1 in a loop; the script reports logins per second and the
+p50/p99 latency of the GETs.
+
+Usage:
+    python -m benchmarks.bench_login [--modes inline thread process] [--duration 5] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import bcrypt
+import httpx
+
+from app.core import settings
+from app.core.auth import shutdown_password_executor
+from app.main import root_app
+from .common import summarize_latencies
+
+PASSWORD = "benchmark-password"
+
+
+def write_dataset(rounds: int, directory: str) -> str:
+    """Copy the configured dataset, giving every user a bcrypt hash of PASSWORD"""
+    with open(settings.JSON_FILE_FULL_PATH) as file:
+        data = json.load(file)
+    password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+    for collection in ("users", "integrationUsers"):
+        for user in data.get(collection, []):
+            user["password_hash"] = password_hash
+    path = Path(directory) / "benchmark-data.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+async def run_storm(email: str, duration: float, concurrency: int) -> dict:
+    """Run a login storm alongside a GET probe and return the measurements"""
+    transport = httpx.ASGITransport(app=root_app)
+    login_body = {"public_v1_user": {"email": email, "password": PASSWORD}}
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/v1/users/login", json=login_body)
+        response.raise_for_status()
+        headers = {"Authorization": response.headers["Authorization"]}
+        
+        deadline = time.perf_counter() + duration
+        logins = {"ok": 0, "rejected": 0}
+        get_latencies = []
+        
+        async def login_client():
+            while time.perf_counter() < deadline:
+                response = await client.post("/api/v1/users/login", json=login_body)
+                logins["ok" if response.status_code == 200 else "rejected"] += 1
+        
+        async def probe_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/api/v1/schools/1", headers=headers)
+                get_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+        
+        start = time.perf_counter()
+        await asyncio.gather(probe_client(), *(login_client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    
+    return {
+        "logins_per_second": logins["ok"] / elapsed,
+        "rejected_logins": logins["rejected"],
+        "get": summarize_latencies(get_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread", "process"], choices=["inline", "thread", "process"])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent login clients")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS, help="Password pool size")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--email", default="admin@example.edu")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        settings.JSON_FILE_FULL_PATH = write_dataset(args.rounds, directory)
+        settings.VERIFY_PASSWORDS = True
+        settings.PASSWORD_HASH_WORKERS = args.workers
+        settings.PASSWORD_VERIFY_REJECT_WHEN_SATURATED = False
+        
+        print(f"{'mode':<8} {'logins/s':>9} {'GET p50 ms':>11} {'GET p99 ms':>11} {'GETs':>6}")
+        for mode in args.modes:
+            settings.PASSWORD_HASH_EXECUTOR = mode
+            result = asyncio.run(run_storm(args.email, args.duration, args.concurrency))
+            shutdown_password_executor()
+            get = result["get"]
+            print(f"{mode:<8} {result['logins_per_second']:9.1f} {get['p50_ms']:11.1f} {get['p99_ms']:11.1f} {get['count']:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark request logging middleware overhead on small responses
+
+Compares a BaseHTTPMiddleware (what @app.middleware("http") installs) doing
+the same timing and header work against RequestLoggingMiddleware, and no
+middleware at all. Requests are driven straight through the ASGI interface
+so the numbers exclude any HTTP client or server cost.
+
+Usage:
+    python -m benchmarks.bench_middleware [--requests N]
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.api.middleware import RequestLoggingMiddleware
+
+
+async def base_http_logging(request: Request, call_next):
+    """Timing and X-Process-Time header, as registered through @app.middleware("http")"""
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    response.headers["X-Process-Time"] = f"{time.perf_counter() - start_time:.4f}"
+    return response
+
+
+def build_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+    
+    @app.get("/ping")
+    async def ping():
+        return {"data": {"id": "1", "type": "pings"}}
+    
+    if middleware == "base_http":
+        app.add_middleware(BaseHTTPMiddleware, dispatch=base_http_logging)
+    elif middleware == "asgi":
+        app.add_middleware(RequestLoggingMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    """Send requests straight through the ASGI interface, returning seconds elapsed"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        pass
+    
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    
+    print(f"{'middleware':<11} {'us/request':>11} {'requests/s':>11}")
+    for middleware in ("none", "base_http", "asgi"):
+        app = build_app(middleware)
+        asyncio.run(drive(app, 500))   # warm up
+        elapsed = asyncio.run(drive(app, args.requests))
+        print(f"{middleware:<11} {elapsed / args.requests * 1e6:11.1f} {args.requests / elapsed:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
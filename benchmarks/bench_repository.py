@@ -0,0 +1,158 @@
+"""
+Benchmark EReserveRepository operations across dataset scales
+
+For each scale, writes a generated dataset with that many users and units to
+a temporary file, then measures:
+
+- load: parsing the file and building the id and key indexes, with the RSS
+  growth and the deep size of the loaded snapshot
+- get_by_id: lookups of random unit IDs
+- page_first / page_middle / page_last: get_all_paginated on units
+- find_user_by_email: the user lookup done on login and token validation
+
+Results can be written as JSON with --output. Passing a previous run with
+--compare prints the change per operation, and the exit status is 1 when an
+operation got slower than --threshold.
+
+Usage:
+    python -m benchmarks.bench_repository [--scales 1000 100000 1000000] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict
+
+from app.core.memory import process_memory, snapshot_memory
+from app.db import EReserveRepository
+from .common import compare_results, print_comparison
+
+PAGE_SIZE = 100
+
+
+def generate_dataset(rows: int) -> Dict[str, list]:
+    """Generate a dataset with rows users and units shaped like the sample data"""
+    timestamp = "2024-01-10T09:30:00Z"
+    return {
+        "schools": [{"id": i, "name": f"School {i}"} for i in range(1, 21)],
+        "users": [
+            {"id": i, "first_name": f"First{i}", "last_name": f"Last{i}", "email": f"user{i}@example.edu",
+             "created_at": timestamp, "updated_at": timestamp}
+            for i in range(1, rows + 1)
+        ],
+        "units": [
+            {"id": i, "code": f"UNIT{i:07d}", "name": f"Unit number {i}", "created_at": timestamp, "updated_at": timestamp}
+            for i in range(1, rows + 1)
+        ],
+    }
+
+
+def ops_per_second(operation: Callable[[], object], min_seconds: float) -> float:
+    """Run operation repeatedly for at least min_seconds and return the rate"""
+    count = 0
+    start = time.perf_counter()
+    deadline = start + min_seconds
+    while True:
+        for _ in range(100):
+            operation()
+        count += 100
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start)
+
+
+def bench_scale(rows: int, min_seconds: float) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark against a generated dataset of the given size"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / f"bench-{rows}.json")
+        data = generate_dataset(rows)
+        Path(path).write_text(json.dumps(data))
+        del data
+        gc.collect()
+        
+        rss_before = process_memory()["rss_bytes"]
+        start = time.perf_counter()
+        repo = EReserveRepository(path)
+        load_seconds = time.perf_counter() - start
+        rss_after = process_memory()["rss_bytes"]
+    
+    snapshot = EReserveRepository.loaded_snapshots()[path]
+    memory = snapshot_memory(snapshot)
+    snapshot_bytes = (
+        sum(collection["bytes"] for collection in memory["collections"].values()) +
+        sum(memory["id_indexes"].values()) + sum(memory["key_indexes"].values())
+    )
+    
+    random_ids = [str(random.randint(1, rows)) for _ in range(1000)]
+    random_emails = [f"user{random.randint(1, rows)}@example.edu" for _ in range(1000)]
+    last_page = (rows + PAGE_SIZE - 1) // PAGE_SIZE
+    ids = itertools.cycle(random_ids)
+    emails = itertools.cycle(random_emails)
+    
+    results = {
+        "load": {
+            "seconds": load_seconds,
+            "rss_delta_bytes": rss_after - rss_before if rss_before is not None else None,
+            "snapshot_bytes": snapshot_bytes,
+        },
+        "get_by_id": {"ops_per_sec": ops_per_second(lambda: repo.get_by_id("units", next(ids)), min_seconds)},
+        "page_first": {"ops_per_sec": ops_per_second(lambda: repo.get_all_paginated("units", 1, PAGE_SIZE), min_seconds)},
+        "page_middle": {"ops_per_sec": ops_per_second(lambda: repo.get_all_paginated("units", max(last_page // 2, 1), PAGE_SIZE), min_seconds)},
+        "page_last": {"ops_per_sec": ops_per_second(lambda: repo.get_all_paginated("units", last_page, PAGE_SIZE), min_seconds)},
+        "find_user_by_email": {"ops_per_sec": ops_per_second(lambda: repo.find_user_by_email(next(emails)), min_seconds)},
+    }
+    
+    # Drop the snapshot so the next scale starts from the same memory baseline
+    del repo, snapshot
+    EReserveRepository._snapshots.pop(path, None)
+    gc.collect()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", type=int, default=[1000, 100000, 1000000])
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="minimum run time per operation")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+    
+    results = {
+        "benchmark": "repository",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": {},
+    }
+    
+    print(f"{'rows':>8} {'operation':<19} {'ops/s':>12} {'seconds':>9} {'memory MB':>10}")
+    for rows in args.scales:
+        scale = bench_scale(rows, args.min_seconds)
+        results["scales"][str(rows)] = scale
+        for operation, values in scale.items():
+            ops = f"{values['ops_per_sec']:12.0f}" if "ops_per_sec" in values else f"{'':>12}"
+            seconds = f"{values['seconds']:9.3f}" if "seconds" in values else f"{'':>9}"
+            memory = f"{values['snapshot_bytes'] / 2**20:10.1f}" if "snapshot_bytes" in values else f"{'':>10}"
+            print(f"{rows:>8} {operation:<19} {ops} {seconds} {memory}")
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        comparison = compare_results(baseline["scales"], results["scales"], args.threshold)
+        print_comparison(comparison)
+        if any(row["regression"] for row in comparison):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
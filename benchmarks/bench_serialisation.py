@@ -0,0 +1,171 @@
+"""
+Benchmark response serialisation of a JSON API page
+
+The sample dataset has fewer readings than a full page, so its readings are
+repeated under new IDs into a temporary copy until there are --page-size of
+them. The response model of the first /readings page is built once, then
+each way of turning it into response bytes is timed:
+
+- fastapi: what FastAPI does with a response_model; dump the model to a
+  dict, validate the dict against the response model again, serialise it to
+  JSON-compatible Python and render it with json.dumps
+- no_revalidate: model_dump(mode="json") rendered with json.dumps
+- orjson: model_dump(mode="json") rendered with orjson, when installed
+- model_dump_json: pydantic's own JSON serialiser, straight to bytes
+
+Every strategy must produce the same document; a mismatch is reported.
+The full GET of the page is then timed through the app's ASGI interface,
+which shows what the route currently serves.
+
+Usage:
+    python -m benchmarks.bench_serialisation [--page-size 1000] [--min-seconds 1]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from starlette.requests import Request
+
+from app.core import settings
+from app.core.auth import create_access_token
+from app.main import app, root_app
+from app.api.dependencies import get_ereserve_repository
+from app.api.routes.ereserve.readings import list_readings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_dataset(directory: str, readings: int) -> str:
+    """Copy the configured dataset with its readings repeated up to the given count, returning the path"""
+    data = json.loads(Path(settings.JSON_FILE_FULL_PATH).read_text())
+    source = data["readings"]
+    data["readings"] = [
+        {**reading, "id": i} for i, reading in zip(range(1, readings + 1), itertools.cycle(source))
+    ]
+    path = str(Path(directory) / "bench-serialisation.json")
+    Path(path).write_text(json.dumps(data))
+    return path
+
+
+def readings_route():
+    return next(route for route in app.routes if getattr(route, "path_format", None) == "/readings" and "GET" in route.methods)
+
+
+async def build_page(page_size: int):
+    """Return the response model of the first /readings page"""
+    request = Request({
+        "type": "http", "method": "GET", "scheme": "http", "path": "/api/v1/readings", "root_path": "",
+        "query_string": f"page%5Bsize%5D={page_size}".encode(), "headers": [(b"host", b"bench")],
+        "server": ("bench", 80),
+    })
+    return await list_readings(
+        request, page_size=page_size, page_number=1, filter_id=None, filter_isbn=None, filter_issn=None,
+        repo=await get_ereserve_repository()
+    )
+
+
+def strategies(model) -> Dict[str, Callable[[], bytes]]:
+    """Serialisation strategies by name, each returning the response body"""
+    response_field = readings_route().response_field
+    loop = asyncio.new_event_loop()
+    
+    def fastapi_default() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=response_field, response_content=model, is_coroutine=True))
+        return JSONResponse(content).body
+    
+    found = {
+        "fastapi": fastapi_default,
+        "no_revalidate": lambda: JSONResponse(model.model_dump(mode="json", by_alias=True)).body,
+        "model_dump_json": lambda: model.model_dump_json(by_alias=True).encode(),
+    }
+    if orjson is not None:
+        found["orjson"] = lambda: orjson.dumps(model.model_dump(mode="json", by_alias=True))
+    return found
+
+
+def measure(func: Callable[[], bytes], min_seconds: float) -> Dict[str, float]:
+    """Call func repeatedly for at least min_seconds, returning the mean time per call"""
+    func()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return {"ms_per_op": elapsed / calls * 1000, "ops_per_sec": calls / elapsed}
+
+
+async def measure_route(page_size: int, min_seconds: float) -> float:
+    """Time full GETs of the page through the ASGI interface, returning ms per request"""
+    token = create_access_token(
+        data={"sub": "admin@example.edu"},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/v1/readings", "raw_path": b"/api/v1/readings", "root_path": "",
+        "query_string": f"page%5Bsize%5D={page_size}".encode(),
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    content_type = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        if message["type"] == "http.response.start":
+            content_type[:] = [value for name, value in message["headers"] if name == b"content-type"]
+    
+    await root_app(dict(scope), receive, send)
+    requests = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        await root_app(dict(scope), receive, send)
+        requests += 1
+    elapsed = time.perf_counter() - start
+    print(f"Content-Type: {b', '.join(content_type).decode()}")
+    return elapsed / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="minimum time spent on each strategy")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        settings.JSON_FILE_FULL_PATH = write_dataset(directory, args.page_size)
+        model = asyncio.run(build_page(args.page_size))
+    found = strategies(model)
+    expected = json.loads(found["fastapi"]())
+    
+    print(f"/readings page of {len(model.data)} rows")
+    print(f"{'strategy':<18} {'ms/op':>8} {'ops/s':>8} {'bytes':>9} {'speedup':>8}")
+    baseline = None
+    for name, func in found.items():
+        body = func()
+        if json.loads(body) != expected:
+            print(f"{name}: output differs from the fastapi strategy")
+        result = measure(func, args.min_seconds)
+        baseline = baseline or result["ms_per_op"]
+        print(f"{name:<18} {result['ms_per_op']:8.2f} {result['ops_per_sec']:8.1f} {len(body):9d} {baseline / result['ms_per_op']:7.1f}x")
+    
+    route_ms = asyncio.run(measure_route(args.page_size, args.min_seconds))
+    print(f"GET /api/v1/readings?page[size]={args.page_size}: {route_ms:.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare throughput of the single-process uvicorn setup and the production entry point
+
+Starts the server as a subprocess in each mode, waits for /readyz, logs in,
+then keeps a fixed number of concurrent keep-alive clients busy on one GET
+endpoint for a fixed duration. Reports requests per second and latency
+percentiles.
+
+- baseline: `uvicorn app.main:root_app` on asyncio and h11, as the Dockerfile ran it before
+- server: `python -m app.server` (pre-forked workers, uvloop/httptools when installed)
+
+The load generator runs on the same host and competes with the server for
+CPU, so compare modes against each other rather than reading the absolute
+numbers as capacity.
+
+Usage:
+    python -m benchmarks.bench_server [--modes baseline server] [--duration 10] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from .common import summarize_latencies
+
+COMMANDS = {
+    "baseline": lambda port: [
+        sys.executable, "-m", "uvicorn", "app.main:root_app", "--host", "127.0.0.1", "--port", str(port),
+        "--loop", "asyncio", "--http", "h11"
+    ],
+    "server": lambda port: [sys.executable, "-m", "app.server"],
+}
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    """Start the server in the given mode and wait until /readyz reports ready"""
+    env = {**os.environ, "HOST": "127.0.0.1", "PORT": str(port), "LOG_LEVEL": "WARNING"}
+    process = subprocess.Popen(COMMANDS[mode](port), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/readyz").status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not become ready on port {port}")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def run_load(port: int, path: str, duration: float, concurrency: int) -> dict:
+    """Keep concurrency clients busy on path for duration seconds"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+        response = await client.post("/api/v1/users/login", json={"public_v1_user": {"email": "admin@example.edu", "password": "x"}})
+        response.raise_for_status()
+        headers = {"Authorization": response.headers["Authorization"]}
+        
+        latencies = []
+        errors = 0
+        deadline = time.perf_counter() + duration
+        
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    
+    return {"requests_per_second": len(latencies) / elapsed, "errors": errors, **summarize_latencies(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=sorted(COMMANDS), default=["baseline", "server"])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--path", default="/api/v1/readings?page%5Bsize%5D=20")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+    
+    print(f"{'mode':<9} {'requests/s':>11} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in args.modes:
+        process = start_server(mode, args.port)
+        try:
+            result = asyncio.run(run_load(args.port, args.path, args.duration, args.concurrency))
+        finally:
+            stop_server(process)
+        print(
+            f"{mode:<9} {result['requests_per_second']:11.0f} {result['p50_ms']:8.2f} "
+            f"{result['p95_ms']:8.2f} {result['p99_ms']:8.2f} {result['errors']:7d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Check key operations against the performance budgets in budgets.json
+
+Measures, in-process through httpx's ASGI transport:
+
+- login: POST /users/login
+- readings_page: GET /readings, page 1 at size 100
+- reading_detail: GET /readings/{id}
+- startup: a fresh interpreter importing app.main and running the warmup
+
+Each operation is compared with its budget (max_p99_ms,
+min_requests_per_second, max_rss_mb, max_seconds). A table of budget
+against measured values is printed, and the exit status is 1 when any
+budget is exceeded. Request coalescing is turned off, so concurrent
+identical requests each run the endpoint instead of sharing one call.
+
+Usage:
+    python -m benchmarks.check_budgets [--budgets benchmarks/budgets.json] [--requests 2000] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from app.core import settings
+from app.core.memory import process_memory
+from .common import summarize_latencies
+
+DEFAULT_BUDGETS = Path(__file__).with_name("budgets.json")
+
+# Run in a fresh interpreter so imports and the dataset load are really cold
+STARTUP_PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+from app.api.warmup import warm_up
+from app.core.memory import process_memory
+asyncio.run(warm_up(app.main.app))
+print(json.dumps({"seconds": time.perf_counter() - start, "rss_mb": process_memory()["rss_bytes"] / 2**20}))
+"""
+
+
+async def measure_requests(client: httpx.AsyncClient, send, requests: int, concurrency: int) -> Dict[str, float]:
+    """Send requests with a fixed number of concurrent clients, returning throughput, latency and RSS"""
+    for _ in range(min(50, requests)):     # warm up
+        (await send(client)).raise_for_status()
+    
+    latencies: List[float] = []
+    remaining = requests
+    
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await send(client)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    rss = process_memory()["rss_bytes"]
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        **summarize_latencies(latencies),
+        "rss_mb": rss / 2**20 if rss is not None else None,
+    }
+
+
+async def measure_routes(requests: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    from app.main import root_app
+    
+    # Every client asks for the same URLs, which coalescing would answer with one shared endpoint call
+    settings.COALESCE_REQUESTS = False
+    login_body = {"public_v1_user": {"email": "admin@example.edu", "password": "budget"}}
+    transport = httpx.ASGITransport(app=root_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        response = await client.post("/api/v1/users/login", json=login_body)
+        response.raise_for_status()
+        headers = {"Authorization": response.headers["Authorization"]}
+        reading_id = (await client.get("/api/v1/readings", params={"page[size]": 1}, headers=headers)).json()["data"][0]["id"]
+        
+        return {
+            "login": await measure_requests(
+                client, lambda c: c.post("/api/v1/users/login", json=login_body), requests, concurrency
+            ),
+            "readings_page": await measure_requests(
+                client, lambda c: c.get("/api/v1/readings", params={"page[number]": 1, "page[size]": 100}, headers=headers),
+                requests, concurrency
+            ),
+            "reading_detail": await measure_requests(
+                client, lambda c: c.get(f"/api/v1/readings/{reading_id}", headers=headers), requests, concurrency
+            ),
+        }
+
+
+def measure_startup() -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE], capture_output=True, text=True, check=True,
+        env={**os.environ, "LOG_LEVEL": "WARNING"}
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Budget key -> (measured metric, whether the measured value must stay at or below the budget)
+BUDGET_METRICS = {
+    "max_p99_ms": ("p99_ms", True),
+    "min_requests_per_second": ("requests_per_second", False),
+    "max_rss_mb": ("rss_mb", True),
+    "max_seconds": ("seconds", True),
+}
+
+
+def check_budgets(budgets: Dict[str, Dict[str, float]], measured: Dict[str, Dict[str, float]]) -> List[Dict]:
+    """
+    Compare measurements with budgets
+    
+    Args:
+        budgets: Budget values by operation and budget key
+        measured: Measured values by operation and metric
+        
+    Returns:
+        One row per budget with the operation, budget key, limit, measured value and whether it passed
+    """
+    rows = []
+    for operation, limits in budgets.items():
+        for key, limit in limits.items():
+            if key not in BUDGET_METRICS:
+                continue
+            metric, is_maximum = BUDGET_METRICS[key]
+            value = measured.get(operation, {}).get(metric)
+            passed = value is not None and (value <= limit if is_maximum else value >= limit)
+            rows.append({"operation": operation, "budget": key, "limit": limit, "measured": value, "passed": passed})
+    return rows
+
+
+def print_budget_report(rows: List[Dict]) -> None:
+    print(f"{'operation':<16} {'budget':<24} {'limit':>10} {'measured':>10}  status")
+    for row in rows:
+        measured = f"{row['measured']:10.2f}" if row["measured"] is not None else f"{'missing':>10}"
+        if row["passed"]:
+            status = "ok"
+        elif row["measured"] is None:
+            status = "FAIL (not measured)"
+        else:
+            status = f"FAIL ({(row['measured'] - row['limit']) / row['limit']:+.0%} vs limit)"
+        print(f"{row['operation']:<16} {row['budget']:<24} {row['limit']:10.2f} {measured}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS))
+    parser.add_argument("--requests", type=int, default=2000, help="requests measured per operation")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", help="write the measurements to this JSON file")
+    args = parser.parse_args()
+    
+    budgets = json.loads(Path(args.budgets).read_text())
+    measured = {"startup": measure_startup()}
+    measured.update(asyncio.run(measure_routes(args.requests, args.concurrency)))
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(measured, indent=2))
+    
+    rows = check_budgets(budgets, measured)
+    print_budget_report(rows)
+    failed = [row for row in rows if not row["passed"]]
+    if failed:
+        print(f"\n{len(failed)} of {len(rows)} budgets exceeded")
+        sys.exit(1)
+    print(f"\nAll {len(rows)} budgets met")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Helpers shared by the benchmark scripts"""
+import math
+from typing import Dict, List, Sequence
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of values using the nearest-rank method"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """Summarize latencies in seconds as a dict of counts and p50/p95/p99 in milliseconds"""
+    return {
+        "count": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+# Metrics where a higher value is better; for all others lower is better
+HIGHER_IS_BETTER = ("ops_per_sec", "requests_per_second", "count")
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """
+    Compare two nested benchmark result dicts metric by metric
+    
+    Leaves are numbers keyed by metric name, for example
+    {"1000": {"get_by_id": {"ops_per_sec": 1.2e6}}}. Metrics missing from
+    either side are skipped.
+    
+    Args:
+        baseline: Results of the reference run
+        current: Results of the run being checked
+        threshold: Relative change in the worse direction reported as a regression
+        
+    Returns:
+        One row per metric with its path, both values, the relative change and whether it regressed
+    """
+    rows = []
+    
+    def walk(old, new, path):
+        for key, new_value in new.items():
+            if key not in old:
+                continue
+            old_value = old[key]
+            if isinstance(new_value, dict) and isinstance(old_value, dict):
+                walk(old_value, new_value, path + (key,))
+            elif isinstance(new_value, (int, float)) and isinstance(old_value, (int, float)) and old_value:
+                change = (new_value - old_value) / old_value
+                worse = -change if key in HIGHER_IS_BETTER else change
+                rows.append({
+                    "metric": "/".join(path + (key,)),
+                    "baseline": old_value,
+                    "current": new_value,
+                    "change": change,
+                    "regression": worse > threshold,
+                })
+    
+    walk(baseline, current, ())
+    return rows
+
+
+def print_comparison(rows: List[Dict]) -> None:
+    """Print the rows of compare_results as a table"""
+    print(f"\n{'metric':<45} {'baseline':>14} {'current':>14} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['metric']:<45} {row['baseline']:14.4g} {row['current']:14.4g} {row['change']:+8.1%}{flag}")
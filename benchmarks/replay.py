@@ -0,0 +1,237 @@
+"""
+Replay captured traffic and compare latency with the capture
+
+Reads one or more capture files written with TRAFFIC_CAPTURE_PATH (rotated
+files can be passed together) and re-issues the requests in timestamp order,
+in-process through httpx's ASGI transport or against --url.
+
+- --speed 1 keeps the original spacing between requests, --speed 10 replays
+  ten times faster. Latency is measured from each request's scheduled time,
+  so queueing shows up. --speed 0 sends as fast as --concurrency allows.
+- Requests go to the dataset they were captured on: /datasets/{name}
+  prefixes are part of the path, and captured dataset headers are sent
+  again as --dataset-header.
+- Captured requests that carried credentials are sent with a token from
+  logging in as --email on their dataset. Logins are sent with --email and
+  a dummy password, since request bodies are not captured. Other requests
+  with bodies are skipped.
+
+Request coalescing is off in-process unless --coalesce is passed; start a
+server under test with COALESCE_REQUESTS=false for the same effect with
+--url.
+
+Paths are grouped with numeric segments replaced by {id}, and the dataset
+header value in brackets. The report shows captured against replayed
+p50/p95/p99 per group and the number of status codes that differ from the
+capture. --output/--compare store and check replay results like the other
+benchmarks.
+
+Usage:
+    python -m benchmarks.replay capture.ndjson [capture.ndjson.2024-...] [--url URL] [--speed 1] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .common import compare_results, print_comparison, summarize_latencies
+
+API_PREFIX = "/api/v1"
+DATASET_PREFIX = re.compile(r"^/api/v1/datasets/[^/]+(?=/)")
+
+
+def load_capture(paths: List[str]) -> List[Dict]:
+    """Read capture files and return their records in timestamp order"""
+    records = []
+    for path in paths:
+        with open(path) as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    return sorted(records, key=lambda record: record["ts"])
+
+
+def group_of(record: Dict) -> str:
+    """Route-like group of a record's path, with numeric segments replaced by {id} and any dataset header appended"""
+    group = re.sub(r"/\d+(?=/|$)", "/{id}", record["path"])
+    return f"{group} [{record['dataset']}]" if record.get("dataset") else group
+
+
+def dataset_of(record: Dict) -> Tuple[str, Optional[str]]:
+    """API prefix, with any /datasets/{name} segment, and dataset header value a record was served with"""
+    match = DATASET_PREFIX.match(record["path"])
+    return (match.group(0) if match else API_PREFIX), record.get("dataset")
+
+
+def is_login(record: Dict) -> bool:
+    """Whether a record is a login, on any dataset"""
+    return record["method"] == "POST" and record["path"] == dataset_of(record)[0] + "/users/login"
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    records: List[Dict],
+    email: str,
+    speed: float,
+    concurrency: int,
+    dataset_header: str = "X-Dataset"
+):
+    """Re-issue the records, returning replayed latencies, status mismatches and skipped requests per group"""
+    login_body = {"public_v1_user": {"email": email, "password": "replay"}}
+    
+    replayable = []
+    skipped = 0
+    for record in records:
+        if record["method"] in ("GET", "HEAD", "OPTIONS", "DELETE") or is_login(record):
+            replayable.append(record)
+        else:
+            skipped += 1
+    
+    # Tokens are tied to a dataset, so log in once on every dataset before the clock starts
+    dataset_headers: Dict[Tuple[str, Optional[str]], Dict[str, str]] = {}
+    auth_headers: Dict[Tuple[str, Optional[str]], Dict[str, str]] = {}
+    for record in replayable:
+        dataset = dataset_of(record)
+        if dataset in dataset_headers:
+            continue
+        prefix, header = dataset
+        dataset_headers[dataset] = {dataset_header: header} if header else {}
+        response = await client.post(f"{prefix}/users/login", json=login_body, headers=dataset_headers[dataset])
+        if response.status_code == 200:
+            auth_headers[dataset] = {**dataset_headers[dataset], "Authorization": response.headers["Authorization"]}
+        else:
+            where = f"{prefix}/users/login" + (f" with {dataset_header}: {header}" if header else "")
+            print(f"Login as {email} at {where} returned {response.status_code}, sending its requests without a token")
+            auth_headers[dataset] = dataset_headers[dataset]
+    
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    mismatches: Dict[str, int] = defaultdict(int)
+    
+    async def send(record: Dict, scheduled: float) -> None:
+        group = group_of(record)
+        url = record["path"] + (f"?{record['query']}" if record["query"] else "")
+        dataset = dataset_of(record)
+        headers = auth_headers[dataset] if record.get("identity") else dataset_headers[dataset]
+        try:
+            if is_login(record):
+                response = await client.post(url, json=login_body, headers=dataset_headers[dataset])
+            else:
+                response = await client.request(record["method"], url, headers=headers)
+            status_code = response.status_code
+        except httpx.HTTPError:
+            status_code = None
+        latencies[group].append(time.perf_counter() - scheduled)
+        if status_code != record["status"]:
+            mismatches[group] += 1
+    
+    if speed > 0:
+        tasks = []
+        start = time.perf_counter()
+        first_ts = replayable[0]["ts"] if replayable else 0
+        for record in replayable:
+            scheduled = start + (record["ts"] - first_ts) / speed
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(record, scheduled)))
+        await asyncio.gather(*tasks)
+    else:
+        queue = iter(replayable)
+        
+        async def worker():
+            for record in queue:
+                await send(record, time.perf_counter())
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    
+    return latencies, mismatches, skipped
+
+
+def summarize(records: List[Dict], latencies, mismatches) -> Dict[str, Dict]:
+    """Captured and replayed latency percentiles per group and overall"""
+    captured: Dict[str, List[float]] = defaultdict(list)
+    for record in records:
+        captured[group_of(record)].append(record["duration_ms"] / 1000)
+    
+    summary = {}
+    for group in sorted(latencies):
+        summary[group] = {
+            "captured": summarize_latencies(captured[group]),
+            "replayed": summarize_latencies(latencies[group]),
+            "status_mismatches": mismatches[group],
+        }
+    summary["all"] = {
+        "captured": summarize_latencies([value for values in captured.values() for value in values]),
+        "replayed": summarize_latencies([value for values in latencies.values() for value in values]),
+        "status_mismatches": sum(mismatches.values()),
+    }
+    return summary
+
+
+async def main_async(args) -> Dict[str, Dict]:
+    records = load_capture(args.captures)
+    if args.url:
+        limits = httpx.Limits(max_connections=max(args.concurrency, 100))
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30)
+    else:
+        from app.core import settings
+        from app.main import root_app
+        settings.COALESCE_REQUESTS = args.coalesce
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=root_app), base_url="http://replay", timeout=30)
+    
+    async with client:
+        latencies, mismatches, skipped = await replay(
+            client, records, args.email, args.speed, args.concurrency, args.dataset_header
+        )
+    if skipped:
+        print(f"Skipped {skipped} requests with bodies that were not captured")
+    return summarize(records, latencies, mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("captures", nargs="+", help="capture files, rotated ones included")
+    parser.add_argument("--url", help="base URL of a running server; the app runs in-process when omitted")
+    parser.add_argument("--speed", type=float, default=1, help="replay speed-up, 0 sends as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=16, help="clients used with --speed 0")
+    parser.add_argument("--email", default="admin@example.edu", help="user the replayed requests authenticate as")
+    parser.add_argument(
+        "--dataset-header", default=os.getenv("DATASET_HEADER", "X-Dataset"),
+        help="header the server reads the dataset from (its DATASET_HEADER)"
+    )
+    parser.add_argument("--coalesce", action="store_true", help="let identical concurrent requests share endpoint calls in-process")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare replayed latency against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+    
+    summary = asyncio.run(main_async(args))
+    
+    print(f"{'group':<36} {'count':>6} {'p50 ms':>15} {'p95 ms':>15} {'p99 ms':>15} {'status diff':>11}")
+    print(f"{'':<36} {'':>6} {'capture/replay':>15} {'capture/replay':>15} {'capture/replay':>15}")
+    for group, values in summary.items():
+        captured, replayed = values["captured"], values["replayed"]
+        columns = " ".join(f"{captured[key]:7.2f}/{replayed[key]:<7.2f}" for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{group:<36} {replayed['count']:6d} {columns} {values['status_mismatches']:11d}")
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps({"benchmark": "replay", "groups": summary}, indent=2))
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        replayed = {group: values["replayed"] for group, values in summary.items()}
+        baseline_replayed = {group: values["replayed"] for group, values in baseline["groups"].items()}
+        comparison = compare_results(baseline_replayed, replayed, args.threshold)
+        print_comparison(comparison)
+        if any(row["regression"] for row in comparison):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
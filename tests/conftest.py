@@ -1,3 +1,52 @@
+import os
+
+# Settings are read from the environment when app.core is imported
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("WARMUP", "false")   # keeps background warmup requests out of per-test assertions
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import settings
+from app.main import root_app
+from app.db import EReserveRepository
+
+
+@pytest.fixture(autouse=True)
+def isolate_repository_registry(monkeypatch):
+    """Fixture undoing the reload callbacks and datasets a test adds to the repository's class-level registries"""
+    monkeypatch.setattr(EReserveRepository, "_reload_callbacks", list(EReserveRepository._reload_callbacks))
+    loaded = set(EReserveRepository.loaded_snapshots()) | {settings.JSON_FILE_FULL_PATH}
+    yield
+    for file_path in set(EReserveRepository.loaded_snapshots()) - loaded:
+        EReserveRepository.unload(file_path)
+
+
+@pytest.fixture
+def client():
+    """Fixture for a test client on the root app (API mounted at /api/v1)"""
+    with TestClient(root_app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Fixture for the Authorization header of a logged in sample user"""
+    response = client.post(
+        "/api/v1/users/login",
+        json={"public_v1_user": {"email": "admin@example.edu", "password": "password"}}
+    )
+    return {"Authorization": response.headers["Authorization"]}
+
+
+@pytest.fixture
+def ereserve_repository():
+    """Fixture for the eReserve repository on the sample dataset"""
+    return EReserveRepository()
+
+
 # import os
 # import pytest
 # import pandas as pd
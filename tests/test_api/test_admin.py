@@ -0,0 +1,48 @@
+import pytest
+
+from app.core import settings
+
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+
+
+def test_memory_requires_admin_token(client):
+    """Test that the memory report needs the admin token."""
+    assert client.get("/api/v1/admin/memory").status_code == 403
+    assert client.get("/api/v1/admin/memory", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_memory_report(client, auth_headers):
+    """Test that the memory report covers collections, indexes, caches, RSS and gc."""
+    client.get("/api/v1/schools", headers=auth_headers)
+    response = client.get("/api/v1/admin/memory", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    report = response.json()
+    
+    dataset = report["datasets"]["sample-ereserve-data.json"]
+    assert dataset["collections"]["schools"]["rows"] > 0
+    assert dataset["collections"]["schools"]["bytes"] > 0
+    assert "users" in dataset["id_indexes"]
+    assert "users.email" in dataset["key_indexes"]
+    assert report["caches"]["token"]["entries"] >= 1
+    assert report["caches"]["token"]["bytes"] > 0
+    assert report["process"]["rss_bytes"] is None or report["process"]["rss_bytes"] > 0
+    assert len(report["gc"]["generations"]) == 3
+
+
+def test_tracemalloc_window(client):
+    """Test starting, reading and stopping a tracemalloc window."""
+    assert client.post("/api/v1/admin/memory/tracemalloc", headers=ADMIN_HEADERS).json()["tracing"] is True
+    try:
+        client.get("/api/v1/admin/memory", headers=ADMIN_HEADERS)
+        report = client.get("/api/v1/admin/memory/tracemalloc?limit=5", headers=ADMIN_HEADERS).json()
+        assert report["tracing"] is True
+        assert len(report["top"]) <= 5
+    finally:
+        client.delete("/api/v1/admin/memory/tracemalloc", headers=ADMIN_HEADERS)
+    
+    assert client.get("/api/v1/admin/memory/tracemalloc", headers=ADMIN_HEADERS).json() == {"tracing": False}
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from app.core import settings
+
+TENANT_HEADERS = {"X-Dataset": "tenant-b"}
+
+
+@pytest.fixture
+def tenant_dataset(tmp_path, monkeypatch):
+    """Fixture registering a second dataset with a renamed school and its own user"""
+    data = json.loads(open(settings.JSON_FILE_FULL_PATH).read())
+    data["schools"][0]["name"] = "Tenant B School"
+    data["users"] = [dict(data["users"][0], email="staff@tenant-b.edu")]
+    data_file = tmp_path / "tenant-b.json"
+    data_file.write_text(json.dumps(data))
+    monkeypatch.setitem(settings.DATASET_FULL_PATHS, "tenant-b", str(data_file))
+    return data
+
+
+def tenant_login(client, email="staff@tenant-b.edu", headers=TENANT_HEADERS):
+    body = {"public_v1_user": {"email": email, "password": "password"}}
+    return client.post("/api/v1/users/login", json=body, headers=headers)
+
+
+def test_dataset_from_header(client, auth_headers, tenant_dataset):
+    """Test that the dataset header selects the tenant's data and users."""
+    response = tenant_login(client)
+    assert response.status_code == 200
+    tenant_auth = {"Authorization": response.headers["Authorization"], **TENANT_HEADERS}
+    
+    response = client.get("/api/v1/schools/1", headers=tenant_auth)
+    assert response.json()["data"]["attributes"]["name"] == "Tenant B School"
+    
+    response = client.get("/api/v1/schools/1", headers=auth_headers)
+    assert response.json()["data"]["attributes"]["name"] != "Tenant B School"
+
+
+def test_dataset_from_path_prefix(client, tenant_dataset):
+    """Test that a /datasets/{name} prefix selects the dataset and is kept in pagination links."""
+    response = client.post(
+        "/api/v1/datasets/tenant-b/users/login",
+        json={"public_v1_user": {"email": "staff@tenant-b.edu", "password": "password"}}
+    )
+    assert response.status_code == 200
+    
+    response = client.get(
+        "/api/v1/datasets/tenant-b/schools?page[size]=1",
+        headers={"Authorization": response.headers["Authorization"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"][0]["attributes"]["name"] == "Tenant B School"
+    assert "/api/v1/datasets/tenant-b/schools?" in response.json()["links"]["next"]
+
+
+def test_tokens_are_checked_per_dataset(client, tenant_dataset):
+    """Test that a tenant user's token is not accepted on a dataset without that user."""
+    token = tenant_login(client).headers["Authorization"]
+    assert client.get("/api/v1/schools/1", headers={"Authorization": token, **TENANT_HEADERS}).status_code == 200
+    assert client.get("/api/v1/schools/1", headers={"Authorization": token}).status_code == 401
+
+
+def test_tokens_are_tied_to_their_dataset(client, auth_headers, tmp_path, monkeypatch):
+    """Test that a token is rejected on another dataset even when the same user exists there."""
+    data_file = tmp_path / "copy.json"
+    data_file.write_text(open(settings.JSON_FILE_FULL_PATH).read())
+    monkeypatch.setitem(settings.DATASET_FULL_PATHS, "copy", str(data_file))
+    
+    response = client.get("/api/v1/schools/1", headers={**auth_headers, "X-Dataset": "copy"})
+    assert response.status_code == 401
+    
+    copy_auth = {"Authorization": tenant_login(client, "admin@example.edu", {"X-Dataset": "copy"}).headers["Authorization"]}
+    assert client.get("/api/v1/schools/1", headers={**copy_auth, "X-Dataset": "copy"}).status_code == 200
+    assert client.get("/api/v1/schools/1", headers=copy_auth).status_code == 401
+
+def test_unknown_dataset(client, auth_headers):
+    """Test that naming an unconfigured dataset is a JSON API 404."""
+    response = client.get("/api/v1/schools", headers={**auth_headers, "X-Dataset": "nowhere"})
+    assert response.status_code == 404
+    assert response.headers["content-type"] == "application/vnd.api+json"
+    assert response.json()["errors"][0]["detail"] == "Dataset nowhere not found"
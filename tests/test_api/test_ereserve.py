@@ -0,0 +1,110 @@
+from app.core import settings
+from app.api.errors import _json_api_error_prefix
+
+
+def test_list_readings(client, auth_headers):
+    """Test listing readings with pagination links."""
+    response = client.get("/api/v1/readings?page[size]=2", headers=auth_headers)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert len(data["data"]) == 2
+    assert data["data"][0]["type"] == "readings"
+    assert "page%5Bnumber%5D=2&page%5Bsize%5D=2" in data["links"]["next"]
+
+
+def test_filter_by_ids(client, auth_headers):
+    """Test fetching several items in one request with filter[id]."""
+    response = client.get("/api/v1/readings?filter[id]=3,1,999999,3", headers=auth_headers)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["data"]] == ["3", "1"]
+
+
+def test_filter_by_ids_kept_in_links(client, auth_headers):
+    """Test that pagination links keep the ID filter."""
+    response = client.get("/api/v1/units?filter[id]=1,2,3&page[size]=2", headers=auth_headers)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert [item["id"] for item in data["data"]] == ["1", "2"]
+    assert data["links"]["next"].endswith("?filter%5Bid%5D=1%2C2%2C3&page%5Bnumber%5D=2&page%5Bsize%5D=2")
+
+
+def test_filter_by_ids_limit(client, auth_headers, monkeypatch):
+    """Test that too many IDs are rejected with a JSON API error."""
+    monkeypatch.setattr(settings, "MAX_FILTER_IDS", 2)
+    response = client.get("/api/v1/schools?filter[id]=1,2,3", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["title"] == "Invalid Filter"
+
+
+def test_list_meta_totals(client, auth_headers):
+    """Test that list responses include the collection totals."""
+    response = client.get("/api/v1/units?page[size]=10", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["meta"] == {"total": 24, "total-pages": 3}
+
+
+def test_count_only_page_size_zero(client, auth_headers):
+    """Test that page[size]=0 returns totals without any data."""
+    response = client.get("/api/v1/readings?page[size]=0&filter[id]=1,2,999999", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"data": [], "meta": {"total": 2, "total-pages": 0}}
+
+
+def test_head_returns_counts(client, auth_headers):
+    """Test that HEAD reports the totals in headers."""
+    response = client.head("/api/v1/reading-list-items?page[size]=20", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "46"
+    assert response.headers["X-Total-Pages"] == "3"
+
+
+def test_filter_by_key(client, auth_headers):
+    """Test filtering integration users by a unique lookup key."""
+    response = client.get("/api/v1/integration-users?filter[identifier]=STUDENT1", headers=auth_headers)
+    assert response.status_code == 200
+    assert [item["attributes"]["email"] for item in response.json()["data"]] == ["alice.johnson@example.edu"]
+
+
+def test_filter_by_key_and_ids(client, auth_headers):
+    """Test that key filters combine with filter[id]."""
+    response = client.get("/api/v1/units?filter[code]=comp101&filter[id]=2,3", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+
+def test_filter_without_matches_links_to_page_one(client, auth_headers):
+    """Test that an empty filtered page links last to page 1, which can be followed."""
+    response = client.get("/api/v1/readings?filter[id]=999", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+    
+    links = response.json()["links"]
+    assert links["last"] == links["first"]
+    assert "next" not in links
+    assert client.get(links["last"], headers=auth_headers).status_code == 200
+
+def test_detail_not_found_is_json_api(client, auth_headers):
+    """Test that errors on detail routes use the JSON API error format."""
+    response = client.get("/api/v1/readings/999999", headers=auth_headers)
+    assert response.status_code == 404
+    assert response.headers["content-type"] == "application/vnd.api+json"
+    assert response.json()["errors"][0]["detail"] == "Item with ID 999999 not found in readings"
+
+
+
+def test_error_body_cache_ignores_detail(client, auth_headers):
+    """Test that errors differing only in their detail share one cached body prefix."""
+    client.get("/api/v1/readings/999998", headers=auth_headers)
+    cached = _json_api_error_prefix.cache_info().currsize
+    for item_id in range(999990, 999998):
+        response = client.get(f"/api/v1/readings/{item_id}", headers=auth_headers)
+        assert response.json()["errors"][0]["detail"] == f"Item with ID {item_id} not found in readings"
+    assert _json_api_error_prefix.cache_info().currsize == cached
+
+def test_openapi_json_api_content_types(client):
+    """Test that JSON API routes, including detail routes, document vnd.api+json responses."""
+    paths = client.get("/api/v1/openapi.json").json()["paths"]
+    assert "application/vnd.api+json" in paths["/readings/{id}"]["get"]["responses"]["200"]["content"]
+    assert "application/vnd.api+json" in paths["/users/login"]["post"]["requestBody"]["content"]
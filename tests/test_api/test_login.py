@@ -0,0 +1,59 @@
+import json
+
+import bcrypt
+import pytest
+
+from app.core import settings
+
+
+@pytest.fixture
+def password_dataset(tmp_path, monkeypatch):
+    """Fixture for a dataset whose user has a bcrypt password hash, with password checks enabled"""
+    password_hash = bcrypt.hashpw(b"correct-password", bcrypt.gensalt(rounds=4)).decode()
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({
+        "users": [{
+            "id": 1,
+            "first_name": "Test",
+            "last_name": "User",
+            "email": "test@example.edu",
+            "password_hash": password_hash,
+            "created_at": "2024-09-01T08:00:00Z",
+            "updated_at": "2024-09-01T08:00:00Z"
+        }],
+        "integrationUsers": []
+    }))
+    monkeypatch.setattr(settings, "JSON_FILE_FULL_PATH", str(data_file))
+    monkeypatch.setattr(settings, "VERIFY_PASSWORDS", True)
+
+
+def login(client, email, password):
+    return client.post("/api/v1/users/login", json={"public_v1_user": {"email": email, "password": password}})
+
+
+def test_login(client):
+    """Test logging in as a sample user returns a bearer."""
+    response = login(client, "admin@example.edu", "any-password")
+    assert response.status_code == 200
+    assert response.headers["Authorization"].startswith("Bearer ")
+    assert response.json()["data"]["attributes"]["email"] == "admin@example.edu"
+
+
+def test_login_unknown_user(client):
+    """Test that an unknown email is rejected."""
+    response = login(client, "nobody@example.edu", "any-password")
+    assert response.status_code == 400
+
+
+def test_login_verifies_password(client, password_dataset):
+    """Test password verification when enabled."""
+    assert login(client, "test@example.edu", "correct-password").status_code == 200
+    assert login(client, "test@example.edu", "wrong-password").status_code == 400
+
+
+def test_login_rejected_when_saturated(client, password_dataset, monkeypatch):
+    """Test that logins are rejected with 503 when no verification slot is free."""
+    monkeypatch.setattr(settings, "PASSWORD_VERIFY_MAX_PENDING", 0)
+    response = login(client, "test@example.edu", "correct-password")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
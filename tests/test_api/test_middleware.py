@@ -0,0 +1,101 @@
+import json
+import pstats
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import settings
+from app.core import logger
+from app.core.capture import identity_hash, start_capture
+from app.api.middleware import TrafficCaptureMiddleware
+
+
+def test_process_time_header(client, auth_headers):
+    """Test that responses carry the X-Process-Time header."""
+    response = client.get("/api/v1/schools/1", headers=auth_headers)
+    assert response.status_code == 200
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_metrics_endpoint(client, auth_headers):
+    """Test that /metrics reports requests by route template and the token cache."""
+    client.get("/api/v1/schools/1", headers=auth_headers)
+    client.get("/api/v1/schools/1", headers=auth_headers)
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/schools/{id}",status="200"}' in body
+    assert 'http_response_size_bytes_bucket{method="GET",route="/schools/{id}",le="+Inf"}' in body
+    assert "http_requests_in_flight 0" in body
+    assert 'ereserve_collection_rows{dataset=' in body
+    assert 'cache_hits_total{cache="token"}' in body
+
+
+def test_profile_on_demand(client, auth_headers, monkeypatch, tmp_path):
+    """Test that admins can profile a single request into PROFILE_DIR."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_DIR_FULL_PATH", str(tmp_path))
+    
+    headers = {**auth_headers, "X-Profile": "1", "X-Admin-Token": "secret"}
+    response = client.get("/api/v1/schools", headers=headers)
+    assert response.status_code == 200
+    
+    file_name = response.headers["X-Profile-File"]
+    stats = pstats.Stats(str(tmp_path / file_name))
+    assert stats.total_calls > 0
+
+
+def test_profile_requires_admin_token(client, auth_headers, monkeypatch, tmp_path):
+    """Test that profiling is ignored without the right admin token."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_DIR_FULL_PATH", str(tmp_path))
+    
+    headers = {**auth_headers, "X-Profile": "1", "X-Admin-Token": "wrong"}
+    response = client.get("/api/v1/schools", headers=headers)
+    assert "X-Profile-File" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_slow_request_profile(client, auth_headers, monkeypatch, tmp_path):
+    """Test that sampled requests slower than the threshold are profiled."""
+    monkeypatch.setattr(settings, "SLOW_REQUEST_PROFILE_SECONDS", 1e-9)
+    monkeypatch.setattr(settings, "SLOW_REQUEST_PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILE_DIR_FULL_PATH", str(tmp_path))
+    
+    client.get("/api/v1/schools", headers=auth_headers)
+    assert len(list(tmp_path.glob("*.pstats"))) == 1
+
+
+def test_traffic_capture(tmp_path):
+    """Test that captured requests are written as NDJSON with a hashed identity."""
+    capture_path = tmp_path / "capture.ndjson"
+    sink_id = start_capture(str(capture_path), max_bytes=1_000_000, backups=2)
+    try:
+        capture_app = FastAPI()
+        
+        @capture_app.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            return {"id": item_id}
+        
+        capture_app.add_middleware(TrafficCaptureMiddleware)
+        with TestClient(capture_app) as capture_client:
+            capture_client.get("/items/3?page%5Bsize%5D=1", headers={"Authorization": "Bearer token"})
+            capture_client.get("/items/4", headers={settings.DATASET_HEADER: "tenant-b"})
+        logger.complete()
+    finally:
+        logger.remove(sink_id)
+    
+    record = json.loads(capture_path.read_text().splitlines()[0])
+    assert record["method"] == "GET"
+    assert record["path"] == "/items/3"
+    assert record["query"] == "page%5Bsize%5D=1"
+    assert record["status"] == 200
+    assert record["bytes"] == len(b'{"id":3}')
+    assert record["identity"] == identity_hash(b"Bearer token")
+    assert record["dataset"] is None
+    assert json.loads(capture_path.read_text().splitlines()[1])["dataset"] == "tenant-b"
+    assert "token" not in capture_path.read_text()
@@ -0,0 +1,41 @@
+import json
+
+from app.core.openapi import generate_openapi
+from app.main import app
+
+
+def test_served_document_matches_live_schema(client):
+    """Test that the precomputed OpenAPI document matches a fresh build from the live routes."""
+    response = client.get("/api/v1/openapi.json", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == json.loads(json.dumps(generate_openapi(app)))
+
+
+def test_gzip_document(client):
+    """Test that gzip-accepting clients get the precompressed document."""
+    response = client.get("/api/v1/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    plain = client.get("/api/v1/openapi.json", headers={"Accept-Encoding": "identity"})
+    # httpx decompresses transparently, so compare the wire size and the decoded body
+    assert int(response.headers["content-length"]) < len(plain.content)
+    assert response.content == plain.content
+
+
+
+def test_gzip_refused_with_zero_qvalue(client):
+    """Test that gzip is not sent to clients refusing it or only naming x-gzip."""
+    for accept_encoding in ("gzip;q=0", "x-gzip", "gzip;q=0, deflate", "*, gzip;q=0"):
+        response = client.get("/api/v1/openapi.json", headers={"Accept-Encoding": accept_encoding})
+        assert "content-encoding" not in response.headers, accept_encoding
+    
+    for accept_encoding in ("gzip;q=0.5", "deflate, GZIP", "*"):
+        response = client.get("/api/v1/openapi.json", headers={"Accept-Encoding": accept_encoding})
+        assert response.headers["content-encoding"] == "gzip", accept_encoding
+
+def test_etag_revalidation(client):
+    """Test that a matching If-None-Match gets a 304 without a body."""
+    etag = client.get("/api/v1/openapi.json").headers["etag"]
+    response = client.get("/api/v1/openapi.json", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
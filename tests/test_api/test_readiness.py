@@ -0,0 +1,50 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core import settings
+from app.api.warmup import readiness, warmup_paths
+from app.main import app, root_app
+
+
+def wait_until_ready(client):
+    deadline = time.monotonic() + 10
+    response = client.get("/readyz")
+    while response.status_code == 503 and time.monotonic() < deadline:
+        time.sleep(0.01)
+        response = client.get("/readyz")
+    return response
+
+
+def test_readyz_after_warmup(monkeypatch):
+    """Test that /readyz turns ready after the warmup and reports each startup phase."""
+    monkeypatch.setattr(settings, "WARMUP", True)
+    with TestClient(root_app) as client:
+        response = wait_until_ready(client)
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert {"import", "repository", "routes", "warmup"} <= set(response.json()["startup"])
+
+
+def test_warmup_covers_list_routes():
+    """Test that the warmup exercises every JSON API list route."""
+    paths = warmup_paths(app)
+    assert "/schools" in paths
+    assert "/readings" in paths
+    assert all("{" not in path for path in paths)
+
+
+def test_ready_without_users(tmp_path, monkeypatch):
+    """Test that a dataset without user collections skips the route warmup but still reports ready."""
+    data_file = tmp_path / "no-users.json"
+    data_file.write_text(json.dumps({"schools": [{"id": 1, "name": "School"}]}))
+    monkeypatch.setattr(settings, "JSON_FILE_FULL_PATH", str(data_file))
+    monkeypatch.setattr(settings, "WARMUP", True)
+    monkeypatch.setattr(readiness, "phases", {})
+    with TestClient(root_app) as client:
+        response = wait_until_ready(client)
+    
+    assert response.status_code == 200
+    assert "routes" not in response.json()["startup"]
@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+
+from app.core import settings
+from app.core.metrics import http_requests_coalesced
+from app.api.routing import JsonApiRoute
+
+JSON_API_HEADERS = {"Content-Type": "application/vnd.api+json"}
+
+
+class Item(BaseModel):
+    id: int
+
+
+def test_json_api_login_body(client):
+    """Test that a checked JSON API body still reaches the endpoint."""
+    body = json.dumps({"public_v1_user": {"email": "admin@example.edu", "password": "password"}})
+    response = client.post("/api/v1/users/login", content=body, headers=JSON_API_HEADERS)
+    assert response.status_code == 200
+
+
+def test_json_api_invalid_json(client):
+    """Test that malformed JSON API bodies are rejected."""
+    response = client.post("/api/v1/users/login", content="{not json", headers=JSON_API_HEADERS)
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["title"] == "Invalid JSON"
+
+
+def test_json_api_login_requires_user_object(client):
+    """Test that login bodies must contain public_v1_user."""
+    response = client.post("/api/v1/users/login", content=json.dumps({"email": "x"}), headers=JSON_API_HEADERS)
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["title"] == "Invalid Request Format"
+
+
+def test_body_too_large(client, monkeypatch):
+    """Test that bodies over MAX_REQUEST_BODY_BYTES are rejected with 413."""
+    monkeypatch.setattr(settings, "MAX_REQUEST_BODY_BYTES", 16)
+    body = json.dumps({"public_v1_user": {"email": "admin@example.edu", "password": "password"}})
+    response = client.post("/api/v1/users/login", content=body, headers=JSON_API_HEADERS)
+    assert response.status_code == 413
+    assert response.json()["errors"][0]["status"] == "413"
+
+
+def test_body_parsed_once(client, monkeypatch):
+    """Test that a JSON API login body is parsed a single time."""
+    calls = []
+    real_loads = json.loads
+    
+    def counting_loads(*args, **kwargs):
+        calls.append(args)
+        return real_loads(*args, **kwargs)
+    
+    monkeypatch.setattr(json, "loads", counting_loads)
+    body = json.dumps({"public_v1_user": {"email": "admin@example.edu", "password": "password"}})
+    response = client.post("/api/v1/users/login", content=body, headers=JSON_API_HEADERS)
+    assert response.status_code == 200
+    assert len([args for args in calls if b"public_v1_user" in args[0]]) == 1
+
+
+def test_server_timing_header(client, auth_headers, monkeypatch):
+    """Test that SERVER_TIMING adds per-phase durations to JSON API responses."""
+    monkeypatch.setattr(settings, "SERVER_TIMING", True)
+    response = client.get("/api/v1/schools", headers=auth_headers)
+    assert response.status_code == 200
+    
+    phases = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert phases == ["auth", "repo", "serialise", "encode", "total"]
+
+
+def test_server_timing_header_on_errors(client, auth_headers, monkeypatch):
+    """Test that HTTP errors raised inside a timed phase still carry Server-Timing."""
+    monkeypatch.setattr(settings, "SERVER_TIMING", True)
+    response = client.get("/api/v1/schools/999999", headers=auth_headers)
+    assert response.status_code == 404
+    
+    phases = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert phases == ["auth", "repo", "total"]
+    
+    response = client.get("/api/v1/schools", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == 401
+    phases = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert phases == ["auth", "total"]
+
+
+def test_server_timing_disabled(client, auth_headers):
+    """Test that Server-Timing is off by default."""
+    response = client.get("/api/v1/schools", headers=auth_headers)
+    assert "Server-Timing" not in response.headers
+
+
+def test_json_api_response_encoding(client, auth_headers):
+    """Test that response models are served as vnd.api+json using their field aliases."""
+    response = client.get("/api/v1/readings/1", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers.get_list("content-type") == ["application/vnd.api+json"]
+    assert "reading-title" in response.json()["data"]["attributes"]
+
+
+def test_json_api_response_keeps_endpoint_headers(client):
+    """Test that headers set on the endpoint's Response parameter survive direct encoding."""
+    body = {"public_v1_user": {"email": "admin@example.edu", "password": "password"}}
+    response = client.post("/api/v1/users/login", json=body)
+    assert response.status_code == 200
+    assert response.headers["authorization"].startswith("Bearer ")
+    assert response.headers.get_list("content-type") == ["application/vnd.api+json"]
+
+
+
+def test_identical_concurrent_requests_are_coalesced():
+    """Test that concurrent GETs for the same URL share one endpoint call and each get the response."""
+    calls = []
+    router = APIRouter(route_class=JsonApiRoute)
+    
+    @router.get("/items/{item_id}", response_model=Item)
+    async def get_item(item_id: int):
+        calls.append(item_id)
+        await asyncio.sleep(0.05)
+        return Item(id=item_id)
+    
+    coalescing_app = FastAPI()
+    coalescing_app.include_router(router)
+    coalesced_before = http_requests_coalesced.value("/items/{item_id}")
+    
+    async def run():
+        transport = httpx.ASGITransport(app=coalescing_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            same = [async_client.get("/items/1") for _ in range(4)]
+            return await asyncio.gather(*same, async_client.get("/items/2"))
+    
+    responses = asyncio.run(run())
+    
+    assert [response.json() for response in responses] == [{"id": 1}] * 4 + [{"id": 2}]
+    assert all(response.headers["content-type"] == "application/vnd.api+json" for response in responses)
+    assert sorted(calls) == [1, 2]
+    assert http_requests_coalesced.value("/items/{item_id}") == coalesced_before + 3
@@ -0,0 +1,35 @@
+from app.core.security import token_cache
+from app.db import EReserveRepository
+
+
+def test_list_requires_auth(client):
+    """Test that collection endpoints reject requests without a bearer."""
+    response = client.get("/api/v1/readings")
+    assert response.status_code == 401
+
+
+def test_invalid_token(client):
+    """Test that an invalid bearer is rejected."""
+    response = client.get("/api/v1/readings", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+
+
+def test_token_cached(client, auth_headers):
+    """Test that a verified bearer is cached and the cache is cleared on reload."""
+    token_cache.clear()
+    assert client.get("/api/v1/schools", headers=auth_headers).status_code == 200
+    assert len(token_cache) == 1
+    
+    hits = token_cache.hits
+    assert client.get("/api/v1/schools", headers=auth_headers).status_code == 200
+    assert token_cache.hits == hits + 1
+    
+    EReserveRepository().reload()
+    assert len(token_cache) == 0
+
+
+def test_unauthorized_keeps_authenticate_header(client):
+    """Test that JSON API 401 errors keep the WWW-Authenticate header."""
+    response = client.get("/api/v1/readings")
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert response.json()["errors"][0]["detail"] == "Missing authorization header"
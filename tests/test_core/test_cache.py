@@ -0,0 +1,39 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_get_and_set():
+    """Test storing and reading entries with hit/miss accounting."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted beyond maxsize."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_expiry():
+    """Test that entries expire at the earlier of the TTL and their own deadline."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1, expires_at=time.monotonic() - 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_disabled():
+    """Test that a cache with maxsize 0 stores nothing."""
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,27 @@
+import asyncio
+import time
+
+from app.core.loop_monitor import LoopMonitor, event_loop_blocked, event_loop_lag
+
+
+def block_the_loop():
+    time.sleep(0.3)
+
+
+def test_blocking_call_is_reported():
+    """Test that a blocking call on the loop is counted with its stack."""
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+    blocked_before = event_loop_blocked.value()
+    
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        block_the_loop()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+    
+    asyncio.run(run())
+    
+    assert event_loop_blocked.value() == blocked_before + 1
+    assert "block_the_loop" in monitor.last_blocked_stack
+    assert event_loop_lag.count() > 0
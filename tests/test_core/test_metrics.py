@@ -0,0 +1,28 @@
+from app.core.metrics import Counter, Histogram, REGISTRY
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram buckets are cumulative and end with +Inf."""
+    histogram = Histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    try:
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5, "/a")
+        
+        lines = histogram.render()
+        assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in lines
+        assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'test_latency_seconds_count{route="/a"} 3' in lines
+    finally:
+        REGISTRY.remove(histogram)
+
+
+def test_label_values_are_escaped():
+    """Test that quotes in label values are escaped."""
+    counter = Counter("test_total", "Test counter", ("path",))
+    try:
+        counter.inc('say "hi"')
+        assert 'test_total{path="say \\"hi\\""} 1' in counter.render()
+    finally:
+        REGISTRY.remove(counter)
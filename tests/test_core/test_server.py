@@ -0,0 +1,53 @@
+import os
+import time
+
+from app.core import settings
+from app import server
+
+
+def test_worker_count_defaults_to_available_cpus(monkeypatch):
+    """Test that workers are sized to the available CPUs unless WEB_CONCURRENCY is set."""
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 0)
+    monkeypatch.setattr(server, "available_cpus", lambda: 3)
+    assert server.worker_count() == 3
+    
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 5)
+    assert server.worker_count() == 5
+
+
+def test_available_cpus_respects_cgroup_quota(monkeypatch):
+    """Test that a fractional cgroup quota rounds up and caps the CPU count."""
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)))
+    monkeypatch.setattr(server, "_cgroup_cpu_limit", lambda: 1.5)
+    assert server.available_cpus() == 2
+    
+    monkeypatch.setattr(server, "_cgroup_cpu_limit", lambda: None)
+    assert server.available_cpus() == 8
+
+
+def test_restart_delay_backs_off():
+    """Test that restarts after crashes on start wait longer each time, up to a cap."""
+    assert server.restart_delay(0) == 0
+    assert server.restart_delay(1) == server.RESTART_BACKOFF_SECONDS
+    assert server.restart_delay(2) == server.RESTART_BACKOFF_SECONDS * 2
+    assert server.restart_delay(100) == server.RESTART_BACKOFF_MAX_SECONDS
+
+
+def test_supervisor_gives_up_on_workers_crashing_on_start(tmp_path, monkeypatch):
+    """Test that a worker crashing on start is restarted with a delay, then the server exits with an error."""
+    starts = tmp_path / "starts"
+    
+    def crash_on_start(config, sock):
+        with open(starts, "a") as starts_file:
+            starts_file.write("started\n")
+        os._exit(3)
+    
+    monkeypatch.setattr(server, "_run_worker", crash_on_start)
+    monkeypatch.setattr(server.signal, "signal", lambda signum, handler: None)
+    monkeypatch.setattr(server, "RESTART_BACKOFF_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "WORKER_MAX_START_FAILURES", 3)
+    
+    start_time = time.monotonic()
+    assert server.supervise(config=None, sock=None, workers=1) == 1
+    assert starts.read_text().count("started") == 3
+    assert time.monotonic() - start_time >= 0.05 + 0.1
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    """Test that concurrent callers with the same key share a single call."""
+    flight = SingleFlight()
+    calls = []
+    
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+    
+    async def run():
+        return await asyncio.gather(*(flight.run("key", work) for _ in range(5)))
+    
+    results = asyncio.run(run())
+    
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ["result"] * 5
+    assert [shared for _, shared in results].count(False) == 1
+    assert flight.in_flight() == 0
+
+
+def test_finished_calls_are_not_reused():
+    """Test that a call made after the previous one finished runs again."""
+    flight = SingleFlight()
+    calls = []
+    
+    async def work():
+        calls.append(1)
+        return len(calls)
+    
+    async def run():
+        first = await flight.run("key", work)
+        second = await flight.run("key", work)
+        return first, second
+    
+    assert asyncio.run(run()) == ((1, False), (2, False))
+
+
+def test_exceptions_reach_every_caller():
+    """Test that an exception raised by the shared call is raised to all callers."""
+    flight = SingleFlight()
+    
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    async def run():
+        return await asyncio.gather(*(flight.run("key", work) for _ in range(3)), return_exceptions=True)
+    
+    results = asyncio.run(run())
+    
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    """Test that the shared call keeps running when the first caller is cancelled."""
+    flight = SingleFlight()
+    
+    async def work():
+        await asyncio.sleep(0.02)
+        return "result"
+    
+    async def run():
+        first = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+    
+    assert asyncio.run(run()) == ("result", True)
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import settings
+from app.db import EReserveRepository, load_repository, reload_repository
+
+
+def test_get_by_id(ereserve_repository):
+    """Test getting an item by ID through the id index."""
+    reading = ereserve_repository.get_by_id("readings", "2")
+    assert reading["id"] == 2
+
+
+def test_get_by_id_not_found(ereserve_repository):
+    """Test getting a non-existent item."""
+    with pytest.raises(HTTPException) as exc_info:
+        ereserve_repository.get_by_id("readings", "999999")
+    assert exc_info.value.status_code == 404
+
+
+def test_get_by_ids(ereserve_repository):
+    """Test getting several items keeps the requested order and skips unknown IDs."""
+    readings = ereserve_repository.get_by_ids("readings", ["3", "999999", "1"])
+    assert [reading["id"] for reading in readings] == [3, 1]
+
+
+def test_get_all_paginated_with_ids(ereserve_repository):
+    """Test pagination over an ID filter."""
+    result = ereserve_repository.get_all_paginated("units", page_number=2, page_size=2, ids=["1", "2", "3"])
+    assert result["total_count"] == 3
+    assert result["total_pages"] == 2
+    assert [unit["id"] for unit in result["items"]] == [3]
+
+
+def test_reload(tmp_path):
+    """Test that reload picks up changes to the data file."""
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"schools": [{"id": 1, "name": "School A"}]}))
+    repo = EReserveRepository(file_path=str(data_file))
+    assert repo.get_by_id("schools", 1)["name"] == "School A"
+    
+    data_file.write_text(json.dumps({"schools": [{"id": 1, "name": "School B"}]}))
+    assert EReserveRepository(file_path=str(data_file)).get_by_id("schools", 1)["name"] == "School A"
+    
+    repo.reload()
+    assert EReserveRepository(file_path=str(data_file)).get_by_id("schools", 1)["name"] == "School B"
+
+
+def test_count(ereserve_repository):
+    """Test counting a collection with and without an ID filter."""
+    assert ereserve_repository.count("schools") == 20
+    assert ereserve_repository.count("schools", ids=["1", "2", "999999"]) == 2
+
+
+def test_find_user_by_email(ereserve_repository):
+    """Test finding users and integration users by email, case-insensitively."""
+    assert ereserve_repository.find_user_by_email("Admin@Example.edu")["first_name"] == "Admin"
+    assert ereserve_repository.find_user_by_email("alice.johnson@example.edu")["identifier"] == "student1"
+    assert ereserve_repository.find_user_by_email("nobody@example.edu") is None
+
+
+def test_find_by_key_standard_number(ereserve_repository):
+    """Test that ISBN lookups ignore hyphens and match the eISBN too."""
+    assert [reading["id"] for reading in ereserve_repository.find_by_key("readings", "isbn", "9781234567890")] == [1]
+    assert [reading["id"] for reading in ereserve_repository.find_by_key("readings", "isbn", "978-1234567891")] == [1]
+
+
+def test_duplicate_unique_keys(tmp_path):
+    """Test that duplicate unique keys resolve to the first item loaded."""
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"units": [
+        {"id": 1, "code": "COMP101", "name": "A"},
+        {"id": 2, "code": "comp101 ", "name": "B"}
+    ]}))
+    repo = EReserveRepository(file_path=str(data_file))
+    assert [unit["id"] for unit in repo.find_by_key("units", "code", "COMP101")] == [1]
+
+
+def test_load_repository_off_the_loop(tmp_path, monkeypatch):
+    """Test that concurrent async loads parse the file once, on the repository I/O pool."""
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"schools": [{"id": 1, "name": "School A"}]}))
+    load_threads = []
+    real_load_data = EReserveRepository._load_data
+    
+    def recording_load_data(self):
+        load_threads.append(threading.current_thread().name)
+        return real_load_data(self)
+    
+    monkeypatch.setattr(EReserveRepository, "_load_data", recording_load_data)
+    
+    async def run():
+        return await asyncio.gather(*(load_repository(str(data_file)) for _ in range(5)))
+    
+    repos = asyncio.run(run())
+    
+    assert all(repo.get_by_id("schools", 1)["name"] == "School A" for repo in repos)
+    assert len(load_threads) == 1
+    assert load_threads[0].startswith("repository-io")
+
+
+def test_reload_repository(tmp_path):
+    """Test that an async reload picks up file changes and runs the callbacks on the event loop."""
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps({"schools": [{"id": 1, "name": "School A"}]}))
+    callback_threads = []
+    EReserveRepository.add_reload_callback(lambda: callback_threads.append(threading.current_thread()))
+    
+    async def run():
+        before = await load_repository(str(data_file))
+        data_file.write_text(json.dumps({"schools": [{"id": 1, "name": "School B"}]}))
+        await reload_repository(str(data_file))
+        return before, await load_repository(str(data_file))
+    
+    try:
+        before, after = asyncio.run(run())
+    finally:
+        EReserveRepository._reload_callbacks.pop()
+    
+    assert before.get_by_id("schools", 1)["name"] == "School A"
+    assert after.get_by_id("schools", 1)["name"] == "School B"
+    assert callback_threads == [threading.main_thread()]
+
+
+def test_datasets_evicted_over_memory_budget(tmp_path, monkeypatch):
+    """Test that loading a dataset past the memory budget evicts the least recently used one."""
+    paths = []
+    for name in ("a", "b", "c"):
+        data_file = tmp_path / f"{name}.json"
+        data_file.write_text(json.dumps({"schools": [{"id": i, "name": f"School {name}{i}"} for i in range(100)]}))
+        paths.append(str(data_file))
+    
+    EReserveRepository(paths[0])
+    budget = EReserveRepository.loaded_snapshots()[paths[0]]["estimated_bytes"] * 2
+    monkeypatch.setattr(settings, "DATASET_MEMORY_BUDGET_BYTES", budget)
+    EReserveRepository(paths[1])
+    EReserveRepository(paths[0])    # a is now more recently used than b
+    EReserveRepository(paths[2])
+    
+    assert EReserveRepository.is_loaded(paths[0])
+    assert not EReserveRepository.is_loaded(paths[1])
+    assert EReserveRepository.is_loaded(paths[2])
+    assert EReserveRepository(paths[1]).get_by_id("schools", 1)["name"] == "School b1"